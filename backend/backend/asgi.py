@@ -9,10 +9,14 @@ from channels.auth import AuthMiddlewareStack
 django.setup()
 
 from core.routing import websocket_urlpatterns
+from core.websocket.middleware import SendBacklogMiddleware
 
 application = ProtocolTypeRouter(
     {
         "http": get_asgi_application(),
-        "websocket": AuthMiddlewareStack(URLRouter(websocket_urlpatterns)),
+        # Outermost, to see the server's own send callable
+        "websocket": SendBacklogMiddleware(
+            AuthMiddlewareStack(URLRouter(websocket_urlpatterns))
+        ),
     }
 )
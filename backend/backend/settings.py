@@ -15,6 +15,7 @@ import os
 import sys
 from dotenv import load_dotenv, find_dotenv
 from datetime import timedelta
+from core.interface.redis_pool import REDIS_URL, cache_options, channel_layer_hosts
 
 load_dotenv(find_dotenv())
 
@@ -43,7 +44,8 @@ CSRF_TRUSTED_ORIGINS = [
 
 
 DATA_UPLOAD_MAX_MEMORY_SIZE = 200 * 1024 * 1024  # 200 Mo
-FILE_UPLOAD_MAX_MEMORY_SIZE = 200 * 1024 * 1024  # 200 Mo
+# Larger files are spooled to disk; photo uploads stream through their own handler
+FILE_UPLOAD_MAX_MEMORY_SIZE = 2621440  # 2.5 Mo
 
 
 # CORS_ALLOWED_ORIGINS = ALLOWED_CORS
@@ -190,11 +192,20 @@ CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels_redis.core.RedisChannelLayer",
         "CONFIG": {
-            "hosts": [(os.getenv("REDIS_HOST", "localhost"), 6379)],
+            "hosts": channel_layer_hosts(),
         },
     },
 }
 
+# Response cache of the list endpoints, see core/services/response_cache_service.py
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "OPTIONS": cache_options(),
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
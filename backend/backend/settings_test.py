@@ -17,6 +17,12 @@ CHANNEL_LAYERS = {
     },
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = []
 
 PASSWORD_HASHERS = [
@@ -1,4 +1,17 @@
 from core.interface.aws import AwsPhotoSaver
+from core.interface.deletion_queue import StorageDeletionQueue
+from core.interface.local import LocalPhotoSaver
+from core.interface.image_variants import ImageVariantGenerator
+from core.interface.mailer import (
+    MailQueue,
+    SmtpConnection,
+    MAIL_HOST,
+    MAIL_PORT,
+    MAIL_USERNAME,
+    MAIL_PASSWORD,
+    MAIL_USE_TLS,
+)
+from django.core.exceptions import ImproperlyConfigured
 import os
 from dotenv import load_dotenv, find_dotenv
 
@@ -8,7 +21,17 @@ environment = os.getenv("PHOTO_STORAGE_TYPE", "AWS")
 
 if environment == "AWS":
     photo_repository = AwsPhotoSaver()
+elif environment == "LOCAL":
+    photo_repository = LocalPhotoSaver()
 else:
-    # photo_repository = LocalPhotoSaver()
-    # if we want to change later
-    pass
+    raise ImproperlyConfigured(f"Unknown PHOTO_STORAGE_TYPE: {environment}")
+
+variant_generator = ImageVariantGenerator(photo_repository)
+deletion_queue = StorageDeletionQueue(photo_repository)
+
+mail_queue = MailQueue(
+    SmtpConnection(
+        MAIL_HOST, MAIL_PORT, MAIL_USERNAME, MAIL_PASSWORD, use_tls=MAIL_USE_TLS
+    ),
+    sender_email=MAIL_USERNAME,
+)
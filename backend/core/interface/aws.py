@@ -1,8 +1,16 @@
 from core.exceptions.exceptions import CloudUploadError
-from core.interface.photo_saver_repository import PhotoSaverRepository
+from core.interface.photo_saver_repository import PhotoSaverRepository, UploadStream
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import NoCredentialsError, ClientError, BotoCoreError
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlparse
 import os
+import re
+import threading
+from typing import Iterator, Optional
 import mimetypes
 from uuid import uuid4
 from dotenv import load_dotenv, find_dotenv
@@ -13,23 +21,152 @@ AWS_ACCESS_KEY = os.getenv("AWS_ACCESS_KEY")
 AWS_SECRET_KEY = os.getenv("AWS_ACCESS_SECRET")
 AWS_BUCKET_NAME = os.getenv("AWS_BUCKET_NAME")
 AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
+# Optional S3-compatible endpoint (MinIO, local stub); None means AWS itself
+AWS_ENDPOINT_URL = os.getenv("AWS_ENDPOINT_URL") or None
+
+MB = 1024 * 1024
+AWS_MAX_POOL_CONNECTIONS = int(os.getenv("AWS_MAX_POOL_CONNECTIONS", 10))
+AWS_MULTIPART_THRESHOLD = int(os.getenv("AWS_MULTIPART_THRESHOLD", 8 * MB))
+AWS_MULTIPART_CHUNKSIZE = int(os.getenv("AWS_MULTIPART_CHUNKSIZE", 8 * MB))
+AWS_MAX_CONCURRENCY = int(os.getenv("AWS_MAX_CONCURRENCY", 10))
+# S3 rejects multipart parts smaller than this, except the last one
+S3_MIN_PART_SIZE = 5 * MB
+# Largest number of keys accepted by one DeleteObjects call
+S3_DELETE_BATCH_SIZE = 1000
+
+# Direct-to-S3 uploads: policy lifetime in seconds and largest accepted object
+AWS_PRESIGNED_EXPIRY = int(os.getenv("AWS_PRESIGNED_EXPIRY", 900))
+AWS_MAX_UPLOAD_SIZE = int(os.getenv("AWS_MAX_UPLOAD_SIZE", 200 * MB))
+
+# Album covers are saved at the bucket root as "<uuid4>_<file name>", and
+# photos in one folder per album, named after its id
+COVER_KEY_PATTERN = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}_[^/]+$"
+)
+ALBUM_FOLDER_PATTERN = re.compile(r"^[0-9]+/$")
 
 DEBUG = os.getenv("DEBUG", "False") == "True"
 
 
+class AwsUploadStream(UploadStream):
+    """
+    Multipart upload fed by chunks, holding at most one part in memory.
+
+    Objects smaller than one part are sent with a single PutObject.
+    """
+
+    def __init__(self, s3, file_key: str, content_type: str, url: str):
+        self._s3 = s3
+        self.file_key = file_key
+        self.content_type = content_type
+        self.url = url
+        self._buffer = bytearray()
+        self._parts = []
+        self._upload_id = None
+
+    def write(self, chunk: bytes):
+        self._buffer += chunk
+        if len(self._buffer) >= max(AWS_MULTIPART_CHUNKSIZE, S3_MIN_PART_SIZE):
+            self._upload_part()
+
+    def complete(self) -> str:
+        try:
+            if self._upload_id is None:
+                self._s3.put_object(
+                    Bucket=AWS_BUCKET_NAME,
+                    Key=self.file_key,
+                    Body=bytes(self._buffer),
+                    ContentType=self.content_type,
+                    ContentDisposition="inline",
+                )
+            else:
+                if self._buffer:
+                    self._upload_part()
+                self._s3.complete_multipart_upload(
+                    Bucket=AWS_BUCKET_NAME,
+                    Key=self.file_key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={"Parts": self._parts},
+                )
+        except (NoCredentialsError, ClientError, BotoCoreError) as e:
+            print(f"Erreur Upload S3: {e}")
+            self.abort()
+            raise CloudUploadError("Échec de l'upload vers S3")
+        finally:
+            self._buffer = bytearray()
+        return self.url
+
+    def abort(self):
+        self._buffer = bytearray()
+        if self._upload_id is None:
+            return
+        try:
+            self._s3.abort_multipart_upload(
+                Bucket=AWS_BUCKET_NAME, Key=self.file_key, UploadId=self._upload_id
+            )
+        except (NoCredentialsError, ClientError, BotoCoreError) as e:
+            print(f"Erreur Abort S3: {e}")
+        self._upload_id = None
+
+    def _upload_part(self):
+        try:
+            if self._upload_id is None:
+                self._upload_id = self._s3.create_multipart_upload(
+                    Bucket=AWS_BUCKET_NAME,
+                    Key=self.file_key,
+                    ContentType=self.content_type,
+                    ContentDisposition="inline",
+                )["UploadId"]
+            part_number = len(self._parts) + 1
+            response = self._s3.upload_part(
+                Bucket=AWS_BUCKET_NAME,
+                Key=self.file_key,
+                UploadId=self._upload_id,
+                PartNumber=part_number,
+                Body=bytes(self._buffer),
+            )
+        except (NoCredentialsError, ClientError, BotoCoreError) as e:
+            print(f"Erreur Upload S3: {e}")
+            self.abort()
+            raise CloudUploadError("Échec de l'upload vers S3")
+        self._parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+        self._buffer = bytearray()
+
+
 class AwsPhotoSaver(PhotoSaverRepository):
 
+    def __init__(self):
+        self._s3_client = None
+        self._s3_client_lock = threading.Lock()
+        self._transfer_config = TransferConfig(
+            multipart_threshold=AWS_MULTIPART_THRESHOLD,
+            multipart_chunksize=AWS_MULTIPART_CHUNKSIZE,
+            max_concurrency=AWS_MAX_CONCURRENCY,
+        )
+
     def _generate_unique_name(self, file_name: str):
         return f"{uuid4()}_{file_name}"
 
+    def _get_folder_prefix(self, folder_album_id) -> str:
+        prefix = f"{folder_album_id}/"
+        if DEBUG:
+            prefix = f"debug_{prefix}"
+        return prefix
+
     def _get_s3_client(self):
-        s3 = boto3.client(
-            "s3",
-            aws_access_key_id=AWS_ACCESS_KEY,
-            aws_secret_access_key=AWS_SECRET_KEY,
-            region_name=AWS_REGION,
-        )
-        return s3
+        """Build the S3 client once; boto3 clients are safe to share across threads."""
+        if self._s3_client is None:
+            with self._s3_client_lock:
+                if self._s3_client is None:
+                    self._s3_client = boto3.client(
+                        "s3",
+                        aws_access_key_id=AWS_ACCESS_KEY,
+                        aws_secret_access_key=AWS_SECRET_KEY,
+                        region_name=AWS_REGION,
+                        endpoint_url=AWS_ENDPOINT_URL,
+                        config=Config(max_pool_connections=AWS_MAX_POOL_CONNECTIONS),
+                    )
+        return self._s3_client
 
     def _get_content_type(self, file_name: str):
         content_type, _ = mimetypes.guess_type(file_name)
@@ -37,6 +174,8 @@ class AwsPhotoSaver(PhotoSaverRepository):
         return content_type
 
     def _get_s3_resource_url(self, file_key):
+        if AWS_ENDPOINT_URL:
+            return f"{AWS_ENDPOINT_URL.rstrip('/')}/{AWS_BUCKET_NAME}/{file_key}"
         return f"https://{AWS_BUCKET_NAME}.s3.{AWS_REGION}.amazonaws.com/{file_key}"
 
     def _upload_to_s3(self, file, file_key):
@@ -50,6 +189,7 @@ class AwsPhotoSaver(PhotoSaverRepository):
                     "ContentType": self._get_content_type(file.name),
                     "ContentDisposition": "inline",
                 },
+                Config=self._transfer_config,
             )
         except (NoCredentialsError, ClientError, BotoCoreError) as e:
             print(f"Erreur Upload S3: {e}")
@@ -67,14 +207,74 @@ class AwsPhotoSaver(PhotoSaverRepository):
     def save_within_folder(self, file, folder_album_id) -> str:
         file_name = self._generate_unique_name(file.name)
 
-        file_key = f"{folder_album_id}/{file_name}"
-
-        if DEBUG:
-            file_key = f"debug_{file_key}"
+        file_key = f"{self._get_folder_prefix(folder_album_id)}{file_name}"
 
         self._upload_to_s3(file, file_key)
         return self._get_s3_resource_url(file_key)
 
+    def open_stream(
+        self, file_name: str, folder_album_id, content_type: str
+    ) -> AwsUploadStream:
+        file_key = (
+            f"{self._get_folder_prefix(folder_album_id)}"
+            f"{self._generate_unique_name(os.path.basename(file_name))}"
+        )
+        return AwsUploadStream(
+            self._get_s3_client(),
+            file_key,
+            content_type or self._get_content_type(file_name),
+            self._get_s3_resource_url(file_key),
+        )
+
+    def create_upload(self, file_name: str, folder_album_id) -> dict:
+        file_name = os.path.basename(file_name)
+        file_key = (
+            f"{self._get_folder_prefix(folder_album_id)}"
+            f"{self._generate_unique_name(file_name)}"
+        )
+        content_type = self._get_content_type(file_name)
+        fields = {"Content-Type": content_type, "Content-Disposition": "inline"}
+
+        try:
+            post = self._get_s3_client().generate_presigned_post(
+                AWS_BUCKET_NAME,
+                file_key,
+                Fields=fields,
+                Conditions=[
+                    {"Content-Type": content_type},
+                    {"Content-Disposition": "inline"},
+                    ["content-length-range", 1, AWS_MAX_UPLOAD_SIZE],
+                ],
+                ExpiresIn=AWS_PRESIGNED_EXPIRY,
+            )
+        except (NoCredentialsError, ClientError, BotoCoreError) as e:
+            print(f"Erreur Presign S3: {e}")
+            raise CloudUploadError("Échec de la préparation de l'upload vers S3")
+
+        return {
+            "key": file_key,
+            "method": "POST",
+            "url": post["url"],
+            "fields": post["fields"],
+        }
+
+    def finalize_upload(self, file_key: str, folder_album_id) -> Optional[str]:
+        if not file_key.startswith(self._get_folder_prefix(folder_album_id)):
+            return None
+
+        try:
+            self._get_s3_client().head_object(Bucket=AWS_BUCKET_NAME, Key=file_key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return None
+            print(f"Erreur Head S3: {e}")
+            raise CloudUploadError("Échec de la vérification de l'upload sur S3")
+        except (NoCredentialsError, BotoCoreError) as e:
+            print(f"Erreur Head S3: {e}")
+            raise CloudUploadError("Échec de la vérification de l'upload sur S3")
+
+        return self._get_s3_resource_url(file_key)
+
     def save(self, file) -> str:
         file_key = self._generate_unique_name(file.name)
 
@@ -91,6 +291,124 @@ class AwsPhotoSaver(PhotoSaverRepository):
 
         print("Deleting file from cloud:", file_url)
 
-        file_key = file_url.split("/")[-1]
+        file_key = self._get_file_key(file_url)
 
         return self._delete_from_s3(file_key)
+
+    def delete_many(self, file_urls: list) -> list:
+        keys = {}
+        for file_url in file_urls:
+            if file_url:
+                keys[self._get_file_key(file_url)] = file_url
+        if not keys:
+            return []
+
+        key_list = list(keys)
+        batches = [
+            key_list[i : i + S3_DELETE_BATCH_SIZE]
+            for i in range(0, len(key_list), S3_DELETE_BATCH_SIZE)
+        ]
+        workers = max(1, min(AWS_MAX_CONCURRENCY, len(batches)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            failed_keys = [
+                key
+                for batch_failures in executor.map(self._delete_batch_from_s3, batches)
+                for key in batch_failures
+            ]
+        return [keys[key] for key in failed_keys]
+
+    def list_objects(self, page_size: int) -> Iterator[list]:
+        # Only album folders and cover keys: the bucket may hold other objects.
+        # Folders of deleted albums are listed too, whatever is left in them.
+        prefix = "debug_" if DEBUG else ""
+        folders = []
+        for page in self._list_pages(page_size, Prefix=prefix, Delimiter="/"):
+            folders += [
+                folder["Prefix"]
+                for folder in page.get("CommonPrefixes", [])
+                if ALBUM_FOLDER_PATTERN.match(folder["Prefix"][len(prefix) :])
+            ]
+            yield [
+                self._stored_object(item)
+                for item in page.get("Contents", [])
+                if COVER_KEY_PATTERN.match(item["Key"][len(prefix) :])
+            ]
+        for folder in folders:
+            for page in self._list_pages(page_size, Prefix=folder):
+                yield [self._stored_object(item) for item in page.get("Contents", [])]
+
+    def _list_pages(self, page_size: int, **listing) -> Iterator[dict]:
+        paginator = self._get_s3_client().get_paginator("list_objects_v2")
+        try:
+            yield from paginator.paginate(
+                Bucket=AWS_BUCKET_NAME,
+                PaginationConfig={"PageSize": min(page_size, S3_DELETE_BATCH_SIZE)},
+                **listing,
+            )
+        except (NoCredentialsError, ClientError, BotoCoreError) as e:
+            print(f"Erreur Listing S3: {e}")
+            raise CloudUploadError("Échec du listing du bucket S3")
+
+    def _stored_object(self, item: dict) -> dict:
+        return {
+            "url": self._get_s3_resource_url(item["Key"]),
+            "size": item["Size"],
+            "last_modified": item["LastModified"],
+        }
+
+    def delete_unreferenced(self, file_urls: list, modified_before: datetime) -> list:
+        urls = [file_url for file_url in file_urls if file_url]
+        if not urls:
+            return []
+
+        workers = max(1, min(AWS_MAX_CONCURRENCY, len(urls)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            modified = list(executor.map(self._get_last_modified, urls))
+
+        kept, expired = [], []
+        for file_url, last_modified in zip(urls, modified):
+            if last_modified is False:
+                continue
+            if last_modified is None or last_modified >= modified_before:
+                kept.append(file_url)
+            else:
+                expired.append(file_url)
+        return kept + self.delete_many(expired)
+
+    def _get_last_modified(self, file_url: str):
+        """LastModified of the object, False when it is gone, None on failure."""
+        try:
+            response = self._get_s3_client().head_object(
+                Bucket=AWS_BUCKET_NAME, Key=self._get_file_key(file_url)
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return False
+            print(f"Erreur Head S3: {e}")
+            return None
+        except (NoCredentialsError, BotoCoreError) as e:
+            print(f"Erreur Head S3: {e}")
+            return None
+        return response["LastModified"]
+
+    def _delete_batch_from_s3(self, file_keys: list) -> list:
+        s3 = self._get_s3_client()
+        try:
+            response = s3.delete_objects(
+                Bucket=AWS_BUCKET_NAME,
+                Delete={
+                    "Objects": [{"Key": key} for key in file_keys],
+                    "Quiet": True,
+                },
+            )
+        except (NoCredentialsError, ClientError, BotoCoreError) as e:
+            print(f"Erreur Suppression S3: {e}")
+            return file_keys
+        return [error["Key"] for error in response.get("Errors", [])]
+
+    def _get_file_key(self, file_url: str) -> str:
+        path = urlparse(file_url).path.lstrip("/")
+        # Path-style URLs of a custom endpoint start with the bucket name
+        if AWS_ENDPOINT_URL and path.startswith(f"{AWS_BUCKET_NAME}/"):
+            path = path[len(AWS_BUCKET_NAME) + 1 :]
+        return path
@@ -0,0 +1,40 @@
+from core.interface.photo_saver_repository import PhotoSaverRepository
+from concurrent.futures import Future, ThreadPoolExecutor
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class StorageDeletionQueue:
+    """
+    Removes storage objects on a background thread.
+
+    Requests only enqueue the URLs to delete, so deleting an album with
+    thousands of photos returns as soon as the database is updated. Objects
+    that fail to delete are logged and left to the orphan collector.
+    """
+
+    def __init__(self, repository: PhotoSaverRepository):
+        self.repository = repository
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="storage-deletion"
+        )
+
+    def enqueue(self, file_urls: list) -> Future:
+        """Schedule the deletion; the future resolves to the URLs that failed."""
+        return self._executor.submit(self._delete, [url for url in file_urls if url])
+
+    def _delete(self, file_urls: list) -> list:
+        if not file_urls:
+            return []
+        try:
+            failed = self.repository.delete_many(file_urls)
+        except Exception:
+            logger.exception(f"Deleting {len(file_urls)} storage objects failed")
+            return file_urls
+
+        if failed:
+            logger.warning(f"{len(failed)} of {len(file_urls)} objects not deleted")
+        else:
+            logger.info(f"Deleted {len(file_urls)} storage objects")
+        return failed
@@ -0,0 +1,124 @@
+from core.exceptions.exceptions import CloudUploadError
+from core.interface.photo_saver_repository import PhotoSaverRepository
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageOps, UnidentifiedImageError
+from typing import Any, Optional
+import io
+import logging
+import os
+from dotenv import load_dotenv, find_dotenv
+
+load_dotenv(find_dotenv())
+
+# Comma-separated "name:width" pairs, e.g. "thumbnail:320,medium:1280"
+PHOTO_VARIANT_WIDTHS = os.getenv("PHOTO_VARIANT_WIDTHS", "thumbnail:320,medium:1280")
+PHOTO_VARIANT_FORMAT = os.getenv("PHOTO_VARIANT_FORMAT", "WEBP").upper()
+PHOTO_VARIANT_QUALITY = int(os.getenv("PHOTO_VARIANT_QUALITY", 80))
+PHOTO_VARIANT_WORKERS = int(os.getenv("PHOTO_VARIANT_WORKERS", 4))
+
+VARIANT_EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg"}
+
+logger = logging.getLogger(__name__)
+
+
+def parse_variant_widths(spec: str) -> dict:
+    widths = {}
+    for item in spec.split(","):
+        name, _, width = item.strip().partition(":")
+        if name and width.isdigit() and int(width) > 0:
+            widths[name] = int(width)
+    return widths
+
+
+class ImageVariantGenerator:
+    """
+    Build resized copies of an uploaded image and store them next to it.
+
+    The source is decoded once; every variant is then resized, encoded and
+    uploaded on a shared worker pool. Files that are not images, and
+    variants that fail to upload, are skipped rather than failing the upload.
+    """
+
+    def __init__(
+        self,
+        repository: PhotoSaverRepository,
+        widths: Optional[dict] = None,
+        image_format: str = PHOTO_VARIANT_FORMAT,
+        quality: int = PHOTO_VARIANT_QUALITY,
+        workers: int = PHOTO_VARIANT_WORKERS,
+    ):
+        if image_format not in VARIANT_EXTENSIONS:
+            raise ValueError(f"Unsupported variant format: {image_format}")
+        self.repository = repository
+        self.widths = (
+            widths if widths is not None else parse_variant_widths(PHOTO_VARIANT_WIDTHS)
+        )
+        self.image_format = image_format
+        self.quality = quality
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="image-variants"
+        )
+
+    def generate(self, file: Any, folder_album_id=None) -> dict:
+        """Return a mapping of variant name to URL for `file`."""
+        if not self.widths:
+            return {}
+
+        source = self._open(file)
+        if source is None:
+            return {}
+
+        stem = os.path.splitext(os.path.basename(file.name))[0]
+        futures = {
+            name: self._executor.submit(
+                self._build_variant, source.copy(), stem, name, width, folder_album_id
+            )
+            for name, width in self.widths.items()
+        }
+
+        variants = {}
+        for name, future in futures.items():
+            try:
+                variants[name] = future.result()
+            except CloudUploadError as e:
+                logger.warning(f"Variant {name} of {file.name} not stored: {e}")
+        return variants
+
+    def delete(self, variants: Optional[dict]):
+        for url in (variants or {}).values():
+            self.repository.delete(url)
+
+    def _open(self, file: Any) -> Optional[Image.Image]:
+        # The original has usually just been read by the storage upload
+        file.seek(0)
+        try:
+            with Image.open(file) as image:
+                image = ImageOps.exif_transpose(image)
+                image.load()
+        except (UnidentifiedImageError, OSError) as e:
+            logger.warning(f"Cannot build variants of {file.name}: {e}")
+            return None
+        finally:
+            file.seek(0)
+
+        if self.image_format == "JPEG" or image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGB" if self.image_format == "JPEG" else "RGBA")
+        return image
+
+    def _build_variant(
+        self, image: Image.Image, stem: str, name: str, width: int, folder_album_id
+    ) -> str:
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.Resampling.LANCZOS)
+
+        buffer = io.BytesIO()
+        image.save(buffer, self.image_format, quality=self.quality)
+        buffer.seek(0)
+        buffer.name = f"{stem}_{name}.{VARIANT_EXTENSIONS[self.image_format]}"
+
+        if folder_album_id is None:
+            return self.repository.save(buffer)
+        return self.repository.save_within_folder(
+            buffer, folder_album_id=folder_album_id
+        )
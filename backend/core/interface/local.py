@@ -0,0 +1,300 @@
+from core.exceptions.exceptions import CloudUploadError
+from core.interface.photo_saver_repository import PhotoSaverRepository, UploadStream
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional
+from uuid import uuid4
+import fcntl
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+from dotenv import load_dotenv, find_dotenv
+
+load_dotenv(find_dotenv())
+
+LOCAL_MEDIA_ROOT = os.getenv("LOCAL_MEDIA_ROOT", "/app/media")
+# Absolute URL the blobs are served from: Photo.image_url is a URLField
+LOCAL_MEDIA_URL = os.getenv("LOCAL_MEDIA_URL", "http://localhost:5002/media/")
+# nginx `internal` location aliasing objects/, used by the X-Accel-Redirect view
+LOCAL_MEDIA_ACCEL_PREFIX = os.getenv("LOCAL_MEDIA_ACCEL_PREFIX", "/protected-media/")
+HASH_CHUNK_SIZE = 1024 * 1024
+
+BLOB_PATH_PATTERN = re.compile(r"^([0-9a-f]{2})/([0-9a-f]{64})(\.[a-z0-9]{1,8})?$")
+
+logger = logging.getLogger(__name__)
+
+
+class LocalPhotoSaver(PhotoSaverRepository):
+    """
+    Content-addressed photo store on the local filesystem.
+
+    Blobs live under `objects/<first two hex>/<sha256><ext>`, so identical
+    uploads share one file whatever album they belong to. Every save adds a
+    reference marker under `refs/<sha256>/` and a blob is only removed when
+    its last reference is deleted. Files are written to a temporary file,
+    fsynced, then renamed into place, so readers never see partial blobs.
+
+    nginx serves `objects/` directly (sendfile). Set LOCAL_MEDIA_URL to the
+    API media route instead to gate access through X-Accel-Redirect.
+    """
+
+    def __init__(self, root: str = LOCAL_MEDIA_ROOT, base_url: str = LOCAL_MEDIA_URL):
+        self.root = root
+        self.base_url = base_url.rstrip("/") + "/"
+        self.objects_dir = os.path.join(root, "objects")
+        self.refs_dir = os.path.join(root, "refs")
+        self.tmp_dir = os.path.join(root, "tmp")
+        self.locks_dir = os.path.join(root, "locks")
+
+    def save_within_folder(self, file: Any, folder_album_id) -> str:
+        # Blobs are keyed by content only; the album does not change the path
+        return self.save(file)
+
+    def save(self, file: Any) -> str:
+        try:
+            tmp_path, digest = self._write_temporary(file)
+        except OSError as e:
+            logger.error(f"Local storage write failed: {e}")
+            raise CloudUploadError("Échec de l'enregistrement du fichier")
+        return self._commit(tmp_path, digest, self._get_extension(file.name))
+
+    def open_stream(
+        self, file_name: str, folder_album_id, content_type: str
+    ) -> "LocalUploadStream":
+        try:
+            return LocalUploadStream(self, self._get_extension(file_name))
+        except OSError as e:
+            logger.error(f"Local storage write failed: {e}")
+            raise CloudUploadError("Échec de l'enregistrement du fichier")
+
+    def _commit(self, tmp_path: str, digest: str, extension: str) -> str:
+        """Move a fully written temporary file to its content-addressed path."""
+        relative_path = f"{digest[:2]}/{digest}{extension}"
+        try:
+            with self._lock(digest):
+                blob_path = os.path.join(self.objects_dir, relative_path)
+                if os.path.exists(blob_path):
+                    os.unlink(tmp_path)
+                    # Reused blobs count as new for the orphan collector's grace period
+                    os.utime(blob_path)
+                else:
+                    os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                    os.chmod(tmp_path, 0o644)
+                    os.replace(tmp_path, blob_path)
+                self._add_reference(digest)
+        except OSError as e:
+            logger.error(f"Local storage write failed: {e}")
+            self._discard(tmp_path)
+            raise CloudUploadError("Échec de l'enregistrement du fichier")
+
+        return f"{self.base_url}{relative_path}"
+
+    def create_upload(self, file_name: str, folder_album_id) -> dict:
+        raise CloudUploadError("Upload direct indisponible avec le stockage local")
+
+    def finalize_upload(self, file_key: str, folder_album_id) -> Optional[str]:
+        raise CloudUploadError("Upload direct indisponible avec le stockage local")
+
+    def delete(self, file_url: str) -> bool:
+        if file_url is None:
+            return True
+
+        relative_path = self.resolve(file_url)
+        if relative_path is None:
+            logger.warning("Ignoring delete of a URL outside local storage")
+            return False
+
+        digest = BLOB_PATH_PATTERN.match(relative_path).group(2)
+        try:
+            with self._lock(digest):
+                if self._remove_reference(digest) == 0:
+                    blob_path = os.path.join(self.objects_dir, relative_path)
+                    if os.path.exists(blob_path):
+                        os.unlink(blob_path)
+            return True
+        except OSError as e:
+            logger.error(f"Local storage delete failed: {e}")
+            raise CloudUploadError("Échec de la suppression du fichier")
+
+    def delete_many(self, file_urls: list) -> list:
+        failed = []
+        for file_url in file_urls:
+            try:
+                if not self.delete(file_url):
+                    failed.append(file_url)
+            except CloudUploadError:
+                failed.append(file_url)
+        return failed
+
+    def list_objects(self, page_size: int) -> Iterator[list]:
+        page = []
+        for shard in sorted(self._listdir(self.objects_dir)):
+            shard_path = os.path.join(self.objects_dir, shard)
+            for name in sorted(self._listdir(shard_path)):
+                relative_path = f"{shard}/{name}"
+                if not BLOB_PATH_PATTERN.match(relative_path):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(shard_path, name))
+                except FileNotFoundError:
+                    continue
+                page.append(
+                    {
+                        "url": f"{self.base_url}{relative_path}",
+                        "size": stat.st_size,
+                        "last_modified": datetime.fromtimestamp(
+                            stat.st_mtime, tz=timezone.utc
+                        ),
+                    }
+                )
+                if len(page) >= page_size:
+                    yield page
+                    page = []
+        if page:
+            yield page
+
+    def delete_unreferenced(self, file_urls: list, modified_before: datetime) -> list:
+        kept = []
+        for file_url in file_urls:
+            relative_path = self.resolve(file_url)
+            if relative_path is None:
+                kept.append(file_url)
+                continue
+
+            digest = BLOB_PATH_PATTERN.match(relative_path).group(2)
+            blob_path = os.path.join(self.objects_dir, relative_path)
+            try:
+                with self._lock(digest):
+                    if os.path.exists(blob_path):
+                        modified = datetime.fromtimestamp(
+                            os.stat(blob_path).st_mtime, tz=timezone.utc
+                        )
+                        if modified >= modified_before:
+                            # Saved again since the collector listed it
+                            kept.append(file_url)
+                            continue
+                        os.unlink(blob_path)
+                    shard_path = os.path.dirname(blob_path)
+                    # Markers are per digest: keep them while another extension uses it
+                    if not any(
+                        name.startswith(digest) for name in self._listdir(shard_path)
+                    ):
+                        shutil.rmtree(os.path.join(self.refs_dir, digest), True)
+            except OSError as e:
+                logger.error(f"Local storage delete failed: {e}")
+                kept.append(file_url)
+        return kept
+
+    def resolve(self, file_url: str) -> Optional[str]:
+        """Return the blob path of a URL served by this store, relative to objects/."""
+        if not file_url or not file_url.startswith(self.base_url):
+            return None
+        relative_path = file_url[len(self.base_url) :]
+        if not BLOB_PATH_PATTERN.match(relative_path):
+            return None
+        return relative_path
+
+    def _get_extension(self, file_name: str) -> str:
+        extension = os.path.splitext(os.path.basename(file_name or ""))[1].lower()
+        return extension if re.fullmatch(r"\.[a-z0-9]{1,8}", extension) else ""
+
+    def _write_temporary(self, file: Any) -> tuple:
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        sha256 = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                if hasattr(file, "seek"):
+                    file.seek(0)
+                for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+                    sha256.update(chunk)
+                    tmp.write(chunk)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+        except BaseException:
+            self._discard(tmp_path)
+            raise
+        finally:
+            if hasattr(file, "seek"):
+                file.seek(0)
+        return tmp_path, sha256.hexdigest()
+
+    def _add_reference(self, digest: str):
+        refs_path = os.path.join(self.refs_dir, digest)
+        os.makedirs(refs_path, exist_ok=True)
+        open(os.path.join(refs_path, uuid4().hex), "x").close()
+
+    def _remove_reference(self, digest: str) -> int:
+        refs_path = os.path.join(self.refs_dir, digest)
+        refs = os.listdir(refs_path) if os.path.isdir(refs_path) else []
+        if refs:
+            os.unlink(os.path.join(refs_path, refs.pop()))
+        if not refs and os.path.isdir(refs_path):
+            os.rmdir(refs_path)
+        return len(refs)
+
+    @contextmanager
+    def _lock(self, digest: str):
+        # Serialises reference updates of one blob across threads and workers
+        os.makedirs(self.locks_dir, exist_ok=True)
+        with open(os.path.join(self.locks_dir, f"{digest[:2]}.lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _listdir(path: str) -> list:
+        try:
+            return os.listdir(path)
+        except FileNotFoundError:
+            return []
+
+    @staticmethod
+    def _discard(path: str):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+class LocalUploadStream(UploadStream):
+    """Temporary file hashed while written, committed to its blob path at the end."""
+
+    def __init__(self, saver: LocalPhotoSaver, extension: str):
+        self._saver = saver
+        self._extension = extension
+        self._sha256 = hashlib.sha256()
+        os.makedirs(saver.tmp_dir, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=saver.tmp_dir)
+        self._tmp = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes):
+        try:
+            self._tmp.write(chunk)
+        except OSError as e:
+            logger.error(f"Local storage write failed: {e}")
+            self.abort()
+            raise CloudUploadError("Échec de l'enregistrement du fichier")
+        self._sha256.update(chunk)
+
+    def complete(self) -> str:
+        try:
+            self._tmp.flush()
+            os.fsync(self._tmp.fileno())
+            self._tmp.close()
+        except OSError as e:
+            logger.error(f"Local storage write failed: {e}")
+            self.abort()
+            raise CloudUploadError("Échec de l'enregistrement du fichier")
+        return self._saver._commit(
+            self._tmp_path, self._sha256.hexdigest(), self._extension
+        )
+
+    def abort(self):
+        self._tmp.close()
+        self._saver._discard(self._tmp_path)
@@ -0,0 +1,219 @@
+from core.utils import (
+    NOTIFICATION_SUBJECT,
+    build_email_message,
+    build_notification_html,
+)
+from email.message import EmailMessage
+from queue import Queue, Empty
+from typing import Optional
+import atexit
+import logging
+import smtplib
+import threading
+import time
+import os
+from dotenv import load_dotenv, find_dotenv
+
+load_dotenv(find_dotenv())
+
+MAIL_USERNAME = os.getenv("MAIL_USERNAME")
+MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
+MAIL_HOST = os.getenv("MAIL_HOST")
+MAIL_PORT = int(os.getenv("MAIL_PORT", 587))
+MAIL_USE_TLS = os.getenv("MAIL_USE_TLS", "True") == "True"
+
+# Notifications for the same recipient within this many seconds become one mail
+MAIL_DIGEST_WINDOW = float(os.getenv("MAIL_DIGEST_WINDOW", 30))
+MAIL_MAX_RETRIES = int(os.getenv("MAIL_MAX_RETRIES", 3))
+MAIL_RETRY_BACKOFF = float(os.getenv("MAIL_RETRY_BACKOFF", 2))
+# Seconds the process waits at exit for pending digests to be sent
+MAIL_SHUTDOWN_TIMEOUT = float(os.getenv("MAIL_SHUTDOWN_TIMEOUT", 10))
+SMTP_TIMEOUT = 30
+
+logger = logging.getLogger(__name__)
+
+
+class SmtpConnection:
+    """
+    Authenticated SMTP session kept open between sends.
+
+    The session is opened on first use and dropped on any error so the next
+    send reconnects; it is only used from the MailQueue worker thread.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str],
+        password: Optional[str],
+        use_tls: bool = True,
+        timeout: float = SMTP_TIMEOUT,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._server: Optional[smtplib.SMTP] = None
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            server.starttls()
+        if self.username:
+            server.login(self.username, self.password)
+        return server
+
+    def send(self, msg: EmailMessage):
+        try:
+            if self._server is None:
+                self._server = self._connect()
+            self._server.send_message(msg)
+        except Exception:
+            # The session may be mid-transaction: start afresh next time
+            self.close()
+            raise
+
+    def close(self):
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._server = None
+
+
+class MailQueue:
+    """
+    In-process notification queue drained by a background thread.
+
+    Callers only enqueue. Notifications for the same recipient received
+    within `digest_window` seconds are merged into a single digest mail,
+    and failed sends are retried with exponential backoff. Pending digests
+    are sent when the process exits, within MAIL_SHUTDOWN_TIMEOUT seconds.
+    """
+
+    def __init__(
+        self,
+        connection: SmtpConnection,
+        sender_email: Optional[str],
+        digest_window: float = MAIL_DIGEST_WINDOW,
+        max_retries: int = MAIL_MAX_RETRIES,
+        retry_backoff: float = MAIL_RETRY_BACKOFF,
+    ):
+        self.connection = connection
+        self.sender_email = sender_email
+        self.digest_window = digest_window
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._queue: Queue = Queue()
+        self._pending: dict = {}
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._stop_at_exit = False
+
+    def enqueue(self, recipient_email: str, recipient_name: str):
+        self._ensure_worker()
+        self._queue.put(("mail", (recipient_email, recipient_name)))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Send every pending digest now and wait until it is done."""
+        done = threading.Event()
+        self._ensure_worker()
+        self._queue.put(("flush", done))
+        return done.wait(timeout)
+
+    def stop(self, timeout: Optional[float] = None):
+        """Send pending digests, close the SMTP session and stop the worker."""
+        with self._thread_lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        self._queue.put(("stop", None))
+        thread.join(timeout)
+
+    def _ensure_worker(self):
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="mail-queue", daemon=True
+                )
+                self._thread.start()
+            if not self._stop_at_exit:
+                # The worker is a daemon thread: without this, digests still
+                # waiting for their window are lost on every restart
+                atexit.register(self.stop, MAIL_SHUTDOWN_TIMEOUT)
+                self._stop_at_exit = True
+
+    def _run(self):
+        while True:
+            try:
+                kind, value = self._queue.get(timeout=self._time_to_next_digest())
+            except Empty:
+                self._send_due_digests()
+                continue
+
+            if kind == "mail":
+                self._add_to_digest(*value)
+                self._send_due_digests()
+            elif kind == "flush":
+                self._send_due_digests(force=True)
+                value.set()
+            elif kind == "stop":
+                self._send_due_digests(force=True)
+                self.connection.close()
+                return
+
+    def _time_to_next_digest(self) -> Optional[float]:
+        if not self._pending:
+            return None
+        next_deadline = min(entry["deadline"] for entry in self._pending.values())
+        return max(0.0, next_deadline - time.monotonic())
+
+    def _add_to_digest(self, recipient_email: str, recipient_name: str):
+        entry = self._pending.get(recipient_email)
+        if entry is None:
+            self._pending[recipient_email] = {
+                "name": recipient_name,
+                "count": 1,
+                "deadline": time.monotonic() + self.digest_window,
+            }
+        else:
+            entry["name"] = recipient_name
+            entry["count"] += 1
+
+    def _send_due_digests(self, force: bool = False):
+        now = time.monotonic()
+        for recipient_email, entry in list(self._pending.items()):
+            if force or entry["deadline"] <= now:
+                del self._pending[recipient_email]
+                try:
+                    self._deliver(recipient_email, entry["name"], entry["count"])
+                except Exception:
+                    # Keep the worker alive for the other digests
+                    logger.exception("Notification mail could not be sent")
+
+    def _deliver(self, recipient_email: str, recipient_name: str, count: int):
+        msg = build_email_message(
+            NOTIFICATION_SUBJECT,
+            build_notification_html(recipient_name, count),
+            self.sender_email,
+            recipient_email,
+        )
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.connection.send(msg)
+                return
+            except (smtplib.SMTPException, OSError) as e:
+                logger.warning(f"Mail attempt {attempt + 1} failed: {e}")
+                if attempt < self.max_retries:
+                    time.sleep(self.retry_backoff * (2**attempt))
+
+        logger.error(
+            f"Dropping notification mail after {self.max_retries + 1} attempts"
+        )
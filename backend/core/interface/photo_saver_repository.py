@@ -1,5 +1,23 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from datetime import datetime
+from typing import Any, Iterator, Optional
+
+
+class UploadStream(ABC):
+    """An object being written to storage chunk by chunk."""
+
+    @abstractmethod
+    def write(self, chunk: bytes):
+        pass
+
+    @abstractmethod
+    def complete(self) -> str:
+        """Make the object visible and return its URL."""
+        pass
+
+    @abstractmethod
+    def abort(self):
+        pass
 
 
 class PhotoSaverRepository(ABC):
@@ -12,6 +30,48 @@ class PhotoSaverRepository(ABC):
     def save(self, file: Any) -> str:
         pass
 
+    @abstractmethod
+    def open_stream(
+        self, file_name: str, folder_album_id, content_type: str
+    ) -> UploadStream:
+        """Start an upload into the album folder that is fed as data arrives."""
+        pass
+
+    @abstractmethod
+    def create_upload(self, file_name: str, folder_album_id) -> dict:
+        """Describe how a client can send `file_name` straight to storage."""
+        pass
+
+    @abstractmethod
+    def finalize_upload(self, file_key: str, folder_album_id) -> Optional[str]:
+        """Return the URL of an uploaded object, or None if it is not there."""
+        pass
+
     @abstractmethod
     def delete(self, file_url: str) -> bool:
         pass
+
+    @abstractmethod
+    def delete_many(self, file_urls: list) -> list:
+        """Delete every URL in as few calls as possible; return those that failed."""
+        pass
+
+    @abstractmethod
+    def list_objects(self, page_size: int) -> Iterator[list]:
+        """
+        Yield the objects this application stored, one page at a time,
+        including those left over from deleted albums.
+
+        Each object is a dict with its `url`, `size` in bytes and the
+        timezone-aware `last_modified` date.
+        """
+        pass
+
+    @abstractmethod
+    def delete_unreferenced(self, file_urls: list, modified_before: datetime) -> list:
+        """
+        Remove objects the database no longer references, whatever their
+        storage-side bookkeeping; objects modified since `modified_before`
+        are kept. Return the URLs that were not deleted.
+        """
+        pass
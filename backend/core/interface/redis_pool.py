@@ -0,0 +1,133 @@
+"""
+Shared Redis connection pools for presence, caching and rate limiting.
+
+Sync code (HTTP views, services) shares one blocking pool; async code
+(WebSocket consumers) gets one pool per event loop, since asyncio
+connections cannot move between loops. Both are bounded, time out
+instead of hanging, and health-check idle connections before reuse.
+When every connection is busy, callers wait up to REDIS_POOL_TIMEOUT
+seconds for one to be released.
+"""
+
+from typing import Optional
+import asyncio
+import os
+import threading
+import weakref
+import redis
+import redis.asyncio
+from dotenv import load_dotenv, find_dotenv
+
+load_dotenv(find_dotenv())
+
+REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
+REDIS_URL = os.getenv("REDIS_URL") or f"redis://{REDIS_HOST}:{REDIS_PORT}"
+# Connections per pool: per process for sync code, per event loop for async
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", 2))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 5))
+REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", 2))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))
+# The channel layer opens its own pools, one per shard and event loop
+REDIS_CHANNEL_LAYER_MAX_CONNECTIONS = int(
+    os.getenv("REDIS_CHANNEL_LAYER_MAX_CONNECTIONS", 100)
+)
+
+
+def connection_options() -> dict:
+    return {
+        "socket_timeout": REDIS_SOCKET_TIMEOUT,
+        "socket_connect_timeout": REDIS_CONNECT_TIMEOUT,
+        "health_check_interval": REDIS_HEALTH_CHECK_INTERVAL,
+        "retry_on_timeout": True,
+    }
+
+
+def channel_layer_hosts() -> list:
+    """`hosts` of the channels_redis layer, built from the same settings."""
+    return [
+        {
+            "address": REDIS_URL,
+            "max_connections": REDIS_CHANNEL_LAYER_MAX_CONNECTIONS,
+            **connection_options(),
+        }
+    ]
+
+
+def cache_options() -> dict:
+    """`OPTIONS` of Django's Redis cache, bounded like the shared pool."""
+    return {
+        "pool_class": "redis.BlockingConnectionPool",
+        "max_connections": REDIS_MAX_CONNECTIONS,
+        "timeout": REDIS_POOL_TIMEOUT,
+        **connection_options(),
+    }
+
+
+_sync_client: Optional[redis.Redis] = None
+_sync_client_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_redis_client() -> redis.Redis:
+    """Client on the process-wide blocking pool, built on first use."""
+    global _sync_client
+    if _sync_client is None:
+        with _sync_client_lock:
+            if _sync_client is None:
+                pool = redis.BlockingConnectionPool.from_url(
+                    REDIS_URL,
+                    max_connections=REDIS_MAX_CONNECTIONS,
+                    timeout=REDIS_POOL_TIMEOUT,
+                    decode_responses=True,
+                    **connection_options(),
+                )
+                _sync_client = redis.Redis(connection_pool=pool)
+    return _sync_client
+
+
+async def get_async_redis_client() -> redis.asyncio.Redis:
+    """Client on the blocking pool of the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        pool = redis.asyncio.BlockingConnectionPool.from_url(
+            REDIS_URL,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            timeout=REDIS_POOL_TIMEOUT,
+            decode_responses=True,
+            **connection_options(),
+        )
+        client = redis.asyncio.Redis(connection_pool=pool)
+        _async_clients[loop] = client
+    return client
+
+
+def pool_metrics() -> dict:
+    """Connections in use and idle, against the limit, for every pool."""
+    metrics = {"sync": None, "async": []}
+    if _sync_client is not None:
+        pool = _sync_client.connection_pool
+        created = len(pool._connections)
+        idle = sum(1 for connection in list(pool.pool.queue) if connection)
+        metrics["sync"] = _usage(created - idle, idle, pool.max_connections)
+    for client in list(_async_clients.values()):
+        pool = client.connection_pool
+        metrics["async"].append(
+            _usage(
+                len(pool._in_use_connections),
+                len(pool._available_connections),
+                pool.max_connections,
+            )
+        )
+    return metrics
+
+
+def _usage(in_use: int, idle: int, max_connections: int) -> dict:
+    return {
+        "in_use": in_use,
+        "idle": idle,
+        "max_connections": max_connections,
+        "utilisation": round(in_use / max_connections, 3),
+    }
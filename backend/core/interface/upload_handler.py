@@ -0,0 +1,120 @@
+from core.dependencies import photo_repository
+from core.exceptions.exceptions import CloudUploadError
+from core.services.stored_object_service import StoredObjectService
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from typing import Optional
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Leading bytes of the image formats accepted by the photo endpoints
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+HEIF_BRANDS = (b"heic", b"heix", b"mif1", b"msf1")
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    """Detect an image type from the first bytes of a file."""
+    for signature, content_type in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[4:8] == b"ftyp" and head[8:12] in HEIF_BRANDS:
+        return "image/heic"
+    return None
+
+
+class StreamingPhotoUploadHandler(TemporaryFileUploadHandler):
+    """
+    Send photo uploads to storage while the request body is being read.
+
+    Every chunk is hashed and written to the repository stream as it
+    arrives, so memory use is bounded by one storage part whatever the file
+    size. A copy is spooled to a temporary file on disk for variant
+    generation. The resulting file carries `stored_url`, `content_hash` and
+    the sniffed `content_type`. If streaming fails, `stored_url` is None and
+    the service uploads the spooled copy instead.
+
+    The stream is only completed once the hash is known: content already
+    stored, or sent earlier in the same request, is aborted instead, so
+    the object is never created. Files smaller than one storage part have
+    then sent no bytes at all.
+
+    `stored_urls` lists what the streams created, for the view to delete
+    when the request fails after parsing.
+    """
+
+    def __init__(self, request=None, folder_album_id=None):
+        super().__init__(request)
+        self.folder_album_id = folder_album_id
+        self._streamed_hashes = set()
+        self._stored_files = []
+
+    @property
+    def stored_urls(self) -> list:
+        # The service clears stored_url of the objects it deleted itself
+        return [file.stored_url for file in self._stored_files if file.stored_url]
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self._sha256 = hashlib.sha256()
+        self._stream = None
+        self._stream_failed = False
+
+    def receive_data_chunk(self, raw_data, start):
+        if start == 0:
+            self.content_type = sniff_content_type(raw_data[:16]) or self.content_type
+            self.file.content_type = self.content_type
+
+        self._sha256.update(raw_data)
+        self._write_to_stream(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        file.content_hash = self._sha256.hexdigest()
+        file.stored_url = None
+        if self._stream is None:
+            return file
+        if self._is_duplicate(file.content_hash):
+            self._stream.abort()
+            return file
+        try:
+            file.stored_url = self._stream.complete()
+            self._streamed_hashes.add(file.content_hash)
+            self._stored_files.append(file)
+        except CloudUploadError as e:
+            logger.warning(f"Streaming upload of {file.name} failed: {e}")
+        return file
+
+    def upload_interrupted(self):
+        if self._stream is not None:
+            self._stream.abort()
+        super().upload_interrupted()
+
+    def _is_duplicate(self, content_hash: str) -> bool:
+        if content_hash in self._streamed_hashes:
+            return True
+        return StoredObjectService.is_stored(content_hash)
+
+    def _write_to_stream(self, raw_data):
+        if self._stream_failed:
+            return
+        try:
+            if self._stream is None:
+                self._stream = photo_repository.open_stream(
+                    self.file_name, self.folder_album_id, self.content_type
+                )
+            self._stream.write(raw_data)
+        except CloudUploadError as e:
+            logger.warning(f"Streaming upload of {self.file_name} failed: {e}")
+            if self._stream is not None:
+                self._stream.abort()
+            self._stream = None
+            self._stream_failed = True
@@ -0,0 +1,61 @@
+from core.services import StorageGcService
+from core.services.storage_gc_service import (
+    STORAGE_GC_MIN_AGE_HOURS,
+    STORAGE_GC_PAGE_SIZE,
+)
+from django.core.management.base import BaseCommand, CommandError
+from datetime import timedelta
+
+
+class Command(BaseCommand):
+    help = "Delete the storage objects no photo or album references anymore."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the orphaned objects without deleting them.",
+        )
+        parser.add_argument(
+            "--min-age-hours",
+            type=float,
+            default=STORAGE_GC_MIN_AGE_HOURS,
+            help="Keep objects modified more recently than this.",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=STORAGE_GC_PAGE_SIZE,
+            help="Number of objects listed, and at most deleted, per page.",
+        )
+
+    def handle(self, *args, **options):
+        if options["page_size"] < 1:
+            raise CommandError("--page-size must be positive")
+        if options["min_age_hours"] < 0:
+            raise CommandError("--min-age-hours cannot be negative")
+
+        stats = StorageGcService.collect(
+            dry_run=options["dry_run"],
+            min_age=timedelta(hours=options["min_age_hours"]),
+            page_size=options["page_size"],
+            on_page=self._report_progress,
+        )
+
+        verb = "would delete" if options["dry_run"] else "deleted"
+        deleted = stats["orphans"] if options["dry_run"] else stats["deleted"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Scanned {stats['scanned']} objects against {stats['referenced']} "
+                f"references in {stats['elapsed']:.1f}s: {verb} {deleted} orphans "
+                f"({stats['orphan_bytes'] / 1024 / 1024:.1f} MB), "
+                f"{stats['recent']} too recent, {stats['failed']} failed"
+            )
+        )
+
+    def _report_progress(self, stats: dict):
+        rate = stats["scanned"] / stats["elapsed"] if stats["elapsed"] else 0.0
+        self.stdout.write(
+            f"{stats['scanned']} scanned, {stats['orphans']} orphans, "
+            f"{stats['deleted']} deleted ({rate:.0f} objects/s)"
+        )
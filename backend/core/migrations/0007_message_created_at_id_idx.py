@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_alter_album_description_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="message_created_at_id_idx"
+            ),
+        ),
+    ]
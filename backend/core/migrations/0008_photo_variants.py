@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_message_created_at_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="album",
+            name="cover_variants",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="variants",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0009_storedobject"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="bucketpoint",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="bucketpoint_created_at_id_idx"
+            ),
+        ),
+    ]
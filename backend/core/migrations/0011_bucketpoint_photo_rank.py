@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:31
+
+from django.db import migrations, models
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def spread(count):
+    # Frozen copy of RankService.spread
+    base = len(DIGITS)
+    width = 1
+    while base**width <= count:
+        width += 1
+    keys = []
+    for position in range(1, count + 1):
+        value = position * base**width // (count + 1)
+        digits = ""
+        for _ in range(width):
+            value, digit = divmod(value, base)
+            digits = DIGITS[digit] + digits
+        keys.append(digits.rstrip("0"))
+    return keys
+
+
+def rank_newest_first(queryset):
+    items = list(queryset.order_by("-created_at", "-id").only("id"))
+    for item, key in zip(items, spread(len(items))):
+        item.rank = key
+    queryset.model.objects.bulk_update(items, ["rank"], batch_size=500)
+
+
+def rank_existing_rows(apps, schema_editor):
+    BucketPoint = apps.get_model("core", "BucketPoint")
+    Photo = apps.get_model("core", "Photo")
+    rank_newest_first(BucketPoint.objects.all())
+    for album_id in Photo.objects.values_list("album_id", flat=True).distinct():
+        rank_newest_first(Photo.objects.filter(album_id=album_id))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_bucketpoint_created_at_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bucketpoint",
+            name="rank",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="rank",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name="bucketpoint",
+            index=models.Index(fields=["rank", "id"], name="bucketpoint_rank_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="photo",
+            index=models.Index(
+                fields=["album", "rank", "id"], name="photo_album_rank_id_idx"
+            ),
+        ),
+        migrations.RunPython(rank_existing_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:03
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_bucketpoint_photo_rank"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="bucketpoint",
+            name="bucketpoint_created_at_id_idx",
+        ),
+    ]
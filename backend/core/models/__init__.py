@@ -2,3 +2,4 @@ from .message import Message
 from .bucketpoint import BucketPoint
 from .album import Album
 from .photo import Photo
+from .stored_object import StoredObject
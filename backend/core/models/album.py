@@ -7,6 +7,7 @@ class Album(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     cover_image = models.URLField(max_length=200, blank=True, null=True)
+    cover_variants = models.JSONField(default=dict, blank=True)
 
     def __str__(self):
         return self.title
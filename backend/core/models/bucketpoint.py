@@ -6,6 +6,13 @@ class BucketPoint(models.Model):
     description = models.TextField(null=True)
     completed = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Position in the list, see core/services/rank_service.py
+    rank = models.CharField(max_length=64, default="", blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["rank", "id"], name="bucketpoint_rank_id_idx"),
+        ]
 
     def __str__(self):
         return self.title
@@ -8,5 +8,12 @@ class Message(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     status = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["-created_at", "-id"], name="message_created_at_id_idx"
+            ),
+        ]
+
     def __str__(self):
         return f"Message from {self.user.username} at {self.created_at}"
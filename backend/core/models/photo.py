@@ -9,6 +9,16 @@ class Photo(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     location = models.CharField(max_length=255, blank=True, null=True)
+    variants = models.JSONField(default=dict, blank=True)
+    # Position in the album, see core/services/rank_service.py
+    rank = models.CharField(max_length=64, default="", blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["album", "rank", "id"], name="photo_album_rank_id_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"Photo in {self.album.title} - {self.caption or 'No Caption'}"
@@ -0,0 +1,14 @@
+from django.db import models
+
+
+class StoredObject(models.Model):
+    """An uploaded file in photo storage, shared by every photo with the same content."""
+
+    content_hash = models.CharField(max_length=64, unique=True)
+    url = models.URLField(max_length=200, db_index=True)
+    variants = models.JSONField(default=dict, blank=True)
+    ref_count = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.content_hash[:12]} ({self.ref_count} refs)"
@@ -1,5 +1,5 @@
 from .message import MessageSerializer
 from .bucketpoint import BucketPointSerializer
 from .album import AlbumSerializer
-from .photo import PhotoSerializer
+from .photo import PhotoSerializer, PhotoListSerializer
 from .user import UserSerializer
@@ -15,11 +15,16 @@ class AlbumSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "cover_image",
+            "cover_variants",
             "nb_photos",
         ]
-        read_only_fields = ["created_at", "updated_at"]
+        read_only_fields = ["created_at", "updated_at", "cover_variants"]
 
     def get_nb_photos(self, album):
+        # Listing querysets are annotated with photo_count by AlbumService.getAll
+        photo_count = getattr(album, "photo_count", None)
+        if photo_count is not None:
+            return photo_count
         return Photo.objects.filter(album=album).count()
 
     def create(self, validated_data):
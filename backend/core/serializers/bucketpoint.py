@@ -5,8 +5,8 @@ from ..models.bucketpoint import BucketPoint
 class BucketPointSerializer(serializers.ModelSerializer):
     class Meta:
         model = BucketPoint
-        fields = ["id", "title", "description", "completed", "created_at"]
-        read_only_fields = ["created_at"]
+        fields = ["id", "title", "description", "completed", "created_at", "rank"]
+        read_only_fields = ["created_at", "rank"]
 
     def create(self, validated_data):
         request = self.context.get("request")
@@ -16,8 +16,10 @@ class PhotoSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "location",
+            "variants",
+            "rank",
         ]
-        read_only_fields = ["created_at", "updated_at"]
+        read_only_fields = ["created_at", "updated_at", "variants", "rank"]
 
     def create(self, validated_data):
         request = self.context.get("request")
@@ -27,4 +29,25 @@ class PhotoSerializer(serializers.ModelSerializer):
         if not album:
             raise serializers.ValidationError({"album": "Album manquant"})
 
+        # The album of the context wins over one passed to save()
+        validated_data.pop("album", None)
         return Photo.objects.create(album=album, **validated_data)
+
+
+class PhotoListSerializer(serializers.ModelSerializer):
+    album_id = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Photo
+        fields = [
+            "id",
+            "album_id",
+            "image_url",
+            "caption",
+            "created_at",
+            "updated_at",
+            "location",
+            "variants",
+            "rank",
+        ]
+        read_only_fields = fields
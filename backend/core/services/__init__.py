@@ -3,3 +3,6 @@ from .album_service import AlbumService
 from .bucketpoints_service import BucketPointService
 from .photo_service import PhotoService
 from .user_service import UserService
+from .stored_object_service import StoredObjectService
+from .storage_gc_service import StorageGcService
+from .response_cache_service import ResponseCacheService
@@ -1,7 +1,14 @@
 from ..models import Album
 from ..serializers import AlbumSerializer
-from core.dependencies import photo_repository
+from core.dependencies import photo_repository, variant_generator, deletion_queue
+from core.services.stored_object_service import StoredObjectService
+from core.services.response_cache_service import ResponseCacheService
+from core.websocket.utils import send_ws_broadcast
+from core.utils import form_fields
+from core.websocket.messages import WebSocketMessageType
 from rest_framework.exceptions import NotFound, ValidationError
+from django.db import transaction
+from django.db.models import Count
 from django.shortcuts import get_object_or_404
 
 
@@ -9,35 +16,41 @@ class AlbumService:
 
     @staticmethod
     def getAll():
-        albums = Album.objects.all()
+        albums = Album.objects.annotate(photo_count=Count("photos"))
         return albums
 
     @staticmethod
     def createAlbum(raw_data, file):
-        data = raw_data.copy()
+        data = form_fields(raw_data)
+        cover_variants = {}
         if "image" in file and file["image"]:
             link = photo_repository.save(file["image"])
             data["cover_image"] = link
+            cover_variants = variant_generator.generate(file["image"])
 
         serializer = AlbumSerializer(data=data)
 
         if not serializer.is_valid():
             raise ValidationError(serializer.errors)
 
-        serializer.save()
+        serializer.save(cover_variants=cover_variants)
+        ResponseCacheService.invalidate(ResponseCacheService.ALBUMS)
         return serializer.data
 
     @staticmethod
     def _replace_cover_image(data, album, file):
         if album.cover_image and album.cover_image != "":
             photo_repository.delete(album.cover_image)
+            variant_generator.delete(album.cover_variants)
             link = photo_repository.save(file["image"])
             data["cover_image"] = link
+            # Saved with the instance by the serializer update
+            album.cover_variants = variant_generator.generate(file["image"])
         return data
 
     @classmethod
     def modifyAlbum(cls, id, raw_data, file):
-        data = raw_data.copy()
+        data = form_fields(raw_data)
         album = get_object_or_404(Album, pk=id)
 
         if not "image" in file or not file["image"]:
@@ -50,5 +63,27 @@ class AlbumService:
             raise ValidationError(serializer.errors)
 
         serializer.save()
+        ResponseCacheService.invalidate(ResponseCacheService.ALBUMS)
         # TODO: Use websockets to notify other users about the new album
         return serializer.data
+
+    @staticmethod
+    def deleteAlbum(id):
+        """
+        Delete an album and its photos, then clean storage in the background.
+
+        Rows are removed in one transaction; the released objects are only
+        queued for batched deletion once it has committed.
+        """
+        with transaction.atomic():
+            album = get_object_or_404(Album.objects.select_for_update(), pk=id)
+            entries = list(album.photos.values_list("image_url", "variants"))
+            entries.append((album.cover_image, album.cover_variants))
+            to_delete = StoredObjectService.release_many(entries)
+            album.delete()
+            transaction.on_commit(lambda: deletion_queue.enqueue(to_delete))
+
+        ResponseCacheService.invalidate(
+            ResponseCacheService.ALBUMS, ResponseCacheService.photos(id)
+        )
+        send_ws_broadcast(WebSocketMessageType.ALBUM_DELETED, {"id": id})
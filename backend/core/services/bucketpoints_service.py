@@ -1,20 +1,44 @@
 from core.models import BucketPoint
 from core.serializers import BucketPointSerializer
-from django.contrib.auth.models import User
-from core.websocket.utils import send_ws_message_to_user
+from core.services.rank_service import RankService
+from core.services.response_cache_service import ResponseCacheService
+from core.websocket.utils import send_ws_broadcast
 from core.websocket.messages import WebSocketMessageType
 from rest_framework.exceptions import ValidationError, NotFound
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from dotenv import load_dotenv, find_dotenv
+from typing import Optional
+import os
+
+load_dotenv(find_dotenv())
+
+# Operations accepted by one bulk request
+BUCKETPOINT_BULK_LIMIT = int(os.getenv("BUCKETPOINT_BULK_LIMIT", 500))
 
 
 class BucketPointService:
 
     @staticmethod
-    def get_all() -> list:
-        bucket_points = BucketPoint.objects.all()
-        serializer = BucketPointSerializer(bucket_points, many=True)
-        data = list(serializer.data)
-        data.sort(key=lambda x: x["created_at"], reverse=True)
-        return data
+    def get_queryset(completed: Optional[bool] = None):
+        """Bucket points in list order, sorted by the database on its index."""
+        bucket_points = BucketPoint.objects.order_by("rank", "id")
+        if completed is not None:
+            bucket_points = bucket_points.filter(completed=completed)
+        return bucket_points
+
+    @classmethod
+    def get_all(cls) -> list:
+        serializer = BucketPointSerializer(cls.get_queryset(), many=True)
+        return list(serializer.data)
+
+    @staticmethod
+    def get_summary() -> dict:
+        """Counts of the bucket list, in a single aggregate query."""
+        counts = BucketPoint.objects.aggregate(
+            total=Count("id"), completed=Count("id", filter=Q(completed=True))
+        )
+        return {**counts, "remaining": counts["total"] - counts["completed"]}
 
     @classmethod
     def create(cls, data: dict, context: dict) -> dict:
@@ -24,7 +48,7 @@ class BucketPointService:
         if not serializer.is_valid():
             raise ValidationError(serializer.errors)
 
-        bucket = serializer.save()
+        bucket = serializer.save(rank=cls._ranks_for_new_points(1)[0])
         payload = BucketPointSerializer(bucket).data
 
         cls._broadcast_change(
@@ -67,9 +91,161 @@ class BucketPointService:
             WebSocketMessageType.BUCKETPOINT_DELETED, {"id": payload_id}
         )
 
+    @classmethod
+    def move(cls, pk: int, after) -> dict:
+        """Place a bucket point right after bucket point `after`, or first."""
+        if after is not None and (not isinstance(after, int) or after == pk):
+            raise ValidationError({"after": "Id d'un autre bucket point attendu"})
+
+        rank = RankService.move(
+            BucketPoint.objects.all(),
+            pk,
+            after,
+            collections=(ResponseCacheService.BUCKETPOINTS,),
+        )
+        if rank is None:
+            raise NotFound("Bucket point not found.")
+
+        payload = {"id": pk, "rank": rank, "after": after}
+        cls._broadcast_change(WebSocketMessageType.BUCKETPOINT_MOVED, payload)
+        return payload
+
+    @classmethod
+    def bulk(cls, data: dict, context: dict) -> dict:
+        """
+        Create, update and delete many bucket points in one transaction.
+
+        `data` holds optional `create` (new points), `update` (partial points
+        with their `id`) and `delete` (ids) lists. Rows are written with one
+        bulk_create, one bulk_update and one DELETE ... IN of the ids that
+        exist, then a single BUCKETPOINT_BATCH_CHANGED event carries every
+        change.
+        """
+        to_create, to_update, to_delete = cls._parse_bulk(data)
+
+        with transaction.atomic():
+            created = cls._bulk_create(to_create, context)
+            updated = cls._bulk_update(to_update)
+            deleted = cls._bulk_delete(to_delete)
+
+        payload = {
+            "created": BucketPointSerializer(created, many=True).data,
+            "updated": BucketPointSerializer(updated, many=True).data,
+            "deleted": deleted,
+        }
+        cls._broadcast_change(WebSocketMessageType.BUCKETPOINT_BATCH_CHANGED, payload)
+        return payload
+
+    @staticmethod
+    def _parse_bulk(data) -> tuple:
+        if not isinstance(data, dict):
+            raise ValidationError({"detail": "Objet JSON attendu"})
+        operations = [data.get(key) or [] for key in ("create", "update", "delete")]
+        if not all(isinstance(items, list) for items in operations):
+            raise ValidationError(
+                {"detail": "create, update et delete doivent être des listes"}
+            )
+        count = sum(len(items) for items in operations)
+        if count == 0:
+            raise ValidationError({"detail": "Aucune opération fournie"})
+        if count > BUCKETPOINT_BULK_LIMIT:
+            raise ValidationError(
+                {"detail": f"{BUCKETPOINT_BULK_LIMIT} opérations au maximum"}
+            )
+
+        to_create, to_update, to_delete = operations
+        if not all(
+            isinstance(item, dict) and isinstance(item.get("id"), int)
+            for item in to_update
+        ):
+            raise ValidationError({"update": "Chaque élément doit avoir un id"})
+        if not all(isinstance(pk, int) for pk in to_delete):
+            raise ValidationError({"delete": "Liste d'ids attendue"})
+        ids = [item["id"] for item in to_update] + to_delete
+        if len(set(ids)) != len(ids):
+            raise ValidationError(
+                {"detail": "Chaque id ne peut apparaître qu'une fois"}
+            )
+        return to_create, to_update, to_delete
+
+    @staticmethod
+    def _ranks_for_new_points(count: int) -> list:
+        # New bucket points go to the top of the list
+        return RankService.keys_before_first(
+            BucketPoint.objects.all(),
+            count,
+            collections=(ResponseCacheService.BUCKETPOINTS,),
+        )
+
+    @classmethod
+    def _bulk_create(cls, items: list, context: dict) -> list:
+        if not items:
+            return []
+        serializer = BucketPointSerializer(data=items, many=True, context=context)
+        if not serializer.is_valid():
+            raise ValidationError({"create": serializer.errors})
+
+        bucket_points = [
+            BucketPoint(rank=rank, **values)
+            for values, rank in zip(
+                serializer.validated_data, cls._ranks_for_new_points(len(items))
+            )
+        ]
+        if connection.features.can_return_rows_from_bulk_insert:
+            return BucketPoint.objects.bulk_create(bucket_points)
+        # Backends such as MySQL do not return primary keys from bulk_create
+        # and bucket points have no other unique column to read them back by
+        for bucket_point in bucket_points:
+            bucket_point.save()
+        return bucket_points
+
+    @staticmethod
+    def _bulk_update(items: list) -> list:
+        if not items:
+            return []
+        instances = BucketPoint.objects.select_for_update().in_bulk(
+            [item["id"] for item in items]
+        )
+        missing = [item["id"] for item in items if item["id"] not in instances]
+        if missing:
+            raise NotFound(f"Bucket points not found: {missing}")
+
+        errors = {}
+        fields = set()
+        for item in items:
+            serializer = BucketPointSerializer(
+                instances[item["id"]], data=item, partial=True
+            )
+            if not serializer.is_valid():
+                errors[item["id"]] = serializer.errors
+                continue
+            for field, value in serializer.validated_data.items():
+                setattr(instances[item["id"]], field, value)
+                fields.add(field)
+        if errors:
+            raise ValidationError({"update": errors})
+
+        updated = [instances[item["id"]] for item in items]
+        if fields:
+            BucketPoint.objects.bulk_update(updated, sorted(fields))
+        return updated
+
     @staticmethod
-    def _broadcast_change(message_type: str, message_data: dict):
-        recipients = User.objects.all().values_list("id", flat=True)
+    def _bulk_delete(ids: list) -> list:
+        if not ids:
+            return []
+        # Unknown ids are skipped: only the removed rows are broadcast
+        existing = set(
+            BucketPoint.objects.select_for_update()
+            .filter(pk__in=ids)
+            .values_list("id", flat=True)
+        )
+        deleted = [pk for pk in ids if pk in existing]
+        if deleted:
+            BucketPoint.objects.filter(pk__in=deleted).delete()
+        return deleted
 
-        for uid in recipients:
-            send_ws_message_to_user(uid, message_type, message_data)
+    @staticmethod
+    def _broadcast_change(message_type: str, message_data: dict):
+        ResponseCacheService.invalidate(ResponseCacheService.BUCKETPOINTS)
+        send_ws_broadcast(message_type, message_data)
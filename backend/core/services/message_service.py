@@ -1,8 +1,9 @@
 from django.contrib.auth.models import User
 from core.serializers import MessageSerializer
-from core.websocket.utils import send_ws_message_to_user
+from core.services.response_cache_service import ResponseCacheService
+from core.websocket.utils import send_ws_broadcast
 from core.websocket.messages import WebSocketMessageType
-from core.utils import send_formatted_mail
+from core.dependencies import mail_queue
 from channels.layers import get_channel_layer
 from ..models import Message
 from rest_framework.exceptions import ValidationError
@@ -23,37 +24,31 @@ class MessageService:
 
         receiver = User.objects.exclude(id=sender.id).first()
         if receiver:
-            try:
-                send_formatted_mail(str(receiver.email), str(receiver.username))
-            except Exception as e:
-                print(f"Erreur d'envoi d'email: {e}")
+            mail_queue.enqueue(str(receiver.email), str(receiver.username))
         return payload
 
     @classmethod
     def _notify_recipients(cls, sender, message_payload, webSocketMessageType):
+        ResponseCacheService.invalidate(ResponseCacheService.MESSAGES)
         channel_layer = get_channel_layer()
         if channel_layer is None:
             return
-        recipients = User.objects.all().values_list("id", flat=True)
 
-        for uid in recipients:
-
-            send_ws_message_to_user(
-                uid,
-                webSocketMessageType,
-                {
-                    "message": message_payload,
-                    "sender": {
-                        "id": sender.id,
-                        "username": sender.username,
-                        "email": sender.email,
-                    },
+        send_ws_broadcast(
+            webSocketMessageType,
+            {
+                "message": message_payload,
+                "sender": {
+                    "id": sender.id,
+                    "username": sender.username,
+                    "email": sender.email,
                 },
-            )
+            },
+        )
 
     @staticmethod
     def getAll():
-        return Message.objects.all().order_by("-created_at")
+        return Message.objects.select_related("user").order_by("-created_at", "-id")
 
     @classmethod
     def delete(cls, pk, user):
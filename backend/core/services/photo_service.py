@@ -1,14 +1,29 @@
 from core.models import Album, Photo
-from core.serializers import PhotoSerializer
-from core.dependencies import photo_repository
-from core.websocket.utils import send_ws_message_to_user
+from core.serializers import PhotoSerializer, PhotoListSerializer
+from core.dependencies import photo_repository, variant_generator, deletion_queue
+from core.services.stored_object_service import StoredObjectService
+from core.services.rank_service import RankService
+from core.services.response_cache_service import ResponseCacheService
+from core.websocket.utils import send_ws_broadcast
 from core.websocket.messages import WebSocketMessageType
-from django.contrib.auth.models import User
+from core.exceptions import CloudUploadError
+from core.utils import form_fields
+from django.core.exceptions import ValidationError as ModelValidationError
+from django.db import connection, transaction
 from rest_framework.exceptions import NotFound, ValidationError
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv, find_dotenv
 import logging
+import os
+
+load_dotenv(find_dotenv())
 
 logger = logging.getLogger(__name__)
 
+# Number of files uploaded to storage concurrently by a batch upload
+PHOTO_UPLOAD_WORKERS = int(os.getenv("PHOTO_UPLOAD_WORKERS", 4))
+
 
 def _sanitize_for_log(value):
     """
@@ -27,35 +42,47 @@ class PhotoService:
         text = str(value)
         return text.replace("\r", "").replace("\n", "")
 
+    @staticmethod
+    def get_album(album_id) -> Album:
+        try:
+            return Album.objects.get(pk=album_id)
+        except Album.DoesNotExist:
+            raise NotFound(f"Album with id {album_id} not found")
+
     @staticmethod
     def get_photos_by_album_id(album_id):
-        photos = Photo.objects.filter(album_id=album_id)
-        photos = PhotoSerializer(photos, many=True).data
+        photos = Photo.objects.filter(album_id=album_id).order_by("rank", "id")
+        photos = PhotoListSerializer(photos, many=True).data
         return photos
 
     @classmethod
     def save_photo(cls, album_id, request):
         """Save a photo and broadcast the upload event."""
-        data = request.data.copy()
+        data = form_fields(request.data)
         file = request.FILES
 
-        try:
-            album = Album.objects.get(pk=album_id)
-        except Album.DoesNotExist:
-            raise NotFound(f"Album with id {album_id} not found")
+        album = cls.get_album(album_id)
 
+        link, variants = None, {}
         if "image" in file and file["image"]:
-            link = photo_repository.save_within_folder(
-                file["image"], folder_album_id=album_id
-            )
+            stored = cls._store_images([file["image"]], album_id)[0]
+            if isinstance(stored, CloudUploadError):
+                raise stored
+            link, variants = stored
             data["image_url"] = link
         data["album"] = album_id
 
         serializer = PhotoSerializer(
             data=data, context={"request": request, "album": album}
         )
-        serializer.is_valid(raise_exception=True)
-        photo = serializer.save(album=album)
+        if not serializer.is_valid():
+            if link is not None:
+                # Drop the reference taken by _store_images
+                StoredObjectService.release(link)
+            raise ValidationError(serializer.errors)
+        photo = serializer.save(
+            album=album, variants=variants, rank=cls._ranks_for_new_photos(album, 1)[0]
+        )
         photo_data = PhotoSerializer(photo).data
 
         safe_album_id = cls._sanitize_for_log(album_id)
@@ -70,16 +97,284 @@ class PhotoService:
 
         return photo_data
 
+    @classmethod
+    def save_photos(cls, album_id, request) -> list:
+        """
+        Save every file of a multi-file upload and broadcast one batch event.
+
+        Files are uploaded through a bounded thread pool and the rows are
+        inserted with a single bulk_create. Returns one result per file, in
+        upload order, holding either the created photo or an error.
+        """
+        files = request.FILES.getlist("images")
+        if not files:
+            raise ValidationError({"images": "Aucun fichier fourni"})
+
+        album = cls.get_album(album_id)
+
+        caption = request.data.get("caption")
+        location = request.data.get("location")
+
+        results = []
+        pending = []
+        for file, stored in zip(files, cls._store_images(files, album_id)):
+            result = {"file": file.name}
+            results.append(result)
+            if isinstance(stored, CloudUploadError):
+                result["error"] = str(stored)
+                continue
+            link, variants = stored
+
+            photo = Photo(
+                album=album,
+                image_url=link,
+                caption=caption,
+                location=location,
+                variants=variants,
+            )
+            try:
+                photo.full_clean(exclude=["album"], validate_unique=False)
+            except ModelValidationError as e:
+                StoredObjectService.release(link)
+                result["error"] = "; ".join(e.messages)
+                continue
+            pending.append((result, photo))
+
+        created = cls._bulk_create_photos([photo for _, photo in pending])
+        photos_data = PhotoListSerializer(created, many=True).data
+        for (result, _), photo_data in zip(pending, photos_data):
+            result["photo"] = photo_data
+
+        safe_album_id = cls._sanitize_for_log(album_id)
+        logger.info(
+            f"Batch upload to album {safe_album_id}: "
+            f"{len(created)} saved, {len(results) - len(created)} failed"
+        )
+
+        if photos_data:
+            cls._broadcast_change(
+                WebSocketMessageType.PHOTO_BATCH_UPLOADED,
+                {"data": photos_data, "album_id": album_id},
+            )
+
+        return results
+
+    @classmethod
+    def _store_images(cls, files, album_id) -> list:
+        """
+        Store uploads, reusing objects already stored with the same content.
+
+        Each distinct content is uploaded at most once, through a bounded
+        thread pool. Returns, for every file, its (url, variants) pair or the
+        CloudUploadError raised while uploading it.
+        """
+        hashes = [
+            getattr(file, "content_hash", None)
+            or StoredObjectService.content_hash(file)
+            for file in files
+        ]
+        counts = Counter(hashes)
+        stored = StoredObjectService.acquire(counts)
+
+        to_upload = {}
+        for file, content_hash in zip(files, hashes):
+            if content_hash not in stored and content_hash not in to_upload:
+                to_upload[content_hash] = file
+            elif getattr(file, "stored_url", None):
+                # Streamed during the request, but identical content is kept
+                photo_repository.delete(file.stored_url)
+                file.stored_url = None
+
+        if to_upload:
+            workers = max(1, min(PHOTO_UPLOAD_WORKERS, len(to_upload)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    content_hash: executor.submit(cls._store_image, file, album_id)
+                    for content_hash, file in to_upload.items()
+                }
+            for content_hash, future in futures.items():
+                try:
+                    link, variants = future.result()
+                except CloudUploadError as e:
+                    stored[content_hash] = e
+                    streamed = to_upload[content_hash]
+                    if getattr(streamed, "stored_url", None):
+                        # Nothing references the streamed original
+                        photo_repository.delete_many([streamed.stored_url])
+                        streamed.stored_url = None
+                    continue
+                stored[content_hash] = StoredObjectService.register(
+                    content_hash, link, variants, counts[content_hash]
+                )
+
+        return [
+            (
+                stored[content_hash]
+                if isinstance(stored[content_hash], CloudUploadError)
+                else (stored[content_hash].url, stored[content_hash].variants)
+            )
+            for content_hash in hashes
+        ]
+
+    @staticmethod
+    def _store_image(file, album_id) -> tuple:
+        """Upload an original to the album folder, then its resized variants."""
+        link = getattr(file, "stored_url", None)
+        if link is None:
+            link = photo_repository.save_within_folder(file, folder_album_id=album_id)
+        variants = variant_generator.generate(file, folder_album_id=album_id)
+        return link, variants
+
+    @staticmethod
+    def create_uploads(album_id, files) -> list:
+        """
+        Hand out one direct-to-storage upload target per requested file.
+
+        The client sends the bytes straight to storage, then calls
+        finalize_uploads with the returned keys.
+        """
+        if not isinstance(files, list) or not files:
+            raise ValidationError({"files": "Aucun fichier fourni"})
+        names = [
+            entry.get("name") if isinstance(entry, dict) else None for entry in files
+        ]
+        if not all(isinstance(name, str) and name.strip() for name in names):
+            raise ValidationError({"files": "Chaque fichier doit avoir un nom"})
+
+        if not Album.objects.filter(pk=album_id).exists():
+            raise NotFound(f"Album with id {album_id} not found")
+
+        uploads = []
+        for name in names:
+            upload = photo_repository.create_upload(name, folder_album_id=album_id)
+            uploads.append({"file": name, **upload})
+        return uploads
+
+    @classmethod
+    def finalize_uploads(cls, album_id, uploads) -> list:
+        """
+        Record a photo for every upload that reached storage.
+
+        Each entry carries the `key` returned by create_uploads and an
+        optional caption and location. Returns one result per entry, holding
+        either the created photo or an error, and broadcasts one batch event.
+        A key repeated in the request or already recorded is an error: its
+        object has no StoredObject row, so a single photo may own it.
+        """
+        if not isinstance(uploads, list) or not uploads:
+            raise ValidationError({"uploads": "Aucun upload fourni"})
+        if not all(
+            isinstance(entry, dict) and isinstance(entry.get("key"), str)
+            for entry in uploads
+        ):
+            raise ValidationError({"uploads": "Chaque upload doit avoir une clé"})
+
+        album = cls.get_album(album_id)
+
+        results = []
+        finalized = []
+        seen = set()
+        for entry in uploads:
+            result = {"key": entry["key"]}
+            results.append(result)
+            if entry["key"] in seen:
+                result["error"] = "Upload présent plusieurs fois"
+                continue
+            seen.add(entry["key"])
+            try:
+                link = photo_repository.finalize_upload(
+                    entry["key"], folder_album_id=album_id
+                )
+            except CloudUploadError as e:
+                result["error"] = str(e)
+                continue
+            if link is None:
+                result["error"] = "Fichier introuvable sur le stockage"
+                continue
+            finalized.append((result, entry, link))
+
+        # A replayed finalize must not give one object several owners
+        recorded = set(
+            Photo.objects.filter(
+                image_url__in=[link for _, _, link in finalized]
+            ).values_list("image_url", flat=True)
+        )
+        pending = []
+        for result, entry, link in finalized:
+            if link in recorded:
+                result["error"] = "Upload déjà enregistré"
+                continue
+            photo = Photo(
+                album=album,
+                image_url=link,
+                caption=entry.get("caption"),
+                location=entry.get("location"),
+            )
+            try:
+                photo.full_clean(exclude=["album"], validate_unique=False)
+            except ModelValidationError as e:
+                result["error"] = "; ".join(e.messages)
+                continue
+            pending.append((result, photo))
+
+        created = cls._bulk_create_photos([photo for _, photo in pending])
+        photos_data = PhotoListSerializer(created, many=True).data
+        for (result, _), photo_data in zip(pending, photos_data):
+            result["photo"] = photo_data
+
+        safe_album_id = cls._sanitize_for_log(album_id)
+        logger.info(
+            f"Direct uploads finalized in album {safe_album_id}: "
+            f"{len(created)} saved, {len(results) - len(created)} failed"
+        )
+
+        if photos_data:
+            cls._broadcast_change(
+                WebSocketMessageType.PHOTO_BATCH_UPLOADED,
+                {"data": photos_data, "album_id": album_id},
+            )
+
+        return results
+
+    @staticmethod
+    def _ranks_for_new_photos(album, count: int) -> list:
+        # New photos go to the top of the album, most recent first
+        return RankService.keys_before_first(
+            Photo.objects.filter(album_id=album.id),
+            count,
+            collections=(ResponseCacheService.photos(album.id),),
+        )
+
+    @classmethod
+    def _bulk_create_photos(cls, photos: list) -> list:
+        if photos:
+            ranks = cls._ranks_for_new_photos(photos[0].album, len(photos))
+            for photo, rank in zip(photos, ranks):
+                photo.rank = rank
+        if connection.features.can_return_rows_from_bulk_insert:
+            return Photo.objects.bulk_create(photos)
+        # Backends such as MySQL do not return primary keys from bulk_create,
+        # and deduplicated photos share their URL with other rows
+        with transaction.atomic():
+            for photo in photos:
+                photo.save()
+        return photos
+
     @classmethod
     def delete_photo(cls, photo_id: int, album_id: int) -> None:
-        """Delete a photo and broadcast the deletion event."""
+        """Delete a photo, release its stored file and broadcast the deletion event."""
         try:
             photo = Photo.objects.get(pk=photo_id, album_id=album_id)
         except Photo.DoesNotExist:
             raise NotFound(f"Photo with id {photo_id} not found in album {album_id}")
 
         deleted_id = photo.id
-        photo.delete()
+        with transaction.atomic():
+            photo.delete()
+            to_delete = StoredObjectService.release_many(
+                [(photo.image_url, photo.variants)]
+            )
+            transaction.on_commit(lambda: deletion_queue.enqueue(to_delete))
 
         safe_album_id = cls._sanitize_for_log(album_id)
         safe_deleted_id = cls._sanitize_for_log(deleted_id)
@@ -117,10 +412,31 @@ class PhotoService:
 
         return photo_data
 
+    @classmethod
+    def move_photo(cls, photo_id: int, album_id: int, after) -> dict:
+        """Place a photo right after photo `after` of its album, or first."""
+        if after is not None and (not isinstance(after, int) or after == photo_id):
+            raise ValidationError({"after": "Id d'une autre photo attendu"})
+
+        rank = RankService.move(
+            Photo.objects.filter(album_id=album_id),
+            photo_id,
+            after,
+            collections=(ResponseCacheService.photos(album_id),),
+        )
+        if rank is None:
+            raise NotFound(f"Photo with id {photo_id} not found in album {album_id}")
+
+        payload = {"id": photo_id, "rank": rank, "after": after, "album_id": album_id}
+        cls._broadcast_change(WebSocketMessageType.PHOTO_MOVED, payload)
+        return payload
+
     @staticmethod
     def _broadcast_change(message_type: WebSocketMessageType, message_data: dict):
-        """Broadcast a photo change to all authenticated users."""
-        recipients = User.objects.all().values_list("id", flat=True)
-
-        for uid in recipients:
-            send_ws_message_to_user(uid, message_type, message_data)
+        """Broadcast a photo change to all connected clients."""
+        # Album lists carry the photo count
+        ResponseCacheService.invalidate(
+            ResponseCacheService.photos(message_data["album_id"]),
+            ResponseCacheService.ALBUMS,
+        )
+        send_ws_broadcast(message_type, message_data)
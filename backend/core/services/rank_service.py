@@ -0,0 +1,198 @@
+from core.services.response_cache_service import ResponseCacheService
+from concurrent.futures import ThreadPoolExecutor
+from django.db import close_old_connections, transaction
+from dotenv import load_dotenv, find_dotenv
+from typing import Optional
+import logging
+import os
+
+load_dotenv(find_dotenv())
+
+logger = logging.getLogger(__name__)
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+# Keys longer than this trigger a background rebalance of their list
+RANK_REBALANCE_LENGTH = int(os.getenv("RANK_REBALANCE_LENGTH", 16))
+
+_rebalance_executor = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="rank-rebalance"
+)
+
+
+class RankService:
+    """
+    Lexicographic rank keys giving lists a user-controlled order.
+
+    A key is a base-36 fraction written with digits and lowercase letters,
+    which sort the same way under every collation, and never ends with
+    "0", so there is always room for another key between two neighbours.
+    Moving an item therefore rewrites its own row only. Repeated moves into
+    the same gap lengthen the keys, and a list whose keys grow past
+    RANK_REBALANCE_LENGTH is rewritten with short, evenly spaced keys.
+    """
+
+    @classmethod
+    def key_between(cls, lower: Optional[str], upper: Optional[str]) -> str:
+        """Key sorting strictly between `lower` and `upper`; None is open."""
+        lower = lower or ""
+        if upper is not None and upper <= lower:
+            raise ValueError(f"Rank {upper!r} must sort after {lower!r}")
+        # At the ends, step instead of halving: keys then grow by one digit
+        # every 35 inserts at the same end rather than every 5
+        if lower and upper is None:
+            return cls._after(lower)
+        if not lower and upper is not None:
+            return cls._before(upper)
+        return cls._midpoint(lower, upper)
+
+    @classmethod
+    def keys_between(
+        cls, lower: Optional[str], upper: Optional[str], count: int
+    ) -> list:
+        """`count` increasing keys between `lower` and `upper`, evenly split."""
+        if count <= 0:
+            return []
+        middle = cls.key_between(lower, upper)
+        half = count // 2
+        return (
+            cls.keys_between(lower, middle, half)
+            + [middle]
+            + cls.keys_between(middle, upper, count - half - 1)
+        )
+
+    @staticmethod
+    def spread(count: int) -> list:
+        """`count` short keys spaced evenly over the whole key space."""
+        base = len(DIGITS)
+        width = 1
+        while base**width <= count:
+            width += 1
+        keys = []
+        for position in range(1, count + 1):
+            value = position * base**width // (count + 1)
+            digits = ""
+            for _ in range(width):
+                value, digit = divmod(value, base)
+                digits = DIGITS[digit] + digits
+            keys.append(digits.rstrip("0"))
+        return keys
+
+    @classmethod
+    def keys_before_first(
+        cls, queryset, count: int = 1, collections: tuple = ()
+    ) -> list:
+        """`count` keys placing new items, in order, before those of `queryset`."""
+        first = (
+            queryset.filter(rank__gt="")
+            .order_by("rank", "id")
+            .values_list("rank", flat=True)
+            .first()
+        )
+        keys = cls.keys_between(None, first, count)
+        if keys and len(keys[0]) > RANK_REBALANCE_LENGTH:
+            cls.rebalance_later(queryset, *collections)
+        return keys
+
+    @classmethod
+    def move(
+        cls, queryset, pk: int, after: Optional[int], collections: tuple = ()
+    ) -> Optional[str]:
+        """
+        Place item `pk` of `queryset` right after item `after`, or first.
+
+        Reads the ranks around the target position and writes the moved row
+        only. Returns the new key, or None when `pk` or `after` is not in
+        `queryset`. `collections` are the cached lists a rebalance changes.
+        """
+        lower = None
+        if after is not None:
+            lower = queryset.filter(pk=after).values_list("rank", flat=True).first()
+            if lower is None:
+                return None
+        upper = (
+            queryset.filter(rank__gt=lower or "")
+            .exclude(pk=pk)
+            .order_by("rank", "id")
+            .values_list("rank", flat=True)
+            .first()
+        )
+        key = cls.key_between(lower, upper)
+        if not queryset.filter(pk=pk).update(rank=key):
+            return None
+        if len(key) > RANK_REBALANCE_LENGTH:
+            cls.rebalance_later(queryset, *collections)
+        return key
+
+    @classmethod
+    def rebalance(cls, queryset) -> int:
+        """Rewrite the keys of `queryset` evenly, keeping its order."""
+        with transaction.atomic():
+            items = list(
+                queryset.select_for_update().order_by("rank", "id").only("id", "rank")
+            )
+            for item, key in zip(items, cls.spread(len(items))):
+                item.rank = key
+            queryset.model.objects.bulk_update(items, ["rank"], batch_size=500)
+        return len(items)
+
+    @classmethod
+    def rebalance_later(cls, queryset, *collections: str):
+        """Rebalance on a background thread once the transaction commits."""
+        transaction.on_commit(
+            lambda: _rebalance_executor.submit(
+                cls._rebalance_in_background, queryset, collections
+            )
+        )
+
+    @classmethod
+    def _rebalance_in_background(cls, queryset, collections):
+        close_old_connections()
+        try:
+            count = cls.rebalance(queryset)
+        except Exception:
+            logger.exception(f"Rebalancing {queryset.model.__name__} ranks failed")
+            return
+        finally:
+            close_old_connections()
+        # Cached lists carry the former keys
+        ResponseCacheService.invalidate(*collections)
+        logger.info(f"Rebalanced the ranks of {count} {queryset.model.__name__}")
+
+    @staticmethod
+    def _before(upper: str) -> str:
+        """Shortest key found by lowering a digit of `upper`."""
+        for position, digit in enumerate(upper):
+            value = DIGITS.index(digit)
+            if value > 1:
+                return upper[:position] + DIGITS[value - 1]
+        return upper[:-1] + DIGITS[0] + DIGITS[-1]
+
+    @staticmethod
+    def _after(lower: str) -> str:
+        """Shortest key found by raising a digit of `lower`."""
+        for position, digit in enumerate(lower):
+            value = DIGITS.index(digit)
+            if value < len(DIGITS) - 1:
+                return lower[:position] + DIGITS[value + 1]
+        return lower + DIGITS[1]
+
+    @classmethod
+    def _midpoint(cls, lower: str, upper: Optional[str]) -> str:
+        if upper is not None:
+            # Skip the shared prefix, reading missing digits of lower as "0"
+            shared = 0
+            while (
+                shared < len(upper)
+                and (lower[shared] if shared < len(lower) else "0") == upper[shared]
+            ):
+                shared += 1
+            if shared:
+                return upper[:shared] + cls._midpoint(lower[shared:], upper[shared:])
+
+        low = DIGITS.index(lower[0]) if lower else 0
+        high = DIGITS.index(upper[0]) if upper is not None else len(DIGITS)
+        if high - low > 1:
+            return DIGITS[(low + high) // 2]
+        if upper is not None and len(upper) > 1:
+            return upper[0]
+        return DIGITS[low] + cls._midpoint(lower[1:], None)
@@ -0,0 +1,106 @@
+from django.core.cache import cache
+from redis.exceptions import RedisError
+from dotenv import load_dotenv, find_dotenv
+from typing import Callable, Optional
+import logging
+import os
+import time
+
+load_dotenv(find_dotenv())
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached list is kept, bounding staleness after out-of-band edits
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", 300))
+
+
+class ResponseCacheService:
+    """
+    Serialized list responses cached per collection and version.
+
+    Each collection has a version counter, bumped by the services whenever
+    they change it, right before broadcasting the matching WebSocket event.
+    A cached list is stored with the version it was built at and served only
+    while that version is current, so the version and the entry are read in
+    one round trip and a list built concurrently with a write is never
+    served once the write has committed. The version also serves as the
+    ETag of the list. When the cache is unreachable the list is built from
+    the database as before, without a version.
+    """
+
+    ALBUMS = "albums"
+    BUCKETPOINTS = "bucketpoints"
+    MESSAGES = "messages"
+
+    @staticmethod
+    def photos(album_id) -> str:
+        return f"photos:{album_id}"
+
+    @staticmethod
+    def _version_key(collection: str) -> str:
+        return f"response_version:{collection}"
+
+    @staticmethod
+    def _entry_key(collection: str) -> str:
+        return f"response:{collection}"
+
+    @classmethod
+    def lookup(cls, collection: str) -> tuple:
+        """
+        Current version of `collection` and its cached data, in one round trip.
+
+        The data is None when nothing is cached for that version, the version
+        when the cache is unavailable.
+        """
+        version_key = cls._version_key(collection)
+        entry_key = cls._entry_key(collection)
+        try:
+            cached = cache.get_many([version_key, entry_key])
+            version = cached.get(version_key)
+            if version is None:
+                version = cls._initial_version(version_key)
+        except RedisError as e:
+            logger.warning(f"Response cache unavailable: {e}")
+            return None, None
+
+        entry = cached.get(entry_key)
+        if version is not None and entry is not None and entry[0] == version:
+            return version, entry[1]
+        return version, None
+
+    @classmethod
+    def store(cls, collection: str, version: Optional[int], data):
+        if version is None:
+            return
+        try:
+            cache.set(cls._entry_key(collection), (version, data), RESPONSE_CACHE_TTL)
+        except RedisError as e:
+            logger.warning(f"Response cache unavailable: {e}")
+
+    @classmethod
+    def get_or_build(cls, collection: str, build: Callable):
+        """Cached data of `collection`, or the result of `build()`, cached."""
+        version, data = cls.lookup(collection)
+        if data is None:
+            data = build()
+            cls.store(collection, version, data)
+        return data
+
+    @classmethod
+    def invalidate(cls, *collections: str):
+        """Bump the version of `collections`; call once the change is committed."""
+        for collection in collections:
+            version_key = cls._version_key(collection)
+            try:
+                cache.add(version_key, time.time_ns(), timeout=None)
+                cache.incr(version_key)
+            except (RedisError, ValueError) as e:
+                # The stale entry is then served until RESPONSE_CACHE_TTL
+                logger.warning(f"Response cache of {collection} not invalidated: {e}")
+
+    @staticmethod
+    def _initial_version(version_key: str) -> Optional[int]:
+        # Versions never expire. Should one be evicted anyway, starting again
+        # from the clock keeps it from repeating a version clients hold.
+        cache.add(version_key, time.time_ns(), timeout=None)
+        return cache.get(version_key)
@@ -0,0 +1,102 @@
+from core.models import Album, Photo, StoredObject
+from core.dependencies import photo_repository
+from django.utils import timezone
+from datetime import timedelta
+from dotenv import load_dotenv, find_dotenv
+import logging
+import os
+import time
+
+load_dotenv(find_dotenv())
+
+logger = logging.getLogger(__name__)
+
+# Objects younger than this may belong to an upload that is not saved yet
+STORAGE_GC_MIN_AGE_HOURS = float(os.getenv("STORAGE_GC_MIN_AGE_HOURS", 24))
+STORAGE_GC_PAGE_SIZE = int(os.getenv("STORAGE_GC_PAGE_SIZE", 1000))
+# Rows fetched per round trip while collecting the referenced URLs
+SCAN_CHUNK_SIZE = 2000
+
+REFERENCING_FIELDS = (
+    (Photo, "image_url", "variants"),
+    (Album, "cover_image", "cover_variants"),
+    (StoredObject, "url", "variants"),
+)
+
+
+class StorageGcService:
+    """
+    Mark-and-sweep collection of storage objects nothing references.
+
+    The mark phase streams the URLs of photos, album covers and their
+    variants out of the database; the sweep lists the album covers, then
+    every album folder, including those of deleted albums, and deletes, one
+    page at a time, the objects missing from that set.
+    """
+
+    @staticmethod
+    def referenced_urls() -> set:
+        referenced = set()
+        for model, url_field, variants_field in REFERENCING_FIELDS:
+            rows = model.objects.values_list(url_field, variants_field).iterator(
+                chunk_size=SCAN_CHUNK_SIZE
+            )
+            for url, variants in rows:
+                if url:
+                    referenced.add(url)
+                referenced.update((variants or {}).values())
+        return referenced
+
+    @classmethod
+    def collect(
+        cls,
+        dry_run: bool = False,
+        min_age: timedelta = timedelta(hours=STORAGE_GC_MIN_AGE_HOURS),
+        page_size: int = STORAGE_GC_PAGE_SIZE,
+        on_page=None,
+    ) -> dict:
+        """
+        Delete unreferenced objects older than `min_age` and return the run
+        statistics; `on_page` is called with them after every listed page.
+        """
+        started = time.monotonic()
+        # Marking first: objects uploaded afterwards are within the grace period
+        referenced = cls.referenced_urls()
+        modified_before = timezone.now() - min_age
+
+        stats = {
+            "referenced": len(referenced),
+            "scanned": 0,
+            "recent": 0,
+            "orphans": 0,
+            "orphan_bytes": 0,
+            "deleted": 0,
+            "failed": 0,
+            "elapsed": 0.0,
+        }
+        for page in photo_repository.list_objects(page_size):
+            orphans = []
+            for stored in page:
+                stats["scanned"] += 1
+                if stored["url"] in referenced:
+                    continue
+                if stored["last_modified"] >= modified_before:
+                    stats["recent"] += 1
+                    continue
+                orphans.append(stored["url"])
+                stats["orphan_bytes"] += stored["size"]
+            stats["orphans"] += len(orphans)
+
+            if orphans and not dry_run:
+                failed = photo_repository.delete_unreferenced(orphans, modified_before)
+                stats["deleted"] += len(orphans) - len(failed)
+                stats["failed"] += len(failed)
+                if failed:
+                    logger.warning(f"{len(failed)} orphaned objects not deleted")
+
+            stats["elapsed"] = time.monotonic() - started
+            if on_page is not None:
+                on_page(stats)
+
+        stats["elapsed"] = time.monotonic() - started
+        return stats
@@ -0,0 +1,171 @@
+from core.models import StoredObject
+from core.dependencies import photo_repository, variant_generator
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from collections import Counter, defaultdict
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+# Bounds the number of parameters of each `url IN (...)` lookup
+RELEASE_BATCH_SIZE = 500
+
+
+def _batches(items: list) -> list:
+    return [
+        items[i : i + RELEASE_BATCH_SIZE]
+        for i in range(0, len(items), RELEASE_BATCH_SIZE)
+    ]
+
+
+class StoredObjectService:
+    """
+    Reference-counted index of storage objects by content hash.
+
+    Identical uploads resolve to the same object: callers hash the file,
+    take references on objects that already exist and only upload the rest.
+    Releasing the last reference removes the object from storage.
+    """
+
+    @staticmethod
+    def content_hash(file) -> str:
+        """SHA-256 of `file`, read in chunks; the file is rewound afterwards."""
+        sha256 = hashlib.sha256()
+        file.seek(0)
+        if hasattr(file, "chunks"):
+            chunks = file.chunks(HASH_CHUNK_SIZE)
+        else:
+            chunks = iter(lambda: file.read(HASH_CHUNK_SIZE), b"")
+        for chunk in chunks:
+            sha256.update(chunk)
+        file.seek(0)
+        return sha256.hexdigest()
+
+    @staticmethod
+    def is_stored(content_hash: str) -> bool:
+        return StoredObject.objects.filter(content_hash=content_hash).exists()
+
+    @staticmethod
+    def acquire(counts: dict) -> dict:
+        """
+        Take `counts[hash]` references on every already stored object.
+
+        Returns the objects found, keyed by hash; hashes missing from the
+        result have to be uploaded and registered.
+        """
+        found = {
+            stored.content_hash: stored
+            for stored in StoredObject.objects.filter(content_hash__in=list(counts))
+        }
+        for content_hash, stored in list(found.items()):
+            updated = StoredObject.objects.filter(pk=stored.pk).update(
+                ref_count=F("ref_count") + counts[content_hash]
+            )
+            if not updated:
+                # Released and deleted since the lookup: upload it again
+                del found[content_hash]
+        return found
+
+    @classmethod
+    def register(
+        cls, content_hash: str, url: str, variants: dict, count: int = 1
+    ) -> StoredObject:
+        """
+        Record a freshly uploaded object holding `count` references.
+
+        When a concurrent upload registered the same content first, the
+        duplicate object is deleted and the existing one is returned.
+        """
+        try:
+            with transaction.atomic():
+                return StoredObject.objects.create(
+                    content_hash=content_hash,
+                    url=url,
+                    variants=variants,
+                    ref_count=count,
+                )
+        except IntegrityError:
+            existing = cls.acquire({content_hash: count}).get(content_hash)
+            if existing is None:
+                raise
+            cls._delete_from_storage(url, variants)
+            return existing
+
+    @classmethod
+    def release(cls, url: str, variants: dict = None):
+        """Drop one reference to `url`, deleting the object with the last one."""
+        with transaction.atomic():
+            stored = StoredObject.objects.select_for_update().filter(url=url).first()
+            if stored is not None:
+                if stored.ref_count > 1:
+                    stored.ref_count = F("ref_count") - 1
+                    stored.save(update_fields=["ref_count"])
+                    return
+                variants = stored.variants
+                stored.delete()
+
+        # Last reference, or an object uploaded before deduplication existed
+        cls._delete_from_storage(url, variants)
+
+    @staticmethod
+    def release_many(entries: list) -> list:
+        """
+        Drop one reference per (url, variants) entry in a single transaction.
+
+        Nothing is deleted from storage here: the URLs whose last reference
+        went away, variants included, are returned for the caller to remove
+        once its own transaction has committed.
+        """
+        counts = Counter(url for url, _ in entries if url)
+        legacy_variants = {url: variants for url, variants in entries if url}
+        to_delete = []
+
+        with transaction.atomic():
+            rows = []
+            for urls in _batches(list(counts)):
+                rows += StoredObject.objects.select_for_update().filter(url__in=urls)
+
+            emptied = []
+            decrements = defaultdict(list)
+            for stored in rows:
+                released = counts.pop(stored.url)
+                if stored.ref_count <= released:
+                    emptied.append(stored.pk)
+                    to_delete += [stored.url, *stored.variants.values()]
+                else:
+                    decrements[released].append(stored.pk)
+
+            for pks in _batches(emptied):
+                StoredObject.objects.filter(pk__in=pks).delete()
+            for released, pks in decrements.items():
+                for batch in _batches(pks):
+                    StoredObject.objects.filter(pk__in=batch).update(
+                        ref_count=F("ref_count") - released
+                    )
+
+        # URLs stored before deduplication existed have a single owner
+        for url in counts:
+            to_delete += [url, *(legacy_variants[url] or {}).values()]
+        return to_delete
+
+    @staticmethod
+    def discard_unregistered(urls: list) -> list:
+        """
+        Delete the objects of `urls` no StoredObject row records, such as
+        uploads streamed by a request that failed; return those not deleted.
+        """
+        urls = [url for url in urls if url]
+        registered = set(
+            StoredObject.objects.filter(url__in=urls).values_list("url", flat=True)
+        )
+        orphans = [url for url in urls if url not in registered]
+        if not orphans:
+            return []
+        return photo_repository.delete_many(orphans)
+
+    @staticmethod
+    def _delete_from_storage(url: str, variants: dict = None):
+        photo_repository.delete(url)
+        variant_generator.delete(variants)
@@ -1,25 +1,9 @@
 from django.contrib.auth.models import User
 from channels.layers import get_channel_layer
+from core.websocket.presence import count_live_connections
 from rest_framework.exceptions import NotFound
 from redis.exceptions import RedisError
-import redis
-import os
-from dotenv import load_dotenv, find_dotenv
-
-load_dotenv(find_dotenv())
-
-REDIS_URL = "redis://" + os.getenv("REDIS_HOST", "localhost")
-
-# Lazy Redis connection to avoid connection issues during module import
-_redis_client = None
-
-
-def get_redis_client():
-    """Get Redis client lazily to avoid connection issues during import."""
-    global _redis_client
-    if _redis_client is None:
-        _redis_client = redis.Redis.from_url(REDIS_URL)
-    return _redis_client
+from core.interface.redis_pool import get_redis_client
 
 
 class UserService:
@@ -37,7 +21,7 @@ class UserService:
             raise NotFound("No other user found.")
 
         try:
-            is_online = get_redis_client().sismember("online_users", str(other_user.id))
+            is_online = count_live_connections(get_redis_client(), other_user.id) > 0
         except RedisError as e:
             print(f"Redis Error: {e}")
             is_online = False
@@ -239,9 +239,7 @@ def patch_send_email():
     """Patch email sending functions."""
     with patch("core.utils.send_email") as mock_send:
         with patch("core.utils.send_formatted_mail") as mock_formatted:
-            with patch(
-                "core.services.message_service.send_formatted_mail"
-            ) as mock_service_mail:
+            with patch("core.services.message_service.mail_queue") as mock_service_mail:
                 yield {
                     "send_email": mock_send,
                     "send_formatted_mail": mock_formatted,
@@ -1,8 +1,11 @@
 import unittest
 from unittest.mock import MagicMock, patch
+from core.interface import aws
 from core.interface.aws import AwsPhotoSaver
 from core.exceptions.exceptions import CloudUploadError
 from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 
 TEST_AWS_BUCKET_NAME = "testing_bucket_name"
 TEST_AWS_REGION = "us-east-1"
@@ -16,6 +19,10 @@ TEST_EXPECTED_URL = (
     f"https://{TEST_AWS_BUCKET_NAME}.s3.{TEST_AWS_REGION}.amazonaws.com/{TEST_S3_KEY}"
 )
 TEST_EXPECTED_URL_FOLDER = f"https://{TEST_AWS_BUCKET_NAME}.s3.{TEST_AWS_REGION}.amazonaws.com/{TEST_S3_KEY_FOLDER}"
+TEST_COVER_KEY = f"0b8f6d4e-1c2a-4f3b-9d5e-6a7b8c9d0e1f_{TEST_FILE_NAME}"
+TEST_S3_KEY_ALBUM = f"7/{TEST_COVER_KEY}"
+TEST_EXPECTED_URL_ALBUM = f"https://{TEST_AWS_BUCKET_NAME}.s3.{TEST_AWS_REGION}.amazonaws.com/{TEST_S3_KEY_ALBUM}"
+TEST_EXPECTED_URL_COVER = f"https://{TEST_AWS_BUCKET_NAME}.s3.{TEST_AWS_REGION}.amazonaws.com/{TEST_COVER_KEY}"
 
 
 class TestAwsPhotoSaver(unittest.TestCase):
@@ -169,6 +176,400 @@ class TestAwsPhotoSaver(unittest.TestCase):
         with self.assertRaises(CloudUploadError):
             self.aws_saver.delete(TEST_EXPECTED_URL)
 
+    @patch("core.interface.aws.boto3")
+    @patch("core.interface.aws.uuid4")
+    def test_givenSeveralOperations_whenCalled_thenShouldBuildClientOnce(
+        self, mock_uuid, mock_boto3
+    ):
+        mock_uuid.return_value = TEST_GENERATED_UUID
+
+        self.aws_saver.save(self.mock_file)
+        self.aws_saver.save_within_folder(self.mock_file, TEST_ALBUM_FOLDER_ID)
+        self.aws_saver.delete(TEST_EXPECTED_URL)
+
+        mock_boto3.client.assert_called_once()
+
+    @patch("core.interface.aws.boto3")
+    def test_givenConcurrentCallers_whenGetClient_thenShouldShareOneClient(
+        self, mock_boto3
+    ):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = list(
+                executor.map(lambda _: self.aws_saver._get_s3_client(), range(32))
+            )
+
+        mock_boto3.client.assert_called_once()
+        self.assertTrue(all(client is clients[0] for client in clients))
+
+    @patch("core.interface.aws.boto3")
+    @patch("core.interface.aws.AWS_MAX_POOL_CONNECTIONS", 25)
+    def test_givenPoolSizeSetting_whenGetClient_thenShouldConfigurePool(
+        self, mock_boto3
+    ):
+        self.aws_saver._get_s3_client()
+
+        config = mock_boto3.client.call_args[1]["config"]
+        self.assertEqual(config.max_pool_connections, 25)
+
+    @patch("core.interface.aws.boto3")
+    @patch("core.interface.aws.uuid4")
+    def test_givenAValidFile_whenSave_thenShouldUploadWithTransferConfig(
+        self, mock_uuid, mock_boto3
+    ):
+        mock_uuid.return_value = TEST_GENERATED_UUID
+        mock_s3_client = MagicMock()
+        mock_boto3.client.return_value = mock_s3_client
+
+        self.aws_saver.save(self.mock_file)
+
+        _, kwargs = mock_s3_client.upload_fileobj.call_args
+        self.assertIs(kwargs["Config"], self.aws_saver._transfer_config)
+
+    @patch("core.interface.aws.uuid4")
+    @patch("core.interface.aws.AWS_BUCKET_NAME", TEST_AWS_BUCKET_NAME)
+    @patch("core.interface.aws.AWS_ENDPOINT_URL", "http://localhost:9000/")
+    @patch("core.interface.aws.DEBUG", False)
+    def test_givenCustomEndpoint_whenSave_thenShouldReturnPathStyleUrl(self, mock_uuid):
+        mock_uuid.return_value = TEST_GENERATED_UUID
+        self.aws_saver._s3_client = MagicMock()
+
+        result = self.aws_saver.save(self.mock_file)
+
+        self.assertEqual(
+            result, f"http://localhost:9000/{TEST_AWS_BUCKET_NAME}/{TEST_S3_KEY}"
+        )
+
+    @patch("core.interface.aws.uuid4")
+    @patch("core.interface.aws.AWS_BUCKET_NAME", TEST_AWS_BUCKET_NAME)
+    @patch("core.interface.aws.DEBUG", False)
+    def test_givenFileName_whenCreateUpload_thenShouldReturnPresignedPost(
+        self, mock_uuid
+    ):
+        mock_uuid.return_value = TEST_GENERATED_UUID
+        mock_s3_client = MagicMock()
+        mock_s3_client.generate_presigned_post.return_value = {
+            "url": "https://upload.example.com",
+            "fields": {"key": TEST_S3_KEY_FOLDER, "policy": "signed"},
+        }
+        self.aws_saver._s3_client = mock_s3_client
+
+        result = self.aws_saver.create_upload(
+            f"../../{TEST_FILE_NAME}", TEST_ALBUM_FOLDER_ID
+        )
+
+        self.assertEqual(result["key"], TEST_S3_KEY_FOLDER)
+        self.assertEqual(result["method"], "POST")
+        self.assertEqual(result["url"], "https://upload.example.com")
+        args, kwargs = mock_s3_client.generate_presigned_post.call_args
+        self.assertEqual(args, (TEST_AWS_BUCKET_NAME, TEST_S3_KEY_FOLDER))
+        self.assertEqual(kwargs["Fields"]["Content-Type"], "image/jpeg")
+        self.assertIn(
+            ["content-length-range", 1, aws.AWS_MAX_UPLOAD_SIZE],
+            kwargs["Conditions"],
+        )
+
+    @patch("core.interface.aws.AWS_BUCKET_NAME", TEST_AWS_BUCKET_NAME)
+    @patch("core.interface.aws.AWS_REGION", TEST_AWS_REGION)
+    @patch("core.interface.aws.DEBUG", False)
+    def test_givenUploadedObject_whenFinalizeUpload_thenShouldReturnUrl(self):
+        mock_s3_client = MagicMock()
+        self.aws_saver._s3_client = mock_s3_client
+
+        result = self.aws_saver.finalize_upload(
+            TEST_S3_KEY_FOLDER, TEST_ALBUM_FOLDER_ID
+        )
+
+        self.assertEqual(result, TEST_EXPECTED_URL_FOLDER)
+        mock_s3_client.head_object.assert_called_once_with(
+            Bucket=TEST_AWS_BUCKET_NAME, Key=TEST_S3_KEY_FOLDER
+        )
+
+    @patch("core.interface.aws.DEBUG", False)
+    def test_givenMissingObject_whenFinalizeUpload_thenShouldReturnNone(self):
+        mock_s3_client = MagicMock()
+        mock_s3_client.head_object.side_effect = ClientError(
+            {"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject"
+        )
+        self.aws_saver._s3_client = mock_s3_client
+
+        result = self.aws_saver.finalize_upload(
+            TEST_S3_KEY_FOLDER, TEST_ALBUM_FOLDER_ID
+        )
+
+        self.assertIsNone(result)
+
+    @patch("core.interface.aws.DEBUG", False)
+    def test_givenKeyOutsideAlbumFolder_whenFinalizeUpload_thenShouldNotTouchS3(
+        self,
+    ):
+        mock_s3_client = MagicMock()
+        self.aws_saver._s3_client = mock_s3_client
+
+        result = self.aws_saver.finalize_upload(
+            f"other_album/{TEST_S3_KEY}", TEST_ALBUM_FOLDER_ID
+        )
+
+        self.assertIsNone(result)
+        mock_s3_client.head_object.assert_not_called()
+
+    @patch("core.interface.aws.uuid4")
+    @patch("core.interface.aws.AWS_BUCKET_NAME", TEST_AWS_BUCKET_NAME)
+    @patch("core.interface.aws.AWS_REGION", TEST_AWS_REGION)
+    @patch("core.interface.aws.DEBUG", False)
+    def test_givenSmallStream_whenComplete_thenShouldPutSingleObject(self, mock_uuid):
+        mock_uuid.return_value = TEST_GENERATED_UUID
+        mock_s3_client = MagicMock()
+        self.aws_saver._s3_client = mock_s3_client
+
+        stream = self.aws_saver.open_stream(
+            TEST_FILE_NAME, TEST_ALBUM_FOLDER_ID, "image/jpeg"
+        )
+        stream.write(b"abc")
+        stream.write(b"def")
+        url = stream.complete()
+
+        self.assertEqual(url, TEST_EXPECTED_URL_FOLDER)
+        mock_s3_client.put_object.assert_called_once()
+        self.assertEqual(mock_s3_client.put_object.call_args[1]["Body"], b"abcdef")
+        mock_s3_client.create_multipart_upload.assert_not_called()
+
+    @patch("core.interface.aws.AWS_MULTIPART_CHUNKSIZE", 0)
+    @patch("core.interface.aws.S3_MIN_PART_SIZE", 4)
+    def test_givenLargeStream_whenWrite_thenShouldUploadBoundedParts(self):
+        mock_s3_client = MagicMock()
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "up"}
+        mock_s3_client.upload_part.side_effect = lambda **kwargs: {
+            "ETag": f"etag{kwargs['PartNumber']}"
+        }
+        self.aws_saver._s3_client = mock_s3_client
+
+        stream = self.aws_saver.open_stream(
+            TEST_FILE_NAME, TEST_ALBUM_FOLDER_ID, "image/jpeg"
+        )
+        for chunk in (b"abcd", b"efgh", b"ij"):
+            stream.write(chunk)
+        stream.complete()
+
+        bodies = [call[1]["Body"] for call in mock_s3_client.upload_part.call_args_list]
+        self.assertEqual(bodies, [b"abcd", b"efgh", b"ij"])
+        parts = mock_s3_client.complete_multipart_upload.call_args[1][
+            "MultipartUpload"
+        ]["Parts"]
+        self.assertEqual([part["PartNumber"] for part in parts], [1, 2, 3])
+
+    @patch("core.interface.aws.AWS_MULTIPART_CHUNKSIZE", 0)
+    @patch("core.interface.aws.S3_MIN_PART_SIZE", 4)
+    def test_givenPartFailure_whenWrite_thenShouldAbortMultipartUpload(self):
+        mock_s3_client = MagicMock()
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "up"}
+        mock_s3_client.upload_part.side_effect = ClientError(
+            {"Error": {"Code": "500", "Message": "Error"}}, "UploadPart"
+        )
+        self.aws_saver._s3_client = mock_s3_client
+        stream = self.aws_saver.open_stream(
+            TEST_FILE_NAME, TEST_ALBUM_FOLDER_ID, "image/jpeg"
+        )
+
+        with self.assertRaises(CloudUploadError):
+            stream.write(b"abcd")
+
+        mock_s3_client.abort_multipart_upload.assert_called_once()
+
+    @patch("core.interface.aws.AWS_BUCKET_NAME", TEST_AWS_BUCKET_NAME)
+    @patch("core.interface.aws.S3_DELETE_BATCH_SIZE", 2)
+    def test_givenManyUrls_whenDeleteMany_thenShouldBatchDeleteObjects(self):
+        mock_s3_client = MagicMock()
+        mock_s3_client.delete_objects.return_value = {}
+        self.aws_saver._s3_client = mock_s3_client
+        urls = [
+            f"https://{TEST_AWS_BUCKET_NAME}.s3.{TEST_AWS_REGION}.amazonaws.com/1/{i}"
+            for i in range(5)
+        ]
+
+        failed = self.aws_saver.delete_many(urls)
+
+        self.assertEqual(failed, [])
+        self.assertEqual(mock_s3_client.delete_objects.call_count, 3)
+        keys = sorted(
+            obj["Key"]
+            for call in mock_s3_client.delete_objects.call_args_list
+            for obj in call[1]["Delete"]["Objects"]
+        )
+        self.assertEqual(keys, [f"1/{i}" for i in range(5)])
+
+    def test_givenPartialFailure_whenDeleteMany_thenShouldReturnFailedUrls(self):
+        mock_s3_client = MagicMock()
+        mock_s3_client.delete_objects.return_value = {
+            "Errors": [{"Key": TEST_S3_KEY_FOLDER, "Code": "AccessDenied"}]
+        }
+        self.aws_saver._s3_client = mock_s3_client
+
+        failed = self.aws_saver.delete_many(
+            [TEST_EXPECTED_URL_FOLDER, TEST_EXPECTED_URL]
+        )
+
+        self.assertEqual(failed, [TEST_EXPECTED_URL_FOLDER])
+
+    def test_givenUrlInAlbumFolder_whenDelete_thenShouldKeepFolderInKey(self):
+        mock_s3_client = MagicMock()
+        self.aws_saver._s3_client = mock_s3_client
+
+        self.aws_saver.delete(TEST_EXPECTED_URL_FOLDER)
+
+        self.assertEqual(
+            mock_s3_client.delete_object.call_args[1]["Key"], TEST_S3_KEY_FOLDER
+        )
+
+    @patch("core.interface.aws.AWS_BUCKET_NAME", TEST_AWS_BUCKET_NAME)
+    @patch("core.interface.aws.AWS_REGION", TEST_AWS_REGION)
+    @patch("core.interface.aws.DEBUG", False)
+    def test_givenSharedBucket_whenListObjects_thenShouldListCoversAndAlbumFolders(
+        self,
+    ):
+        mock_s3_client = MagicMock()
+        mock_s3_client.get_paginator.return_value.paginate.side_effect = [
+            [
+                {
+                    "Contents": [
+                        {"Key": TEST_COVER_KEY, "Size": 30, "LastModified": "then"},
+                        {"Key": TEST_DEBUG_KEY, "Size": 20, "LastModified": "then"},
+                        {"Key": "backup.tar", "Size": 40, "LastModified": "then"},
+                    ],
+                    "CommonPrefixes": [
+                        {"Prefix": "7/"},
+                        {"Prefix": "debug_7/"},
+                        {"Prefix": "exports/"},
+                    ],
+                }
+            ],
+            [
+                {
+                    "Contents": [
+                        {"Key": TEST_S3_KEY_ALBUM, "Size": 10, "LastModified": "then"}
+                    ]
+                },
+                {},
+            ],
+        ]
+        self.aws_saver._s3_client = mock_s3_client
+
+        pages = list(self.aws_saver.list_objects(page_size=5000))
+
+        self.assertEqual(
+            pages,
+            [
+                [
+                    {
+                        "url": TEST_EXPECTED_URL_COVER,
+                        "size": 30,
+                        "last_modified": "then",
+                    }
+                ],
+                [
+                    {
+                        "url": TEST_EXPECTED_URL_ALBUM,
+                        "size": 10,
+                        "last_modified": "then",
+                    }
+                ],
+                [],
+            ],
+        )
+        paginate_calls = (
+            mock_s3_client.get_paginator.return_value.paginate.call_args_list
+        )
+        self.assertEqual(len(paginate_calls), 2)
+        self.assertEqual(paginate_calls[0][1]["Prefix"], "")
+        self.assertEqual(paginate_calls[0][1]["Delimiter"], "/")
+        self.assertEqual(paginate_calls[0][1]["PaginationConfig"], {"PageSize": 1000})
+        self.assertEqual(paginate_calls[1][1]["Prefix"], "7/")
+
+    @patch("core.interface.aws.DEBUG", True)
+    def test_givenDebugModeEnabled_whenListObjects_thenShouldOnlyListDebugKeys(self):
+        mock_s3_client = MagicMock()
+        mock_s3_client.get_paginator.return_value.paginate.side_effect = [
+            [
+                {
+                    "Contents": [
+                        {
+                            "Key": f"debug_{TEST_COVER_KEY}",
+                            "Size": 30,
+                            "LastModified": "then",
+                        },
+                    ],
+                    "CommonPrefixes": [{"Prefix": "debug_7/"}],
+                }
+            ],
+            [],
+        ]
+        self.aws_saver._s3_client = mock_s3_client
+
+        pages = list(self.aws_saver.list_objects(page_size=100))
+
+        paginate_calls = (
+            mock_s3_client.get_paginator.return_value.paginate.call_args_list
+        )
+        self.assertEqual(paginate_calls[0][1]["Prefix"], "debug_")
+        self.assertEqual(paginate_calls[1][1]["Prefix"], "debug_7/")
+        self.assertEqual(len(pages[0]), 1)
+
+    @patch("core.interface.aws.AWS_BUCKET_NAME", TEST_AWS_BUCKET_NAME)
+    @patch("core.interface.aws.AWS_REGION", TEST_AWS_REGION)
+    def test_givenObjectsOfDifferentAges_whenDeleteUnreferenced_thenShouldKeepRecentOnes(
+        self,
+    ):
+        cutoff = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        recent_url = TEST_EXPECTED_URL
+        mock_s3_client = MagicMock()
+        mock_s3_client.head_object.side_effect = lambda Bucket, Key: {
+            "LastModified": (
+                cutoff + timedelta(hours=1)
+                if Key == TEST_S3_KEY
+                else cutoff - timedelta(days=1)
+            )
+        }
+        mock_s3_client.delete_objects.return_value = {}
+        self.aws_saver._s3_client = mock_s3_client
+
+        kept = self.aws_saver.delete_unreferenced(
+            [TEST_EXPECTED_URL_FOLDER, recent_url], modified_before=cutoff
+        )
+
+        self.assertEqual(kept, [recent_url])
+        mock_s3_client.delete_objects.assert_called_once_with(
+            Bucket=TEST_AWS_BUCKET_NAME,
+            Delete={"Objects": [{"Key": TEST_S3_KEY_FOLDER}], "Quiet": True},
+        )
+
+    @patch("core.interface.aws.AWS_BUCKET_NAME", TEST_AWS_BUCKET_NAME)
+    @patch("core.interface.aws.AWS_REGION", TEST_AWS_REGION)
+    def test_givenHeadFails_whenDeleteUnreferenced_thenShouldKeepObjects(self):
+        mock_s3_client = MagicMock()
+        mock_s3_client.head_object.side_effect = [
+            ClientError({"Error": {"Code": "404"}}, "HeadObject"),
+            ClientError({"Error": {"Code": "AccessDenied"}}, "HeadObject"),
+        ]
+        self.aws_saver._s3_client = mock_s3_client
+
+        with patch("core.interface.aws.AWS_MAX_CONCURRENCY", 1):
+            kept = self.aws_saver.delete_unreferenced(
+                [TEST_EXPECTED_URL, TEST_EXPECTED_URL_FOLDER],
+                modified_before=datetime.now(timezone.utc),
+            )
+
+        self.assertEqual(kept, [TEST_EXPECTED_URL_FOLDER])
+        mock_s3_client.delete_objects.assert_not_called()
+
+    def test_givenListingFails_whenListObjects_thenShouldRaiseCloudUploadError(self):
+        mock_s3_client = MagicMock()
+        mock_s3_client.get_paginator.return_value.paginate.side_effect = ClientError(
+            {"Error": {"Code": "AccessDenied"}}, "ListObjectsV2"
+        )
+        self.aws_saver._s3_client = mock_s3_client
+
+        with self.assertRaises(CloudUploadError):
+            list(self.aws_saver.list_objects(page_size=100))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+from unittest.mock import MagicMock
+
+from core.interface.deletion_queue import StorageDeletionQueue
+
+TEST_URLS = ["https://bucket/1/a.jpg", "https://bucket/1/b.jpg"]
+TEST_TIMEOUT = 5
+
+
+class TestStorageDeletionQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.repository = MagicMock()
+        self.repository.delete_many.return_value = []
+        self.queue = StorageDeletionQueue(self.repository)
+
+    def test_givenUrls_whenEnqueue_thenShouldDeleteThemInOneCall(self):
+        failed = self.queue.enqueue(TEST_URLS + [None, ""]).result(TEST_TIMEOUT)
+
+        self.assertEqual(failed, [])
+        self.repository.delete_many.assert_called_once_with(TEST_URLS)
+
+    def test_givenNoUrls_whenEnqueue_thenShouldNotCallRepository(self):
+        self.queue.enqueue([]).result(TEST_TIMEOUT)
+
+        self.repository.delete_many.assert_not_called()
+
+    def test_givenRepositoryError_whenEnqueue_thenShouldReportEveryUrl(self):
+        self.repository.delete_many.side_effect = RuntimeError("boom")
+
+        failed = self.queue.enqueue(TEST_URLS).result(TEST_TIMEOUT)
+
+        self.assertEqual(failed, TEST_URLS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import io
+import unittest
+from unittest.mock import MagicMock
+from PIL import Image
+
+from core.exceptions.exceptions import CloudUploadError
+from core.interface.image_variants import ImageVariantGenerator, parse_variant_widths
+
+TEST_ALBUM_FOLDER_ID = 1
+TEST_FILE_NAME = "sunset.jpg"
+TEST_WIDTHS = {"thumbnail": 32, "medium": 128}
+
+
+def _image_file(width=200, height=100, name=TEST_FILE_NAME):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "orange").save(buffer, "JPEG")
+    buffer.seek(0)
+    buffer.name = name
+    return buffer
+
+
+class TestImageVariantGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.repository = MagicMock()
+        self.uploads = {}
+
+        def save_within_folder(file, folder_album_id):
+            self.uploads[file.name] = Image.open(io.BytesIO(file.read()))
+            return f"https://bucket/{folder_album_id}/{file.name}"
+
+        self.repository.save_within_folder.side_effect = save_within_folder
+        self.generator = ImageVariantGenerator(self.repository, widths=TEST_WIDTHS)
+
+    def test_givenImage_whenGenerate_thenShouldReturnOneUrlPerVariant(self):
+        variants = self.generator.generate(_image_file(), TEST_ALBUM_FOLDER_ID)
+
+        self.assertEqual(
+            variants,
+            {
+                "thumbnail": "https://bucket/1/sunset_thumbnail.webp",
+                "medium": "https://bucket/1/sunset_medium.webp",
+            },
+        )
+
+    def test_givenImage_whenGenerate_thenShouldResizeKeepingAspectRatio(self):
+        self.generator.generate(_image_file(), TEST_ALBUM_FOLDER_ID)
+
+        thumbnail = self.uploads["sunset_thumbnail.webp"]
+        self.assertEqual(thumbnail.format, "WEBP")
+        self.assertEqual(thumbnail.size, (32, 16))
+
+    def test_givenSmallImage_whenGenerate_thenShouldNotUpscale(self):
+        self.generator.generate(_image_file(64, 64), TEST_ALBUM_FOLDER_ID)
+
+        self.assertEqual(self.uploads["sunset_medium.webp"].size, (64, 64))
+
+    def test_givenJpegFormat_whenGenerate_thenShouldEncodeJpeg(self):
+        generator = ImageVariantGenerator(
+            self.repository, widths={"thumbnail": 32}, image_format="JPEG"
+        )
+
+        variants = generator.generate(_image_file(), TEST_ALBUM_FOLDER_ID)
+
+        self.assertTrue(variants["thumbnail"].endswith("sunset_thumbnail.jpg"))
+        self.assertEqual(self.uploads["sunset_thumbnail.jpg"].format, "JPEG")
+
+    def test_givenNoFolder_whenGenerate_thenShouldSaveAtRoot(self):
+        self.repository.save.return_value = "https://bucket/cover_thumbnail.webp"
+
+        self.generator.generate(_image_file())
+
+        self.assertEqual(self.repository.save.call_count, len(TEST_WIDTHS))
+        self.repository.save_within_folder.assert_not_called()
+
+    def test_givenNotAnImage_whenGenerate_thenShouldReturnNoVariants(self):
+        file = io.BytesIO(b"not an image")
+        file.name = "notes.txt"
+
+        self.assertEqual(self.generator.generate(file, TEST_ALBUM_FOLDER_ID), {})
+        self.repository.save_within_folder.assert_not_called()
+
+    def test_givenUploadFailure_whenGenerate_thenShouldSkipThatVariant(self):
+        def flaky_save(file, folder_album_id):
+            if "medium" in file.name:
+                raise CloudUploadError("Échec de l'upload vers S3")
+            return f"https://bucket/{folder_album_id}/{file.name}"
+
+        self.repository.save_within_folder.side_effect = flaky_save
+
+        variants = self.generator.generate(_image_file(), TEST_ALBUM_FOLDER_ID)
+
+        self.assertEqual(list(variants), ["thumbnail"])
+
+    def test_givenImage_whenGenerate_thenShouldRewindSourceFile(self):
+        file = _image_file()
+
+        self.generator.generate(file, TEST_ALBUM_FOLDER_ID)
+
+        self.assertEqual(file.tell(), 0)
+
+    def test_givenVariants_whenDelete_thenShouldDeleteEveryUrl(self):
+        self.generator.delete({"thumbnail": "a", "medium": "b"})
+
+        self.assertEqual(self.repository.delete.call_count, 2)
+
+    def test_givenWidthSpec_whenParse_thenShouldIgnoreInvalidEntries(self):
+        self.assertEqual(
+            parse_variant_widths("thumbnail:320, medium:1280,broken,zero:0"),
+            {"thumbnail": 320, "medium": 1280},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import hashlib
+import io
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from core.exceptions.exceptions import CloudUploadError
+from core.interface.local import LocalPhotoSaver
+
+TEST_BASE_URL = "https://photos.example.com/media/"
+TEST_ALBUM_FOLDER_ID = 1
+TEST_FILE_NAME = "Photo.JPG"
+TEST_CONTENT = b"jpeg bytes"
+TEST_DIGEST = hashlib.sha256(TEST_CONTENT).hexdigest()
+TEST_EXPECTED_URL = f"{TEST_BASE_URL}{TEST_DIGEST[:2]}/{TEST_DIGEST}.jpg"
+
+
+def _file(content=TEST_CONTENT, name=TEST_FILE_NAME):
+    file = io.BytesIO(content)
+    file.name = name
+    return file
+
+
+class TestLocalPhotoSaver(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.saver = LocalPhotoSaver(root=self.root, base_url=TEST_BASE_URL)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _blob_path(self, url):
+        return os.path.join(self.root, "objects", self.saver.resolve(url))
+
+    def test_givenAValidFile_whenSave_thenShouldReturnContentAddressedUrl(self):
+        url = self.saver.save(_file())
+
+        self.assertEqual(url, TEST_EXPECTED_URL)
+        with open(self._blob_path(url), "rb") as blob:
+            self.assertEqual(blob.read(), TEST_CONTENT)
+
+    def test_givenIdenticalUploads_whenSaveInDifferentAlbums_thenShouldStoreOneBlob(
+        self,
+    ):
+        first = self.saver.save_within_folder(_file(), TEST_ALBUM_FOLDER_ID)
+        second = self.saver.save_within_folder(_file(), TEST_ALBUM_FOLDER_ID + 1)
+
+        self.assertEqual(first, second)
+        shard = os.path.join(self.root, "objects", TEST_DIGEST[:2])
+        self.assertEqual(len(os.listdir(shard)), 1)
+
+    def test_givenAValidFile_whenSave_thenShouldLeaveNoTemporaryFile(self):
+        self.saver.save(_file())
+        self.saver.save(_file())
+
+        self.assertEqual(os.listdir(os.path.join(self.root, "tmp")), [])
+
+    def test_givenWriteFailure_whenSave_thenShouldRaiseAndCleanUp(self):
+        with patch("core.interface.local.os.replace", side_effect=OSError("full")):
+            with self.assertRaises(CloudUploadError):
+                self.saver.save(_file())
+
+        self.assertEqual(os.listdir(os.path.join(self.root, "tmp")), [])
+
+    def test_givenSharedBlob_whenDeleteOnce_thenShouldKeepBlob(self):
+        url = self.saver.save(_file())
+        self.saver.save(_file())
+
+        self.assertTrue(self.saver.delete(url))
+
+        self.assertTrue(os.path.exists(self._blob_path(url)))
+
+    def test_givenLastReference_whenDelete_thenShouldRemoveBlob(self):
+        url = self.saver.save(_file())
+        self.saver.save(_file())
+
+        self.saver.delete(url)
+        self.saver.delete(url)
+
+        self.assertFalse(os.path.exists(self._blob_path(url)))
+
+    def test_givenNoneUrl_whenDelete_thenShouldReturnTrue(self):
+        self.assertTrue(self.saver.delete(None))
+
+    def test_givenForeignOrTraversalUrl_whenDelete_thenShouldIgnoreIt(self):
+        self.assertFalse(self.saver.delete("https://bucket.s3.amazonaws.com/a.jpg"))
+        self.assertFalse(self.saver.delete(f"{TEST_BASE_URL}../../etc/passwd"))
+
+    def test_givenConcurrentIdenticalUploads_whenSave_thenShouldCountEveryReference(
+        self,
+    ):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            urls = list(executor.map(lambda _: self.saver.save(_file()), range(16)))
+
+        self.assertEqual(set(urls), {TEST_EXPECTED_URL})
+        refs = os.listdir(os.path.join(self.root, "refs", TEST_DIGEST))
+        self.assertEqual(len(refs), 16)
+
+    def test_givenStreamedChunks_whenComplete_thenShouldMatchSavedBlob(self):
+        stream = self.saver.open_stream(
+            TEST_FILE_NAME, TEST_ALBUM_FOLDER_ID, "image/jpeg"
+        )
+        stream.write(TEST_CONTENT[:4])
+        stream.write(TEST_CONTENT[4:])
+
+        self.assertEqual(stream.complete(), TEST_EXPECTED_URL)
+        self.assertEqual(self.saver.save(_file()), TEST_EXPECTED_URL)
+
+    def test_givenAbortedStream_whenAbort_thenShouldLeaveNoFile(self):
+        stream = self.saver.open_stream(
+            TEST_FILE_NAME, TEST_ALBUM_FOLDER_ID, "image/jpeg"
+        )
+        stream.write(TEST_CONTENT)
+
+        stream.abort()
+
+        self.assertEqual(os.listdir(os.path.join(self.root, "tmp")), [])
+        self.assertFalse(os.path.exists(os.path.join(self.root, "objects")))
+
+    def test_givenAnyFile_whenCreateUpload_thenShouldRaiseCloudUploadError(self):
+        with self.assertRaises(CloudUploadError):
+            self.saver.create_upload(TEST_FILE_NAME, TEST_ALBUM_FOLDER_ID)
+
+    def test_givenSeveralBlobs_whenListObjects_thenShouldYieldPagesOfPageSize(self):
+        urls = {self.saver.save(_file(f"bytes {i}".encode())) for i in range(5)}
+
+        pages = list(self.saver.list_objects(page_size=2))
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual({item["url"] for page in pages for item in page}, urls)
+        self.assertEqual(pages[0][0]["size"], len(b"bytes 0"))
+        self.assertIsNotNone(pages[0][0]["last_modified"].tzinfo)
+
+    def test_givenEmptyStore_whenListObjects_thenShouldYieldNothing(self):
+        self.assertEqual(list(self.saver.list_objects(page_size=10)), [])
+
+    def test_givenReferencedBlob_whenDeleteUnreferenced_thenShouldRemoveBlobAndRefs(
+        self,
+    ):
+        url = self.saver.save(_file())
+        self.saver.save(_file())
+        future = datetime.now(timezone.utc) + timedelta(hours=1)
+
+        kept = self.saver.delete_unreferenced([url], modified_before=future)
+
+        self.assertEqual(kept, [])
+        self.assertFalse(os.path.exists(self._blob_path(url)))
+        self.assertFalse(os.path.exists(os.path.join(self.root, "refs", TEST_DIGEST)))
+
+    def test_givenBlobSavedAfterCutoff_whenDeleteUnreferenced_thenShouldKeepIt(self):
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=1)
+        url = self.saver.save(_file())
+        old = (cutoff - timedelta(hours=1)).timestamp()
+        os.utime(self._blob_path(url), (old, old))
+        self.saver.save(_file())
+
+        kept = self.saver.delete_unreferenced([url], modified_before=cutoff)
+
+        self.assertEqual(kept, [url])
+        self.assertTrue(os.path.exists(self._blob_path(url)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+import smtplib
+import socketserver
+import threading
+import unittest
+from email import message_from_bytes
+from unittest.mock import MagicMock, patch
+
+from core.interface.mailer import MailQueue, SmtpConnection
+
+TEST_SENDER = "sender@example.com"
+TEST_RECIPIENT = "recipient@example.com"
+TEST_OTHER_RECIPIENT = "other@example.com"
+TEST_NAME = "Recipient"
+TEST_FLUSH_TIMEOUT = 5
+
+
+class _StubSmtpHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough SMTP for smtplib: EHLO, AUTH, MAIL, RCPT, DATA."""
+
+    def _reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        self.server.connections += 1
+        self._reply("220 stub ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().split(" ")[0].upper()
+            if command == "EHLO":
+                self._reply("250-stub")
+                self._reply("250 AUTH PLAIN")
+            elif command == "AUTH":
+                self._reply("235 authenticated")
+            elif command == "DATA":
+                self._reply("354 end with .")
+                data = b""
+                while not data.endswith(b"\r\n.\r\n"):
+                    data += self.rfile.readline()
+                self.server.messages.append(message_from_bytes(data[:-5]))
+                self._reply("250 queued")
+            elif command == "QUIT":
+                self._reply("221 bye")
+                return
+            else:
+                self._reply("250 OK")
+
+
+class _StubSmtpServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _StubSmtpHandler)
+        self.connections = 0
+        self.messages = []
+
+
+class TestMailQueueWithStubServer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = _StubSmtpServer()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address
+        self.connection = SmtpConnection(
+            host, port, TEST_SENDER, "password", use_tls=False
+        )
+        self.mail_queue = MailQueue(
+            self.connection, TEST_SENDER, digest_window=60, retry_backoff=0
+        )
+
+    def tearDown(self):
+        self.mail_queue.stop(timeout=TEST_FLUSH_TIMEOUT)
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_givenSeveralRecipients_whenFlush_thenShouldReuseOneConnection(self):
+        self.mail_queue.enqueue(TEST_RECIPIENT, TEST_NAME)
+        self.mail_queue.enqueue(TEST_OTHER_RECIPIENT, "Other")
+
+        self.assertTrue(self.mail_queue.flush(timeout=TEST_FLUSH_TIMEOUT))
+
+        self.assertEqual(len(self.server.messages), 2)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_givenBurstForOneRecipient_whenFlush_thenShouldSendSingleDigest(self):
+        for _ in range(3):
+            self.mail_queue.enqueue(TEST_RECIPIENT, TEST_NAME)
+
+        self.mail_queue.flush(timeout=TEST_FLUSH_TIMEOUT)
+
+        self.assertEqual(len(self.server.messages), 1)
+        message = self.server.messages[0]
+        self.assertEqual(message["To"], TEST_RECIPIENT)
+        html = message.get_payload()[1].get_payload(decode=True).decode()
+        self.assertIn("3 nouveaux messages", html)
+
+    def test_givenZeroDigestWindow_whenEnqueue_thenShouldSendWithoutFlush(self):
+        self.mail_queue.digest_window = 0
+
+        self.mail_queue.enqueue(TEST_RECIPIENT, TEST_NAME)
+        self.mail_queue.stop(timeout=TEST_FLUSH_TIMEOUT)
+
+        self.assertEqual(len(self.server.messages), 1)
+
+    def test_givenNothingQueued_whenFlush_thenShouldNotConnect(self):
+        self.mail_queue.flush(timeout=TEST_FLUSH_TIMEOUT)
+
+        self.assertEqual(self.server.connections, 0)
+
+
+class TestMailQueueRetry(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = MagicMock()
+        self.mail_queue = MailQueue(
+            self.connection, TEST_SENDER, digest_window=60, retry_backoff=0
+        )
+
+    def tearDown(self):
+        self.mail_queue.stop(timeout=TEST_FLUSH_TIMEOUT)
+
+    def test_givenTransientFailure_whenFlush_thenShouldRetry(self):
+        self.connection.send.side_effect = [smtplib.SMTPServerDisconnected(), None]
+
+        self.mail_queue.enqueue(TEST_RECIPIENT, TEST_NAME)
+        self.mail_queue.flush(timeout=TEST_FLUSH_TIMEOUT)
+
+        self.assertEqual(self.connection.send.call_count, 2)
+
+    def test_givenPersistentFailure_whenFlush_thenShouldGiveUpAfterMaxRetries(self):
+        self.connection.send.side_effect = OSError("connection refused")
+        self.mail_queue.max_retries = 2
+
+        self.mail_queue.enqueue(TEST_RECIPIENT, TEST_NAME)
+        self.mail_queue.flush(timeout=TEST_FLUSH_TIMEOUT)
+
+        self.assertEqual(self.connection.send.call_count, 3)
+
+    @patch("core.interface.mailer.time.sleep")
+    def test_givenFailures_whenRetrying_thenShouldBackOffExponentially(
+        self, mock_sleep
+    ):
+        self.connection.send.side_effect = OSError("connection refused")
+        self.mail_queue.max_retries = 3
+        self.mail_queue.retry_backoff = 1
+
+        self.mail_queue.enqueue(TEST_RECIPIENT, TEST_NAME)
+        self.mail_queue.flush(timeout=TEST_FLUSH_TIMEOUT)
+
+        delays = [call[0][0] for call in mock_sleep.call_args_list]
+        self.assertEqual(delays, [1, 2, 4])
+
+    def test_givenUnexpectedError_whenFlush_thenShouldKeepWorkerRunning(self):
+        self.connection.send.side_effect = [ValueError("bad address"), None]
+
+        self.mail_queue.enqueue(TEST_RECIPIENT, TEST_NAME)
+        self.assertTrue(self.mail_queue.flush(timeout=TEST_FLUSH_TIMEOUT))
+        self.mail_queue.enqueue(TEST_OTHER_RECIPIENT, "Other")
+        self.assertTrue(self.mail_queue.flush(timeout=TEST_FLUSH_TIMEOUT))
+
+        self.assertEqual(self.connection.send.call_count, 2)
+
+
+class TestMailQueueShutdown(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = MagicMock()
+        self.mail_queue = MailQueue(self.connection, TEST_SENDER, digest_window=60)
+
+    @patch("core.interface.mailer.atexit.register")
+    def test_givenStartedWorker_whenEnqueue_thenShouldStopAtExitOnce(
+        self, mock_register
+    ):
+        self.mail_queue.enqueue(TEST_RECIPIENT, TEST_NAME)
+        self.mail_queue.enqueue(TEST_OTHER_RECIPIENT, "Other")
+        self.mail_queue.stop(timeout=TEST_FLUSH_TIMEOUT)
+
+        mock_register.assert_called_once()
+        self.assertEqual(mock_register.call_args[0][0], self.mail_queue.stop)
+
+    @patch("core.interface.mailer.atexit.register")
+    def test_givenPendingDigest_whenStop_thenShouldSendIt(self, _):
+        self.mail_queue.enqueue(TEST_RECIPIENT, TEST_NAME)
+
+        self.mail_queue.stop(timeout=TEST_FLUSH_TIMEOUT)
+
+        self.connection.send.assert_called_once()
+        self.connection.close.assert_called_once()
+
+
+class TestSmtpConnection(unittest.TestCase):
+
+    @patch("core.interface.mailer.smtplib.SMTP")
+    def test_givenSendError_whenSend_thenShouldReconnectOnNextSend(self, mock_smtp):
+        first_server, second_server = MagicMock(), MagicMock()
+        first_server.send_message.side_effect = smtplib.SMTPServerDisconnected()
+        mock_smtp.side_effect = [first_server, second_server]
+        connection = SmtpConnection("smtp.example.com", 587, TEST_SENDER, "password")
+
+        with self.assertRaises(smtplib.SMTPServerDisconnected):
+            connection.send(MagicMock())
+        connection.send(MagicMock())
+
+        self.assertEqual(mock_smtp.call_count, 2)
+        first_server.starttls.assert_called_once()
+        second_server.send_message.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
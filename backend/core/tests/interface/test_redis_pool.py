@@ -0,0 +1,84 @@
+import unittest
+from unittest.mock import patch
+from asgiref.sync import async_to_sync
+
+from core.interface import redis_pool
+
+
+class TestRedisPool(unittest.TestCase):
+
+    def setUp(self):
+        self.sync_patcher = patch.object(redis_pool, "_sync_client", None)
+        self.sync_patcher.start()
+        self.async_patcher = patch.object(
+            redis_pool, "_async_clients", redis_pool.weakref.WeakKeyDictionary()
+        )
+        self.async_patcher.start()
+
+    def tearDown(self):
+        self.sync_patcher.stop()
+        self.async_patcher.stop()
+
+    @patch("core.interface.redis_pool.REDIS_MAX_CONNECTIONS", 7)
+    def test_givenSettings_whenGetRedisClient_thenShouldShareOneBoundedPool(self):
+        client = redis_pool.get_redis_client()
+
+        self.assertIs(redis_pool.get_redis_client(), client)
+        pool = client.connection_pool
+        self.assertEqual(pool.max_connections, 7)
+        self.assertEqual(
+            pool.connection_kwargs["health_check_interval"],
+            redis_pool.REDIS_HEALTH_CHECK_INTERVAL,
+        )
+        self.assertEqual(
+            pool.connection_kwargs["socket_timeout"], redis_pool.REDIS_SOCKET_TIMEOUT
+        )
+
+    def test_givenOneEventLoop_whenGetAsyncRedisClient_thenShouldReuseItsClient(self):
+        async def two_clients():
+            return (
+                await redis_pool.get_async_redis_client(),
+                await redis_pool.get_async_redis_client(),
+            )
+
+        first, second = async_to_sync(two_clients)()
+
+        self.assertIs(first, second)
+
+    def test_givenSeveralEventLoops_whenGetAsyncRedisClient_thenShouldUseOnePoolEach(
+        self,
+    ):
+        async def client():
+            return await redis_pool.get_async_redis_client()
+
+        first = async_to_sync(client)()
+        second = async_to_sync(client)()
+
+        self.assertIsNot(first.connection_pool, second.connection_pool)
+
+    @patch("core.interface.redis_pool.REDIS_MAX_CONNECTIONS", 4)
+    def test_givenIdlePools_whenPoolMetrics_thenShouldReportUtilisation(self):
+        redis_pool.get_redis_client()
+
+        metrics = redis_pool.pool_metrics()
+
+        self.assertEqual(
+            metrics["sync"],
+            {"in_use": 0, "idle": 0, "max_connections": 4, "utilisation": 0.0},
+        )
+        self.assertEqual(metrics["async"], [])
+
+    def test_givenSettings_whenChannelLayerHosts_thenShouldShareConnectionOptions(
+        self,
+    ):
+        (host,) = redis_pool.channel_layer_hosts()
+
+        self.assertEqual(host["address"], redis_pool.REDIS_URL)
+        self.assertEqual(
+            host["max_connections"], redis_pool.REDIS_CHANNEL_LAYER_MAX_CONNECTIONS
+        )
+        self.assertTrue(host["retry_on_timeout"])
+
+
+if __name__ == "__main__":
+    unittest.main()
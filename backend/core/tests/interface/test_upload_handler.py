@@ -0,0 +1,122 @@
+import hashlib
+import unittest
+from unittest.mock import MagicMock, patch
+
+from core.exceptions.exceptions import CloudUploadError
+from core.interface.upload_handler import (
+    StreamingPhotoUploadHandler,
+    sniff_content_type,
+)
+
+TEST_ALBUM_FOLDER_ID = 1
+TEST_FILE_NAME = "photo.bin"
+TEST_STORED_URL = "https://bucket.s3.amazonaws.com/1/photo.bin"
+TEST_JPEG_CHUNKS = [b"\xff\xd8\xff\xe0" + b"a" * 60, b"b" * 64, b"c" * 10]
+
+
+class TestSniffContentType(unittest.TestCase):
+
+    def test_givenKnownSignatures_whenSniff_thenShouldDetectImageType(self):
+        self.assertEqual(sniff_content_type(b"\xff\xd8\xff\xdb"), "image/jpeg")
+        self.assertEqual(sniff_content_type(b"\x89PNG\r\n\x1a\n...."), "image/png")
+        self.assertEqual(
+            sniff_content_type(b"RIFF\x00\x00\x00\x00WEBPVP8 "), "image/webp"
+        )
+        self.assertEqual(sniff_content_type(b"\x00\x00\x00\x18ftypheic"), "image/heic")
+
+    def test_givenUnknownBytes_whenSniff_thenShouldReturnNone(self):
+        self.assertIsNone(sniff_content_type(b"plain text"))
+
+
+@patch("core.interface.upload_handler.photo_repository")
+class TestStreamingPhotoUploadHandler(unittest.TestCase):
+
+    def setUp(self):
+        stored_patcher = patch("core.interface.upload_handler.StoredObjectService")
+        self.mock_stored_service = stored_patcher.start()
+        self.mock_stored_service.is_stored.return_value = False
+        self.addCleanup(stored_patcher.stop)
+
+    def _upload(self, chunks, handler=None):
+        handler = handler or StreamingPhotoUploadHandler(
+            folder_album_id=TEST_ALBUM_FOLDER_ID
+        )
+        handler.new_file("images", TEST_FILE_NAME, "application/octet-stream", None)
+        start = 0
+        for chunk in chunks:
+            handler.receive_data_chunk(chunk, start)
+            start += len(chunk)
+        return handler.file_complete(start)
+
+    def test_givenChunks_whenUpload_thenShouldStreamEveryChunk(self, mock_repo):
+        stream = mock_repo.open_stream.return_value
+        stream.complete.return_value = TEST_STORED_URL
+
+        file = self._upload(TEST_JPEG_CHUNKS)
+
+        mock_repo.open_stream.assert_called_once_with(
+            TEST_FILE_NAME, TEST_ALBUM_FOLDER_ID, "image/jpeg"
+        )
+        self.assertEqual(
+            [call[0][0] for call in stream.write.call_args_list], TEST_JPEG_CHUNKS
+        )
+        self.assertEqual(file.stored_url, TEST_STORED_URL)
+
+    def test_givenChunks_whenUpload_thenShouldHashAndSpoolContent(self, mock_repo):
+        content = b"".join(TEST_JPEG_CHUNKS)
+
+        file = self._upload(TEST_JPEG_CHUNKS)
+
+        self.assertEqual(file.content_hash, hashlib.sha256(content).hexdigest())
+        self.assertEqual(file.content_type, "image/jpeg")
+        self.assertEqual(file.read(), content)
+
+    def test_givenStoredContent_whenUpload_thenShouldAbortStream(self, mock_repo):
+        self.mock_stored_service.is_stored.return_value = True
+        stream = mock_repo.open_stream.return_value
+
+        file = self._upload(TEST_JPEG_CHUNKS)
+
+        stream.complete.assert_not_called()
+        stream.abort.assert_called_once()
+        self.assertIsNone(file.stored_url)
+        self.assertEqual(file.read(), b"".join(TEST_JPEG_CHUNKS))
+
+    def test_givenSameContentTwice_whenUpload_thenShouldStreamItOnce(self, mock_repo):
+        stream = mock_repo.open_stream.return_value
+        stream.complete.return_value = TEST_STORED_URL
+        handler = StreamingPhotoUploadHandler(folder_album_id=TEST_ALBUM_FOLDER_ID)
+
+        first = self._upload(TEST_JPEG_CHUNKS, handler)
+        second = self._upload(TEST_JPEG_CHUNKS, handler)
+
+        stream.complete.assert_called_once()
+        stream.abort.assert_called_once()
+        self.assertEqual(first.stored_url, TEST_STORED_URL)
+        self.assertIsNone(second.stored_url)
+
+    def test_givenStreamFailure_whenUpload_thenShouldKeepSpooledCopy(self, mock_repo):
+        stream = mock_repo.open_stream.return_value
+        stream.write.side_effect = [None, CloudUploadError("Échec de l'upload vers S3")]
+
+        file = self._upload(TEST_JPEG_CHUNKS)
+
+        stream.abort.assert_called_once()
+        self.assertEqual(stream.write.call_count, 2)
+        self.assertIsNone(file.stored_url)
+        self.assertEqual(file.read(), b"".join(TEST_JPEG_CHUNKS))
+
+    def test_givenInterruptedUpload_whenInterrupted_thenShouldAbortStream(
+        self, mock_repo
+    ):
+        handler = StreamingPhotoUploadHandler(folder_album_id=TEST_ALBUM_FOLDER_ID)
+        handler.new_file("images", TEST_FILE_NAME, "image/jpeg", None)
+        handler.receive_data_chunk(TEST_JPEG_CHUNKS[0], 0)
+
+        handler.upload_interrupted()
+
+        mock_repo.open_stream.return_value.abort.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
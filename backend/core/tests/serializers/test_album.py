@@ -43,6 +43,18 @@ class TestAlbumSerializer(unittest.TestCase):
 
         self.assertEqual(result, TEST_NB_PHOTOS)
 
+    @patch("core.serializers.album.Photo")
+    def test_givenAnnotatedAlbum_whenGetNbPhotos_thenShouldNotQueryPhotos(
+        self, mock_photo_model
+    ):
+        mock_album = MagicMock(spec=Album)
+        mock_album.photo_count = TEST_NB_PHOTOS
+
+        result = self.album_serializer.get_nb_photos(mock_album)
+
+        self.assertEqual(result, TEST_NB_PHOTOS)
+        mock_photo_model.objects.filter.assert_not_called()
+
     def test_givenUnauthenticatedUser_whenCreate_thenShouldReturnNone(self):
         self.mock_user.is_authenticated = False
 
@@ -1,6 +1,6 @@
 import unittest
 from unittest.mock import MagicMock, patch
-from core.serializers.photo import PhotoSerializer
+from core.serializers.photo import PhotoSerializer, PhotoListSerializer
 from core.models.photo import Photo
 from core.models.album import Album
 from rest_framework.exceptions import ValidationError
@@ -87,5 +87,24 @@ class TestPhotoSerializer(unittest.TestCase):
         self.assertEqual(result, mock_instance)
 
 
+class TestPhotoListSerializer(unittest.TestCase):
+
+    def test_givenPhotoInstance_whenSerialize_thenShouldExposeAlbumIdOnly(self):
+        mock_photo = MagicMock(spec=Photo)
+        mock_photo.id = TEST_PHOTO_ID
+        mock_photo.album_id = 7
+        mock_photo.image_url = TEST_IMAGE_URL
+        mock_photo.caption = TEST_CAPTION
+        mock_photo.location = TEST_LOCATION
+        mock_photo.created_at = "2023-01-01"
+        mock_photo.updated_at = "2023-01-02"
+
+        data = PhotoListSerializer(instance=mock_photo).data
+
+        self.assertEqual(data["album_id"], 7)
+        self.assertNotIn("album", data)
+        self.assertEqual(data["image_url"], TEST_IMAGE_URL)
+
+
 if __name__ == "__main__":
     unittest.main()
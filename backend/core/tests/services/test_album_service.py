@@ -19,19 +19,27 @@ class TestAlbumServiceGetAll(unittest.TestCase):
     def test_getAll_returns_all_albums_queryset(self, mock_album_model):
 
         expected_queryset = MagicMock()
-        mock_album_model.objects.all.return_value = expected_queryset
+        mock_album_model.objects.annotate.return_value = expected_queryset
 
         result = AlbumService.getAll()
 
         self.assertEqual(result, expected_queryset)
-        mock_album_model.objects.all.assert_called_once()
+        mock_album_model.objects.annotate.assert_called_once()
+
+    @patch("core.services.album_service.Album")
+    def test_getAll_annotates_photo_count(self, mock_album_model):
+
+        AlbumService.getAll()
+
+        annotations = mock_album_model.objects.annotate.call_args[1]
+        self.assertIn("photo_count", annotations)
 
     @patch("core.services.album_service.Album")
     def test_getAll_when_empty_returns_empty_queryset(self, mock_album_model):
 
         empty_queryset = MagicMock()
         empty_queryset.__iter__ = MagicMock(return_value=iter([]))
-        mock_album_model.objects.all.return_value = empty_queryset
+        mock_album_model.objects.annotate.return_value = empty_queryset
 
         result = AlbumService.getAll()
 
@@ -140,6 +148,27 @@ class TestAlbumServiceCreateAlbum(unittest.TestCase):
 
         mock_serializer.save.assert_called_once()
 
+    @patch("core.services.album_service.variant_generator")
+    @patch("core.services.album_service.AlbumSerializer")
+    @patch("core.services.album_service.photo_repository")
+    def test_createAlbum_with_image_saves_cover_variants(
+        self, mock_photo_repo, mock_serializer_class, mock_variant_generator
+    ):
+
+        mock_photo_repo.save.return_value = TEST_COVER_IMAGE_URL
+        mock_variant_generator.generate.return_value = {"thumbnail": "thumb.webp"}
+        mock_serializer = MagicMock()
+        mock_serializer.is_valid.return_value = True
+        mock_serializer.data = self.serialized_data
+        mock_serializer_class.return_value = mock_serializer
+
+        AlbumService.createAlbum(self.raw_data, self.file_dict)
+
+        mock_variant_generator.generate.assert_called_once_with(self.mock_file)
+        mock_serializer.save.assert_called_once_with(
+            cover_variants={"thumbnail": "thumb.webp"}
+        )
+
     @patch("core.services.album_service.AlbumSerializer")
     def test_createAlbum_with_invalid_data_raises_validation_error(
         self, mock_serializer_class
@@ -1,12 +1,12 @@
 import unittest
 from unittest.mock import MagicMock, patch
 from rest_framework.exceptions import ValidationError, NotFound
+from django.test import TestCase
 
+from core.models import BucketPoint
 from core.services.bucketpoints_service import BucketPointService
 from core.websocket.messages import WebSocketMessageType
 
-TEST_USER_ID = 1
-TEST_OTHER_USER_ID = 2
 TEST_BUCKETPOINT_ID = 1
 TEST_BUCKETPOINT_TITLE = "Visit Paris"
 TEST_BUCKETPOINT_DESCRIPTION = "See the Eiffel Tower"
@@ -21,43 +21,36 @@ class TestBucketPointServiceGetAll(unittest.TestCase):
     def test_get_all_returns_serialized_bucket_points(
         self, mock_model, mock_serializer_class
     ):
-        mock_queryset = MagicMock()
-        mock_model.objects.all.return_value = mock_queryset
         serialized_data = [
-            {"id": 1, "title": "First", "created_at": "2025-01-18T10:00:00Z"},
-            {"id": 2, "title": "Second", "created_at": "2025-01-18T09:00:00Z"},
+            {"id": 2, "title": "Second", "created_at": "2025-01-18T10:00:00Z"},
+            {"id": 1, "title": "First", "created_at": "2025-01-18T09:00:00Z"},
         ]
         mock_serializer_class.return_value.data = serialized_data
 
         result = BucketPointService.get_all()
 
         self.assertIsInstance(result, list)
-        mock_model.objects.all.assert_called_once()
+        self.assertEqual(result, serialized_data)
 
     @patch("core.services.bucketpoints_service.BucketPointSerializer")
     @patch("core.services.bucketpoints_service.BucketPoint")
-    def test_get_all_returns_list_sorted_by_created_at_descending(
+    def test_get_all_is_ordered_by_the_database_on_rank(
         self, mock_model, mock_serializer_class
     ):
-        mock_queryset = MagicMock()
-        mock_model.objects.all.return_value = mock_queryset
-        serialized_data = [
-            {"id": 1, "title": "Older", "created_at": "2025-01-17T10:00:00Z"},
-            {"id": 2, "title": "Newer", "created_at": "2025-01-18T10:00:00Z"},
-        ]
-        mock_serializer_class.return_value.data = serialized_data
+        mock_serializer_class.return_value.data = []
 
-        result = BucketPointService.get_all()
+        BucketPointService.get_all()
 
-        self.assertEqual(result[0]["title"], "Newer")
-        self.assertEqual(result[1]["title"], "Older")
+        mock_model.objects.order_by.assert_called_once_with("rank", "id")
+        mock_serializer_class.assert_called_once_with(
+            mock_model.objects.order_by.return_value, many=True
+        )
 
     @patch("core.services.bucketpoints_service.BucketPointSerializer")
     @patch("core.services.bucketpoints_service.BucketPoint")
     def test_get_all_when_empty_returns_empty_list(
         self, mock_model, mock_serializer_class
     ):
-        mock_model.objects.all.return_value = MagicMock()
         mock_serializer_class.return_value.data = []
 
         result = BucketPointService.get_all()
@@ -65,6 +58,184 @@ class TestBucketPointServiceGetAll(unittest.TestCase):
         self.assertEqual(result, [])
 
 
+class TestBucketPointServiceQueries(TestCase):
+    """Database-backed tests for ordering, filtering and the summary."""
+
+    def setUp(self):
+        BucketPoint.objects.bulk_create(
+            BucketPoint(title=f"Point {i}", completed=i % 3 == 0) for i in range(6)
+        )
+
+    def test_get_queryset_orders_by_rank_with_id_as_tiebreaker(self):
+        BucketPoint.objects.filter(title="Point 4").update(rank="0")
+        BucketPoint.objects.exclude(title="Point 4").update(rank="i")
+
+        titles = list(BucketPointService.get_queryset().values_list("title", flat=True))
+
+        self.assertEqual(
+            titles, ["Point 4", "Point 0", "Point 1", "Point 2", "Point 3", "Point 5"]
+        )
+
+    def test_get_queryset_filters_on_completed(self):
+        completed = BucketPointService.get_queryset(completed=True)
+        remaining = BucketPointService.get_queryset(completed=False)
+
+        self.assertEqual(completed.count(), 2)
+        self.assertEqual(remaining.count(), 4)
+        self.assertTrue(all(point.completed for point in completed))
+
+    def test_get_summary_returns_counts_in_one_query(self):
+        with self.assertNumQueries(1):
+            summary = BucketPointService.get_summary()
+
+        self.assertEqual(summary, {"total": 6, "completed": 2, "remaining": 4})
+
+
+@patch("core.services.bucketpoints_service.send_ws_broadcast")
+class TestBucketPointServiceBulk(TestCase):
+    """Tests for BucketPointService.bulk method."""
+
+    def setUp(self):
+        self.points = BucketPoint.objects.bulk_create(
+            BucketPoint(title=f"Point {i}") for i in range(4)
+        )
+
+    def test_bulk_applies_every_operation_with_one_broadcast(self, mock_send_ws):
+        first, second, third, fourth = self.points
+
+        # Savepoint, first rank, INSERT, SELECT, UPDATE, SELECT, DELETE, release
+        with self.assertNumQueries(8):
+            result = BucketPointService.bulk(
+                {
+                    "create": [{"title": "New"}, {"title": "Other", "completed": True}],
+                    "update": [
+                        {"id": first.id, "completed": True},
+                        {"id": second.id, "title": "Renamed"},
+                    ],
+                    "delete": [third.id, fourth.id],
+                },
+                context={},
+            )
+
+        self.assertEqual([p["title"] for p in result["created"]], ["New", "Other"])
+        self.assertEqual(
+            [(p["id"], p["title"], p["completed"]) for p in result["updated"]],
+            [(first.id, "Point 0", True), (second.id, "Renamed", False)],
+        )
+        self.assertEqual(result["deleted"], [third.id, fourth.id])
+        self.assertEqual(
+            set(BucketPoint.objects.values_list("title", flat=True)),
+            {"Point 0", "Renamed", "New", "Other"},
+        )
+        mock_send_ws.assert_called_once_with(
+            WebSocketMessageType.BUCKETPOINT_BATCH_CHANGED, result
+        )
+
+    def test_bulk_broadcasts_only_the_ids_it_deleted(self, mock_send_ws):
+        first = self.points[0]
+
+        result = BucketPointService.bulk({"delete": [9999, first.id]}, context={})
+
+        self.assertEqual(result["deleted"], [first.id])
+        self.assertFalse(BucketPoint.objects.filter(pk=first.id).exists())
+        mock_send_ws.assert_called_once_with(
+            WebSocketMessageType.BUCKETPOINT_BATCH_CHANGED, result
+        )
+
+    def test_bulk_rolls_back_everything_on_invalid_update(self, mock_send_ws):
+        with self.assertRaises(ValidationError):
+            BucketPointService.bulk(
+                {
+                    "create": [{"title": "New"}],
+                    "update": [{"id": self.points[0].id, "title": ""}],
+                    "delete": [self.points[1].id],
+                },
+                context={},
+            )
+
+        self.assertEqual(BucketPoint.objects.count(), 4)
+        self.assertFalse(BucketPoint.objects.filter(title="New").exists())
+        mock_send_ws.assert_not_called()
+
+    def test_bulk_with_unknown_update_id_raises_not_found(self, mock_send_ws):
+        with self.assertRaises(NotFound):
+            BucketPointService.bulk(
+                {"create": [{"title": "New"}], "update": [{"id": 9999}]}, context={}
+            )
+
+        self.assertFalse(BucketPoint.objects.filter(title="New").exists())
+        mock_send_ws.assert_not_called()
+
+    def test_bulk_rejects_malformed_requests(self, mock_send_ws):
+        point_id = self.points[0].id
+        for data in [
+            {},
+            {"delete": "1,2"},
+            {"update": [{"title": "No id"}]},
+            {"update": [{"id": point_id}], "delete": [point_id]},
+        ]:
+            with self.subTest(data=data), self.assertRaises(ValidationError):
+                BucketPointService.bulk(data, context={})
+
+        mock_send_ws.assert_not_called()
+
+    @patch("core.services.bucketpoints_service.BUCKETPOINT_BULK_LIMIT", 2)
+    def test_bulk_rejects_more_operations_than_the_limit(self, mock_send_ws):
+        with self.assertRaises(ValidationError):
+            BucketPointService.bulk(
+                {"delete": [point.id for point in self.points]}, context={}
+            )
+
+        self.assertEqual(BucketPoint.objects.count(), 4)
+
+
+@patch("core.services.bucketpoints_service.send_ws_broadcast")
+class TestBucketPointServiceMove(TestCase):
+    """Tests for BucketPointService.move method."""
+
+    def setUp(self):
+        self.points = BucketPoint.objects.bulk_create(
+            BucketPoint(title=f"Point {i}", rank=rank)
+            for i, rank in enumerate(["a", "b", "c"])
+        )
+
+    def test_move_places_the_point_and_broadcasts_its_rank(self, mock_send_ws):
+        first, second, third = self.points
+
+        result = BucketPointService.move(first.id, after=second.id)
+
+        self.assertEqual(
+            list(BucketPointService.get_queryset().values_list("id", flat=True)),
+            [second.id, first.id, third.id],
+        )
+        self.assertEqual(
+            result,
+            {
+                "id": first.id,
+                "rank": BucketPoint.objects.get(pk=first.id).rank,
+                "after": second.id,
+            },
+        )
+        mock_send_ws.assert_called_once_with(
+            WebSocketMessageType.BUCKETPOINT_MOVED, result
+        )
+
+    def test_move_with_unknown_ids_raises_not_found(self, mock_send_ws):
+        for pk, after in [(9999, None), (self.points[0].id, 9999)]:
+            with self.subTest(pk=pk, after=after), self.assertRaises(NotFound):
+                BucketPointService.move(pk, after=after)
+
+        mock_send_ws.assert_not_called()
+
+    def test_move_rejects_invalid_after(self, mock_send_ws):
+        pk = self.points[0].id
+        for after in [pk, "2", [1]]:
+            with self.subTest(after=after), self.assertRaises(ValidationError):
+                BucketPointService.move(pk, after=after)
+
+        mock_send_ws.assert_not_called()
+
+
 class TestBucketPointServiceCreate(unittest.TestCase):
 
     def setUp(self):
@@ -81,12 +252,14 @@ class TestBucketPointServiceCreate(unittest.TestCase):
             "completed": False,
             "created_at": TEST_CREATED_AT,
         }
+        rank_patcher = patch("core.services.bucketpoints_service.RankService")
+        rank_patcher.start().keys_before_first.return_value = ["i"]
+        self.addCleanup(rank_patcher.stop)
 
-    @patch("core.services.bucketpoints_service.send_ws_message_to_user")
-    @patch("core.services.bucketpoints_service.User")
+    @patch("core.services.bucketpoints_service.send_ws_broadcast")
     @patch("core.services.bucketpoints_service.BucketPointSerializer")
     def test_create_with_valid_data_returns_serialized_bucket_point(
-        self, mock_serializer_class, mock_user_model, mock_send_ws
+        self, mock_serializer_class, mock_send_ws
     ):
         mock_serializer = MagicMock()
         mock_serializer.is_valid.return_value = True
@@ -94,22 +267,19 @@ class TestBucketPointServiceCreate(unittest.TestCase):
         mock_serializer.save.return_value = mock_bucket
         mock_serializer_class.return_value = mock_serializer
         mock_serializer_class.return_value.data = self.serialized_data
-        mock_user_model.objects.all.return_value.values_list.return_value = []
 
         result = BucketPointService.create(self.valid_data, self.context)
 
         self.assertEqual(result["title"], TEST_BUCKETPOINT_TITLE)
 
-    @patch("core.services.bucketpoints_service.send_ws_message_to_user")
-    @patch("core.services.bucketpoints_service.User")
+    @patch("core.services.bucketpoints_service.send_ws_broadcast")
     @patch("core.services.bucketpoints_service.BucketPointSerializer")
     def test_create_with_valid_data_calls_serializer_save(
-        self, mock_serializer_class, mock_user_model, mock_send_ws
+        self, mock_serializer_class, mock_send_ws
     ):
         mock_serializer = MagicMock()
         mock_serializer.is_valid.return_value = True
         mock_serializer_class.return_value = mock_serializer
-        mock_user_model.objects.all.return_value.values_list.return_value = []
 
         BucketPointService.create(self.valid_data, self.context)
 
@@ -127,11 +297,10 @@ class TestBucketPointServiceCreate(unittest.TestCase):
         with self.assertRaises(ValidationError):
             BucketPointService.create({}, self.context)
 
-    @patch("core.services.bucketpoints_service.send_ws_message_to_user")
-    @patch("core.services.bucketpoints_service.User")
+    @patch("core.services.bucketpoints_service.send_ws_broadcast")
     @patch("core.services.bucketpoints_service.BucketPointSerializer")
     def test_create_broadcasts_bucketpoint_created_event(
-        self, mock_serializer_class, mock_user_model, mock_send_ws
+        self, mock_serializer_class, mock_send_ws
     ):
         mock_serializer = MagicMock()
         mock_serializer.is_valid.return_value = True
@@ -139,15 +308,12 @@ class TestBucketPointServiceCreate(unittest.TestCase):
         mock_serializer.save.return_value = mock_bucket
         mock_serializer_class.return_value = mock_serializer
         mock_serializer_class.return_value.data = self.serialized_data
-        mock_user_model.objects.all.return_value.values_list.return_value = [
-            TEST_USER_ID
-        ]
 
         BucketPointService.create(self.valid_data, self.context)
 
         mock_send_ws.assert_called_once()
         call_args = mock_send_ws.call_args
-        self.assertEqual(call_args[0][1], WebSocketMessageType.BUCKETPOINT_CREATED)
+        self.assertEqual(call_args[0][0], WebSocketMessageType.BUCKETPOINT_CREATED)
 
 
 class TestBucketPointServiceUpdate(unittest.TestCase):
@@ -163,12 +329,11 @@ class TestBucketPointServiceUpdate(unittest.TestCase):
             "created_at": TEST_CREATED_AT,
         }
 
-    @patch("core.services.bucketpoints_service.send_ws_message_to_user")
-    @patch("core.services.bucketpoints_service.User")
+    @patch("core.services.bucketpoints_service.send_ws_broadcast")
     @patch("core.services.bucketpoints_service.BucketPointSerializer")
     @patch("core.services.bucketpoints_service.BucketPoint")
     def test_update_with_valid_id_returns_updated_data(
-        self, mock_model, mock_serializer_class, mock_user_model, mock_send_ws
+        self, mock_model, mock_serializer_class, mock_send_ws
     ):
         mock_bucket = MagicMock()
         mock_model.objects.get.return_value = mock_bucket
@@ -177,7 +342,6 @@ class TestBucketPointServiceUpdate(unittest.TestCase):
         mock_serializer.save.return_value = mock_bucket
         mock_serializer_class.return_value = mock_serializer
         mock_serializer_class.return_value.data = self.serialized_data
-        mock_user_model.objects.all.return_value.values_list.return_value = []
 
         result = BucketPointService.update(TEST_BUCKETPOINT_ID, self.update_data)
 
@@ -206,19 +370,17 @@ class TestBucketPointServiceUpdate(unittest.TestCase):
         with self.assertRaises(ValidationError):
             BucketPointService.update(TEST_BUCKETPOINT_ID, {"title": ""})
 
-    @patch("core.services.bucketpoints_service.send_ws_message_to_user")
-    @patch("core.services.bucketpoints_service.User")
+    @patch("core.services.bucketpoints_service.send_ws_broadcast")
     @patch("core.services.bucketpoints_service.BucketPointSerializer")
     @patch("core.services.bucketpoints_service.BucketPoint")
     def test_update_uses_partial_serialization(
-        self, mock_model, mock_serializer_class, mock_user_model, mock_send_ws
+        self, mock_model, mock_serializer_class, mock_send_ws
     ):
         mock_bucket = MagicMock()
         mock_model.objects.get.return_value = mock_bucket
         mock_serializer = MagicMock()
         mock_serializer.is_valid.return_value = True
         mock_serializer_class.return_value = mock_serializer
-        mock_user_model.objects.all.return_value.values_list.return_value = []
 
         BucketPointService.update(TEST_BUCKETPOINT_ID, self.update_data)
 
@@ -227,12 +389,11 @@ class TestBucketPointServiceUpdate(unittest.TestCase):
         self.assertEqual(first_call[1]["data"], self.update_data)
         self.assertEqual(first_call[1]["partial"], True)
 
-    @patch("core.services.bucketpoints_service.send_ws_message_to_user")
-    @patch("core.services.bucketpoints_service.User")
+    @patch("core.services.bucketpoints_service.send_ws_broadcast")
     @patch("core.services.bucketpoints_service.BucketPointSerializer")
     @patch("core.services.bucketpoints_service.BucketPoint")
     def test_update_broadcasts_bucketpoint_updated_event(
-        self, mock_model, mock_serializer_class, mock_user_model, mock_send_ws
+        self, mock_model, mock_serializer_class, mock_send_ws
     ):
         mock_bucket = MagicMock()
         mock_model.objects.get.return_value = mock_bucket
@@ -241,29 +402,22 @@ class TestBucketPointServiceUpdate(unittest.TestCase):
         mock_serializer.save.return_value = mock_bucket
         mock_serializer_class.return_value = mock_serializer
         mock_serializer_class.return_value.data = self.serialized_data
-        mock_user_model.objects.all.return_value.values_list.return_value = [
-            TEST_USER_ID
-        ]
 
         BucketPointService.update(TEST_BUCKETPOINT_ID, self.update_data)
 
         mock_send_ws.assert_called_once()
         call_args = mock_send_ws.call_args
-        self.assertEqual(call_args[0][1], WebSocketMessageType.BUCKETPOINT_UPDATED)
+        self.assertEqual(call_args[0][0], WebSocketMessageType.BUCKETPOINT_UPDATED)
 
 
 class TestBucketPointServiceDelete(unittest.TestCase):
 
-    @patch("core.services.bucketpoints_service.send_ws_message_to_user")
-    @patch("core.services.bucketpoints_service.User")
+    @patch("core.services.bucketpoints_service.send_ws_broadcast")
     @patch("core.services.bucketpoints_service.BucketPoint")
-    def test_delete_with_valid_id_deletes_bucket_point(
-        self, mock_model, mock_user_model, mock_send_ws
-    ):
+    def test_delete_with_valid_id_deletes_bucket_point(self, mock_model, mock_send_ws):
         mock_bucket = MagicMock()
         mock_bucket.id = TEST_BUCKETPOINT_ID
         mock_model.objects.get.return_value = mock_bucket
-        mock_user_model.objects.all.return_value.values_list.return_value = []
 
         BucketPointService.delete(TEST_BUCKETPOINT_ID)
 
@@ -277,34 +431,28 @@ class TestBucketPointServiceDelete(unittest.TestCase):
         with self.assertRaises(NotFound):
             BucketPointService.delete(999)
 
-    @patch("core.services.bucketpoints_service.send_ws_message_to_user")
-    @patch("core.services.bucketpoints_service.User")
+    @patch("core.services.bucketpoints_service.send_ws_broadcast")
     @patch("core.services.bucketpoints_service.BucketPoint")
     def test_delete_broadcasts_bucketpoint_deleted_event_with_id(
-        self, mock_model, mock_user_model, mock_send_ws
+        self, mock_model, mock_send_ws
     ):
         mock_bucket = MagicMock()
         mock_bucket.id = TEST_BUCKETPOINT_ID
         mock_model.objects.get.return_value = mock_bucket
-        mock_user_model.objects.all.return_value.values_list.return_value = [
-            TEST_USER_ID
-        ]
 
         BucketPointService.delete(TEST_BUCKETPOINT_ID)
 
         mock_send_ws.assert_called_once()
         call_args = mock_send_ws.call_args
-        self.assertEqual(call_args[0][1], WebSocketMessageType.BUCKETPOINT_DELETED)
-        self.assertEqual(call_args[0][2], {"id": TEST_BUCKETPOINT_ID})
+        self.assertEqual(call_args[0][0], WebSocketMessageType.BUCKETPOINT_DELETED)
+        self.assertEqual(call_args[0][1], {"id": TEST_BUCKETPOINT_ID})
 
-    @patch("core.services.bucketpoints_service.send_ws_message_to_user")
-    @patch("core.services.bucketpoints_service.User")
+    @patch("core.services.bucketpoints_service.send_ws_broadcast")
     @patch("core.services.bucketpoints_service.BucketPoint")
-    def test_delete_returns_none(self, mock_model, mock_user_model, mock_send_ws):
+    def test_delete_returns_none(self, mock_model, mock_send_ws):
         mock_bucket = MagicMock()
         mock_bucket.id = TEST_BUCKETPOINT_ID
         mock_model.objects.get.return_value = mock_bucket
-        mock_user_model.objects.all.return_value.values_list.return_value = []
 
         result = BucketPointService.delete(TEST_BUCKETPOINT_ID)
 
@@ -314,36 +462,26 @@ class TestBucketPointServiceDelete(unittest.TestCase):
 class TestBucketPointServiceBroadcastChange(unittest.TestCase):
     """Tests for BucketPointService._broadcast_change method."""
 
-    @patch("core.services.bucketpoints_service.send_ws_message_to_user")
-    @patch("core.services.bucketpoints_service.User")
-    def test_broadcast_change_sends_to_all_users(self, mock_user_model, mock_send_ws):
-
-        mock_user_model.objects.all.return_value.values_list.return_value = [
-            TEST_USER_ID,
-            TEST_OTHER_USER_ID,
-        ]
+    @patch("core.services.bucketpoints_service.send_ws_broadcast")
+    def test_broadcast_change_publishes_once(self, mock_send_ws):
         message_data = {"data": {"id": 1}}
 
         BucketPointService._broadcast_change(
             WebSocketMessageType.BUCKETPOINT_CREATED, message_data
         )
 
-        self.assertEqual(mock_send_ws.call_count, 2)
-
-    @patch("core.services.bucketpoints_service.send_ws_message_to_user")
-    @patch("core.services.bucketpoints_service.User")
-    def test_broadcast_change_when_no_users_does_not_send(
-        self, mock_user_model, mock_send_ws
-    ):
-
-        mock_user_model.objects.all.return_value.values_list.return_value = []
-        message_data = {"data": {"id": 1}}
+        mock_send_ws.assert_called_once_with(
+            WebSocketMessageType.BUCKETPOINT_CREATED, message_data
+        )
 
+    @patch("core.services.bucketpoints_service.send_ws_broadcast")
+    @patch("core.services.bucketpoints_service.ResponseCacheService")
+    def test_broadcast_change_invalidates_cached_list(self, mock_cache, _):
         BucketPointService._broadcast_change(
-            WebSocketMessageType.BUCKETPOINT_CREATED, message_data
+            WebSocketMessageType.BUCKETPOINT_DELETED, {"id": 1}
         )
 
-        mock_send_ws.assert_not_called()
+        mock_cache.invalidate.assert_called_once_with(mock_cache.BUCKETPOINTS)
 
 
 if __name__ == "__main__":
@@ -39,12 +39,12 @@ class TestMessageServiceCreateMessage(unittest.TestCase):
             "status": False,
         }
 
-    @patch("core.services.message_service.send_formatted_mail")
+    @patch("core.services.message_service.mail_queue")
     @patch("core.services.message_service.User")
     @patch("core.services.message_service.get_channel_layer")
     @patch("core.services.message_service.MessageSerializer")
     def test_create_message_with_valid_data_returns_serialized_message(
-        self, mock_serializer_class, mock_get_channel, mock_user_model, mock_send_mail
+        self, mock_serializer_class, mock_get_channel, mock_user_model, mock_mail_queue
     ):
 
         mock_serializer = MagicMock()
@@ -60,12 +60,12 @@ class TestMessageServiceCreateMessage(unittest.TestCase):
 
         self.assertEqual(result, self.serialized_data)
 
-    @patch("core.services.message_service.send_formatted_mail")
+    @patch("core.services.message_service.mail_queue")
     @patch("core.services.message_service.User")
     @patch("core.services.message_service.get_channel_layer")
     @patch("core.services.message_service.MessageSerializer")
     def test_create_message_with_valid_data_calls_serializer_save(
-        self, mock_serializer_class, mock_get_channel, mock_user_model, mock_send_mail
+        self, mock_serializer_class, mock_get_channel, mock_user_model, mock_mail_queue
     ):
 
         mock_serializer = MagicMock()
@@ -94,12 +94,12 @@ class TestMessageServiceCreateMessage(unittest.TestCase):
         with self.assertRaises(ValidationError):
             MessageService.create_message(self.mock_sender, {}, self.request_context)
 
-    @patch("core.services.message_service.send_formatted_mail")
+    @patch("core.services.message_service.mail_queue")
     @patch("core.services.message_service.User")
     @patch("core.services.message_service.get_channel_layer")
     @patch("core.services.message_service.MessageSerializer")
     def test_create_message_when_receiver_exists_sends_email(
-        self, mock_serializer_class, mock_get_channel, mock_user_model, mock_send_mail
+        self, mock_serializer_class, mock_get_channel, mock_user_model, mock_mail_queue
     ):
 
         mock_serializer = MagicMock()
@@ -115,16 +115,16 @@ class TestMessageServiceCreateMessage(unittest.TestCase):
             self.mock_sender, self.valid_data, self.request_context
         )
 
-        mock_send_mail.assert_called_once_with(
+        mock_mail_queue.enqueue.assert_called_once_with(
             str(self.mock_receiver.email), str(self.mock_receiver.username)
         )
 
-    @patch("core.services.message_service.send_formatted_mail")
+    @patch("core.services.message_service.mail_queue")
     @patch("core.services.message_service.User")
     @patch("core.services.message_service.get_channel_layer")
     @patch("core.services.message_service.MessageSerializer")
     def test_create_message_when_no_receiver_does_not_send_email(
-        self, mock_serializer_class, mock_get_channel, mock_user_model, mock_send_mail
+        self, mock_serializer_class, mock_get_channel, mock_user_model, mock_mail_queue
     ):
 
         mock_serializer = MagicMock()
@@ -138,14 +138,14 @@ class TestMessageServiceCreateMessage(unittest.TestCase):
             self.mock_sender, self.valid_data, self.request_context
         )
 
-        mock_send_mail.assert_not_called()
+        mock_mail_queue.enqueue.assert_not_called()
 
-    @patch("core.services.message_service.send_formatted_mail")
+    @patch("core.services.message_service.mail_queue")
     @patch("core.services.message_service.User")
     @patch("core.services.message_service.get_channel_layer")
     @patch("core.services.message_service.MessageSerializer")
-    def test_create_message_when_email_fails_does_not_raise(
-        self, mock_serializer_class, mock_get_channel, mock_user_model, mock_send_mail
+    def test_create_message_does_not_send_email_inline(
+        self, mock_serializer_class, mock_get_channel, mock_user_model, mock_mail_queue
     ):
 
         mock_serializer = MagicMock()
@@ -156,11 +156,13 @@ class TestMessageServiceCreateMessage(unittest.TestCase):
         mock_user_model.objects.exclude.return_value.first.return_value = (
             self.mock_receiver
         )
-        mock_send_mail.side_effect = Exception("SMTP Error")
 
-        result = MessageService.create_message(
-            self.mock_sender, self.valid_data, self.request_context
-        )
+        with patch("core.utils.smtplib.SMTP") as mock_smtp:
+            result = MessageService.create_message(
+                self.mock_sender, self.valid_data, self.request_context
+            )
+
+        mock_smtp.assert_not_called()
         self.assertEqual(result, self.serialized_data)
 
 
@@ -179,18 +181,13 @@ class TestMessageServiceNotifyRecipients(unittest.TestCase):
             "message": TEST_MESSAGE_CONTENT,
         }
 
-    @patch("core.services.message_service.send_ws_message_to_user")
-    @patch("core.services.message_service.User")
+    @patch("core.services.message_service.send_ws_broadcast")
     @patch("core.services.message_service.get_channel_layer")
-    def test_notify_recipients_when_channel_layer_exists_sends_to_all(
-        self, mock_get_channel, mock_user_model, mock_send_ws
+    def test_notify_recipients_when_channel_layer_exists_broadcasts_once(
+        self, mock_get_channel, mock_send_ws
     ):
 
         mock_get_channel.return_value = MagicMock()
-        mock_user_model.objects.all.return_value.values_list.return_value = [
-            TEST_USER_ID,
-            TEST_OTHER_USER_ID,
-        ]
 
         MessageService._notify_recipients(
             self.mock_sender,
@@ -198,23 +195,7 @@ class TestMessageServiceNotifyRecipients(unittest.TestCase):
             WebSocketMessageType.MESSAGE_CREATED,
         )
 
-        self.assertEqual(mock_send_ws.call_count, 2)
-
-        # Verify calls were made for both users
-        expected_call_args_1 = (
-            TEST_USER_ID,
-            WebSocketMessageType.MESSAGE_CREATED,
-            {
-                "message": self.message_payload,
-                "sender": {
-                    "id": self.mock_sender.id,
-                    "username": self.mock_sender.username,
-                    "email": self.mock_sender.email,
-                },
-            },
-        )
-        expected_call_args_2 = (
-            TEST_OTHER_USER_ID,
+        mock_send_ws.assert_called_once_with(
             WebSocketMessageType.MESSAGE_CREATED,
             {
                 "message": self.message_payload,
@@ -226,10 +207,7 @@ class TestMessageServiceNotifyRecipients(unittest.TestCase):
             },
         )
 
-        mock_send_ws.assert_any_call(*expected_call_args_1)
-        mock_send_ws.assert_any_call(*expected_call_args_2)
-
-    @patch("core.services.message_service.send_ws_message_to_user")
+    @patch("core.services.message_service.send_ws_broadcast")
     @patch("core.services.message_service.get_channel_layer")
     def test_notify_recipients_when_no_channel_layer_does_not_send(
         self, mock_get_channel, mock_send_ws
@@ -245,17 +223,14 @@ class TestMessageServiceNotifyRecipients(unittest.TestCase):
 
         mock_send_ws.assert_not_called()
 
-    @patch("core.services.message_service.send_ws_message_to_user")
+    @patch("core.services.message_service.send_ws_broadcast")
     @patch("core.services.message_service.User")
     @patch("core.services.message_service.get_channel_layer")
-    def test_notify_recipients_includes_sender_in_recipients_list(
+    def test_notify_recipients_does_not_query_users(
         self, mock_get_channel, mock_user_model, mock_send_ws
     ):
 
         mock_get_channel.return_value = MagicMock()
-        mock_user_model.objects.all.return_value.values_list.return_value = [
-            TEST_USER_ID,
-        ]
 
         MessageService._notify_recipients(
             self.mock_sender,
@@ -263,18 +238,7 @@ class TestMessageServiceNotifyRecipients(unittest.TestCase):
             WebSocketMessageType.MESSAGE_CREATED,
         )
 
-        mock_send_ws.assert_called_once_with(
-            TEST_USER_ID,
-            WebSocketMessageType.MESSAGE_CREATED,
-            {
-                "message": self.message_payload,
-                "sender": {
-                    "id": self.mock_sender.id,
-                    "username": self.mock_sender.username,
-                    "email": self.mock_sender.email,
-                },
-            },
-        )
+        mock_user_model.objects.all.assert_not_called()
 
 
 class TestMessageServiceDelete(unittest.TestCase):
@@ -329,8 +293,7 @@ class TestMessageServiceDelete(unittest.TestCase):
 
         self.assertFalse(result)
 
-    @patch("core.services.message_service.send_ws_message_to_user")
-    @patch("core.services.message_service.User")
+    @patch("core.services.message_service.send_ws_broadcast")
     @patch("core.services.message_service.MessageSerializer")
     @patch("core.services.message_service.get_channel_layer")
     @patch("core.services.message_service.Message")
@@ -339,7 +302,6 @@ class TestMessageServiceDelete(unittest.TestCase):
         mock_message_model,
         mock_get_channel,
         mock_serializer_class,
-        mock_user_model,
         mock_send_ws,
     ):
 
@@ -347,16 +309,12 @@ class TestMessageServiceDelete(unittest.TestCase):
         mock_get_channel.return_value = MagicMock()
         serialized_data = {"id": TEST_MESSAGE_ID}
         mock_serializer_class.return_value.data = serialized_data
-        mock_user_model.objects.all.return_value.values_list.return_value = [
-            TEST_OTHER_USER_ID
-        ]
 
         MessageService.delete(TEST_MESSAGE_ID, self.mock_user)
 
         mock_send_ws.assert_called_once()
         call_args = mock_send_ws.call_args
-        self.assertEqual(call_args[0][0], TEST_OTHER_USER_ID)
-        self.assertEqual(call_args[0][1], WebSocketMessageType.MESSAGE_DELETED)
+        self.assertEqual(call_args[0][0], WebSocketMessageType.MESSAGE_DELETED)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,19 @@
+import threading
+from types import SimpleNamespace
+import time
 import unittest
 from unittest.mock import MagicMock, patch
-
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.datastructures import MultiValueDict
+from rest_framework.exceptions import NotFound, ValidationError
+
+from core.exceptions import CloudUploadError
+from core.models import Album, Photo, StoredObject
 from core.services.photo_service import PhotoService
+from core.websocket.messages import WebSocketMessageType
 
 TEST_ALBUM_ID = 1
 TEST_PHOTO_ID = 1
@@ -31,7 +43,7 @@ class TestPhotoServiceGetPhotosByAlbumId(unittest.TestCase):
             },
         ]
 
-    @patch("core.services.photo_service.PhotoSerializer")
+    @patch("core.services.photo_service.PhotoListSerializer")
     @patch("core.services.photo_service.Photo")
     def test_get_photos_by_album_id_filters_by_album_id(
         self, mock_photo_model, mock_serializer_class
@@ -45,7 +57,7 @@ class TestPhotoServiceGetPhotosByAlbumId(unittest.TestCase):
 
         mock_photo_model.objects.filter.assert_called_once_with(album_id=TEST_ALBUM_ID)
 
-    @patch("core.services.photo_service.PhotoSerializer")
+    @patch("core.services.photo_service.PhotoListSerializer")
     @patch("core.services.photo_service.Photo")
     def test_get_photos_by_album_id_returns_serialized_photos(
         self, mock_photo_model, mock_serializer_class
@@ -59,7 +71,7 @@ class TestPhotoServiceGetPhotosByAlbumId(unittest.TestCase):
 
         self.assertEqual(result, self.serialized_photos)
 
-    @patch("core.services.photo_service.PhotoSerializer")
+    @patch("core.services.photo_service.PhotoListSerializer")
     @patch("core.services.photo_service.Photo")
     def test_get_photos_by_album_id_uses_many_serializer(
         self, mock_photo_model, mock_serializer_class
@@ -71,9 +83,12 @@ class TestPhotoServiceGetPhotosByAlbumId(unittest.TestCase):
 
         PhotoService.get_photos_by_album_id(TEST_ALBUM_ID)
 
-        mock_serializer_class.assert_called_once_with(mock_queryset, many=True)
+        mock_queryset.order_by.assert_called_once_with("rank", "id")
+        mock_serializer_class.assert_called_once_with(
+            mock_queryset.order_by.return_value, many=True
+        )
 
-    @patch("core.services.photo_service.PhotoSerializer")
+    @patch("core.services.photo_service.PhotoListSerializer")
     @patch("core.services.photo_service.Photo")
     def test_get_photos_by_album_id_when_empty_returns_empty_list(
         self, mock_photo_model, mock_serializer_class
@@ -93,12 +108,25 @@ class TestPhotoServiceSavePhoto(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures."""
+        self.stored_patcher = patch("core.services.photo_service.StoredObjectService")
+        self.mock_stored_service = self.stored_patcher.start()
+        self.mock_stored_service.acquire.return_value = {}
+        self.mock_stored_service.register.side_effect = (
+            lambda content_hash, url, variants, count: SimpleNamespace(
+                url=url, variants=variants
+            )
+        )
+        self.addCleanup(self.stored_patcher.stop)
+        rank_patcher = patch("core.services.photo_service.RankService")
+        rank_patcher.start().keys_before_first.return_value = ["i"]
+        self.addCleanup(rank_patcher.stop)
+
         self.mock_file = MagicMock()
         self.mock_file.name = TEST_FILE_NAME
+        self.mock_file.stored_url = None
 
         self.mock_request = MagicMock()
-        self.mock_request.data = MagicMock()
-        self.mock_request.data.copy.return_value = {
+        self.mock_request.data = {
             "caption": TEST_PHOTO_CAPTION,
             "location": TEST_PHOTO_LOCATION,
         }
@@ -114,8 +142,7 @@ class TestPhotoServiceSavePhoto(unittest.TestCase):
             "location": TEST_PHOTO_LOCATION,
         }
 
-    @patch("core.services.photo_service.send_ws_message_to_user")
-    @patch("core.services.photo_service.User")
+    @patch("core.services.photo_service.send_ws_broadcast")
     @patch("core.services.photo_service.PhotoSerializer")
     @patch("core.services.photo_service.Album")
     @patch("core.services.photo_service.photo_repository")
@@ -124,7 +151,6 @@ class TestPhotoServiceSavePhoto(unittest.TestCase):
         mock_photo_repo,
         mock_album_model,
         mock_serializer_class,
-        mock_user,
         mock_ws_send,
     ):
 
@@ -134,7 +160,6 @@ class TestPhotoServiceSavePhoto(unittest.TestCase):
         mock_serializer.is_valid.return_value = True
         mock_serializer.data = self.serialized_photo
         mock_serializer_class.return_value = mock_serializer
-        mock_user.objects.all.return_value.values_list.return_value = [1]
 
         PhotoService.save_photo(TEST_ALBUM_ID, self.mock_request)
 
@@ -142,8 +167,7 @@ class TestPhotoServiceSavePhoto(unittest.TestCase):
             self.mock_file, folder_album_id=TEST_ALBUM_ID
         )
 
-    @patch("core.services.photo_service.send_ws_message_to_user")
-    @patch("core.services.photo_service.User")
+    @patch("core.services.photo_service.send_ws_broadcast")
     @patch("core.services.photo_service.PhotoSerializer")
     @patch("core.services.photo_service.Album")
     @patch("core.services.photo_service.photo_repository")
@@ -152,7 +176,6 @@ class TestPhotoServiceSavePhoto(unittest.TestCase):
         mock_photo_repo,
         mock_album_model,
         mock_serializer_class,
-        mock_user,
         mock_ws_send,
     ):
 
@@ -162,14 +185,12 @@ class TestPhotoServiceSavePhoto(unittest.TestCase):
         mock_serializer.is_valid.return_value = True
         mock_serializer.data = self.serialized_photo
         mock_serializer_class.return_value = mock_serializer
-        mock_user.objects.all.return_value.values_list.return_value = [1]
 
         PhotoService.save_photo(TEST_ALBUM_ID, self.mock_request)
 
         mock_album_model.objects.get.assert_called_once_with(pk=TEST_ALBUM_ID)
 
-    @patch("core.services.photo_service.send_ws_message_to_user")
-    @patch("core.services.photo_service.User")
+    @patch("core.services.photo_service.send_ws_broadcast")
     @patch("core.services.photo_service.PhotoSerializer")
     @patch("core.services.photo_service.Album")
     @patch("core.services.photo_service.photo_repository")
@@ -178,7 +199,6 @@ class TestPhotoServiceSavePhoto(unittest.TestCase):
         mock_photo_repo,
         mock_album_model,
         mock_serializer_class,
-        mock_user,
         mock_ws_send,
     ):
 
@@ -188,14 +208,12 @@ class TestPhotoServiceSavePhoto(unittest.TestCase):
         mock_serializer.is_valid.return_value = True
         mock_serializer.data = self.serialized_photo
         mock_serializer_class.return_value = mock_serializer
-        mock_user.objects.all.return_value.values_list.return_value = [1]
 
         result = PhotoService.save_photo(TEST_ALBUM_ID, self.mock_request)
 
         self.assertEqual(result, self.serialized_photo)
 
-    @patch("core.services.photo_service.send_ws_message_to_user")
-    @patch("core.services.photo_service.User")
+    @patch("core.services.photo_service.send_ws_broadcast")
     @patch("core.services.photo_service.PhotoSerializer")
     @patch("core.services.photo_service.Album")
     @patch("core.services.photo_service.photo_repository")
@@ -204,7 +222,6 @@ class TestPhotoServiceSavePhoto(unittest.TestCase):
         mock_photo_repo,
         mock_album_model,
         mock_serializer_class,
-        mock_user,
         mock_ws_send,
     ):
 
@@ -214,7 +231,6 @@ class TestPhotoServiceSavePhoto(unittest.TestCase):
         mock_serializer.is_valid.return_value = True
         mock_serializer.data = self.serialized_photo
         mock_serializer_class.return_value = mock_serializer
-        mock_user.objects.all.return_value.values_list.return_value = [1]
 
         PhotoService.save_photo(TEST_ALBUM_ID, self.mock_request)
 
@@ -224,8 +240,7 @@ class TestPhotoServiceSavePhoto(unittest.TestCase):
         self.assertEqual(context["album"], self.mock_album)
         self.assertEqual(context["request"], self.mock_request)
 
-    @patch("core.services.photo_service.send_ws_message_to_user")
-    @patch("core.services.photo_service.User")
+    @patch("core.services.photo_service.send_ws_broadcast")
     @patch("core.services.photo_service.PhotoSerializer")
     @patch("core.services.photo_service.Album")
     @patch("core.services.photo_service.photo_repository")
@@ -234,7 +249,6 @@ class TestPhotoServiceSavePhoto(unittest.TestCase):
         mock_photo_repo,
         mock_album_model,
         mock_serializer_class,
-        mock_user,
         mock_ws_send,
     ):
 
@@ -244,14 +258,14 @@ class TestPhotoServiceSavePhoto(unittest.TestCase):
         mock_serializer.is_valid.return_value = True
         mock_serializer.data = self.serialized_photo
         mock_serializer_class.return_value = mock_serializer
-        mock_user.objects.all.return_value.values_list.return_value = [1]
 
         PhotoService.save_photo(TEST_ALBUM_ID, self.mock_request)
 
-        mock_serializer.save.assert_called_once_with(album=self.mock_album)
+        mock_serializer.save.assert_called_once_with(
+            album=self.mock_album, variants={}, rank="i"
+        )
 
-    @patch("core.services.photo_service.send_ws_message_to_user")
-    @patch("core.services.photo_service.User")
+    @patch("core.services.photo_service.send_ws_broadcast")
     @patch("core.services.photo_service.PhotoSerializer")
     @patch("core.services.photo_service.Album")
     @patch("core.services.photo_service.photo_repository")
@@ -260,13 +274,11 @@ class TestPhotoServiceSavePhoto(unittest.TestCase):
         mock_photo_repo,
         mock_album_model,
         mock_serializer_class,
-        mock_user,
         mock_ws_send,
     ):
 
         mock_request = MagicMock()
-        mock_request.data = MagicMock()
-        mock_request.data.copy.return_value = {
+        mock_request.data = {
             "caption": TEST_PHOTO_CAPTION,
         }
         mock_request.FILES = {}
@@ -275,14 +287,12 @@ class TestPhotoServiceSavePhoto(unittest.TestCase):
         mock_serializer.is_valid.return_value = True
         mock_serializer.data = self.serialized_photo
         mock_serializer_class.return_value = mock_serializer
-        mock_user.objects.all.return_value.values_list.return_value = [1]
 
         PhotoService.save_photo(TEST_ALBUM_ID, mock_request)
 
         mock_photo_repo.save_within_folder.assert_not_called()
 
-    @patch("core.services.photo_service.send_ws_message_to_user")
-    @patch("core.services.photo_service.User")
+    @patch("core.services.photo_service.send_ws_broadcast")
     @patch("core.services.photo_service.PhotoSerializer")
     @patch("core.services.photo_service.Album")
     @patch("core.services.photo_service.photo_repository")
@@ -291,7 +301,6 @@ class TestPhotoServiceSavePhoto(unittest.TestCase):
         mock_photo_repo,
         mock_album_model,
         mock_serializer_class,
-        mock_user,
         mock_ws_send,
     ):
 
@@ -301,7 +310,6 @@ class TestPhotoServiceSavePhoto(unittest.TestCase):
         mock_serializer.is_valid.return_value = True
         mock_serializer.data = self.serialized_photo
         mock_serializer_class.return_value = mock_serializer
-        mock_user.objects.all.return_value.values_list.return_value = [1]
 
         PhotoService.save_photo(TEST_ALBUM_ID, self.mock_request)
 
@@ -326,6 +334,27 @@ class TestPhotoServiceSavePhoto(unittest.TestCase):
         with self.assertRaises(Exception):
             PhotoService.save_photo(TEST_ALBUM_ID, self.mock_request)
 
+    @patch("core.services.photo_service.send_ws_broadcast")
+    @patch("core.services.photo_service.PhotoSerializer")
+    @patch("core.services.photo_service.Album")
+    @patch("core.services.photo_service.photo_repository")
+    def test_save_photo_with_invalid_data_releases_stored_image(
+        self, mock_photo_repo, mock_album_model, mock_serializer_class, mock_ws_send
+    ):
+        mock_album_model.objects.get.return_value = self.mock_album
+        mock_photo_repo.save_within_folder.return_value = TEST_PHOTO_URL
+        mock_serializer = MagicMock()
+        mock_serializer.is_valid.return_value = False
+        mock_serializer.errors = {"caption": ["Trop long"]}
+        mock_serializer_class.return_value = mock_serializer
+
+        with self.assertRaises(ValidationError):
+            PhotoService.save_photo(TEST_ALBUM_ID, self.mock_request)
+
+        self.mock_stored_service.release.assert_called_once_with(TEST_PHOTO_URL)
+        mock_serializer.save.assert_not_called()
+        mock_ws_send.assert_not_called()
+
     @patch("core.services.photo_service.Album")
     def test_save_photo_with_nonexistent_album_raises_exception(self, mock_album_model):
         mock_album_model.DoesNotExist = Exception
@@ -342,33 +371,31 @@ class TestPhotoServiceDeletePhoto(unittest.TestCase):
         """Set up test fixtures."""
         self.mock_photo = MagicMock()
         self.mock_photo.id = TEST_PHOTO_ID
+        for target in ("transaction", "StoredObjectService", "deletion_queue"):
+            patcher = patch(f"core.services.photo_service.{target}")
+            patcher.start()
+            self.addCleanup(patcher.stop)
 
-    @patch("core.services.photo_service.send_ws_message_to_user")
-    @patch("core.services.photo_service.User")
+    @patch("core.services.photo_service.send_ws_broadcast")
     @patch("core.services.photo_service.Photo")
-    def test_delete_photo_deletes_from_database(
-        self, mock_photo_model, mock_user_model, mock_ws_send
-    ):
+    def test_delete_photo_deletes_from_database(self, mock_photo_model, mock_ws_send):
         mock_photo_model.objects.get.return_value = self.mock_photo
-        mock_user_model.objects.all.return_value.values_list.return_value = [1, 2]
 
         PhotoService.delete_photo(TEST_PHOTO_ID, TEST_ALBUM_ID)
 
         self.mock_photo.delete.assert_called_once()
 
-    @patch("core.services.photo_service.send_ws_message_to_user")
-    @patch("core.services.photo_service.User")
+    @patch("core.services.photo_service.send_ws_broadcast")
     @patch("core.services.photo_service.Photo")
     def test_delete_photo_broadcasts_deletion_event(
-        self, mock_photo_model, mock_user_model, mock_ws_send
+        self, mock_photo_model, mock_ws_send
     ):
         mock_photo_model.objects.get.return_value = self.mock_photo
-        mock_user_model.objects.all.return_value.values_list.return_value = [1, 2]
 
         PhotoService.delete_photo(TEST_PHOTO_ID, TEST_ALBUM_ID)
 
-        # Should broadcast to all users
-        assert mock_ws_send.call_count == 2
+        # Should publish a single broadcast event
+        assert mock_ws_send.call_count == 1
 
     @patch("core.services.photo_service.Photo")
     def test_delete_photo_raises_not_found_for_nonexistent_photo(
@@ -383,6 +410,48 @@ class TestPhotoServiceDeletePhoto(unittest.TestCase):
             PhotoService.delete_photo(999, TEST_ALBUM_ID)
 
 
+class TestPhotoServiceDeletePhotoStorage(TestCase):
+    """Tests for the storage cleanup done by PhotoService.delete_photo."""
+
+    def setUp(self):
+        self.album = Album.objects.create(title="Trip")
+        self.queue_patcher = patch("core.services.photo_service.deletion_queue")
+        self.mock_queue = self.queue_patcher.start()
+        self.broadcast_patcher = patch("core.services.photo_service.send_ws_broadcast")
+        self.broadcast_patcher.start()
+
+    def tearDown(self):
+        self.queue_patcher.stop()
+        self.broadcast_patcher.stop()
+
+    def test_delete_photo_queues_object_and_variants_after_commit(self):
+        photo = Photo.objects.create(
+            album=self.album,
+            image_url=TEST_PHOTO_URL,
+            variants={"thumbnail": "https://bucket.s3.amazonaws.com/1/thumb.webp"},
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PhotoService.delete_photo(photo.id, self.album.id)
+
+        self.mock_queue.enqueue.assert_called_once_with(
+            [TEST_PHOTO_URL, "https://bucket.s3.amazonaws.com/1/thumb.webp"]
+        )
+
+    def test_delete_photo_keeps_object_shared_with_another_photo(self):
+        StoredObject.objects.create(
+            content_hash="a" * 64, url=TEST_PHOTO_URL, ref_count=2
+        )
+        photo = Photo.objects.create(album=self.album, image_url=TEST_PHOTO_URL)
+        Photo.objects.create(album=self.album, image_url=TEST_PHOTO_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PhotoService.delete_photo(photo.id, self.album.id)
+
+        self.mock_queue.enqueue.assert_called_once_with([])
+        self.assertEqual(StoredObject.objects.get().ref_count, 1)
+
+
 class TestPhotoServiceUpdatePhoto(unittest.TestCase):
     """Tests for PhotoService.update_photo method."""
 
@@ -397,19 +466,17 @@ class TestPhotoServiceUpdatePhoto(unittest.TestCase):
             "location": TEST_PHOTO_LOCATION,
         }
 
-    @patch("core.services.photo_service.send_ws_message_to_user")
-    @patch("core.services.photo_service.User")
+    @patch("core.services.photo_service.send_ws_broadcast")
     @patch("core.services.photo_service.PhotoSerializer")
     @patch("core.services.photo_service.Photo")
     def test_update_photo_updates_fields(
-        self, mock_photo_model, mock_serializer_class, mock_user_model, mock_ws_send
+        self, mock_photo_model, mock_serializer_class, mock_ws_send
     ):
         mock_photo_model.objects.get.return_value = self.mock_photo
         mock_serializer = MagicMock()
         mock_serializer.is_valid.return_value = True
         mock_serializer.data = self.serialized_photo
         mock_serializer_class.return_value = mock_serializer
-        mock_user_model.objects.all.return_value.values_list.return_value = [1]
 
         result = PhotoService.update_photo(
             TEST_PHOTO_ID, TEST_ALBUM_ID, {"caption": "Updated caption"}
@@ -418,24 +485,22 @@ class TestPhotoServiceUpdatePhoto(unittest.TestCase):
         mock_serializer.save.assert_called_once()
         self.assertEqual(result, self.serialized_photo)
 
-    @patch("core.services.photo_service.send_ws_message_to_user")
-    @patch("core.services.photo_service.User")
+    @patch("core.services.photo_service.send_ws_broadcast")
     @patch("core.services.photo_service.PhotoSerializer")
     @patch("core.services.photo_service.Photo")
     def test_update_photo_broadcasts_update_event(
-        self, mock_photo_model, mock_serializer_class, mock_user_model, mock_ws_send
+        self, mock_photo_model, mock_serializer_class, mock_ws_send
     ):
         mock_photo_model.objects.get.return_value = self.mock_photo
         mock_serializer = MagicMock()
         mock_serializer.is_valid.return_value = True
         mock_serializer.data = self.serialized_photo
         mock_serializer_class.return_value = mock_serializer
-        mock_user_model.objects.all.return_value.values_list.return_value = [1, 2, 3]
 
         PhotoService.update_photo(TEST_PHOTO_ID, TEST_ALBUM_ID, {"caption": "New"})
 
-        # Should broadcast to all 3 users
-        assert mock_ws_send.call_count == 3
+        # Should publish a single broadcast event
+        assert mock_ws_send.call_count == 1
 
     @patch("core.services.photo_service.Photo")
     def test_update_photo_raises_not_found_for_nonexistent_photo(
@@ -453,8 +518,8 @@ class TestPhotoServiceUpdatePhoto(unittest.TestCase):
 class TestPhotoServiceWebSocketBroadcast(unittest.TestCase):
     """Tests for PhotoService WebSocket broadcast functionality."""
 
-    @patch("core.services.photo_service.send_ws_message_to_user")
-    @patch("core.services.photo_service.User")
+    @patch("core.services.photo_service.RankService")
+    @patch("core.services.photo_service.send_ws_broadcast")
     @patch("core.services.photo_service.PhotoSerializer")
     @patch("core.services.photo_service.Album")
     @patch("core.services.photo_service.photo_repository")
@@ -463,9 +528,10 @@ class TestPhotoServiceWebSocketBroadcast(unittest.TestCase):
         mock_photo_repo,
         mock_album_model,
         mock_serializer_class,
-        mock_user_model,
         mock_ws_send,
+        mock_rank_service,
     ):
+        mock_rank_service.keys_before_first.return_value = ["i"]
         mock_album = MagicMock()
         mock_album.id = TEST_ALBUM_ID
         mock_album_model.objects.get.return_value = mock_album
@@ -476,17 +542,408 @@ class TestPhotoServiceWebSocketBroadcast(unittest.TestCase):
         mock_serializer.data = {"id": 1, "image_url": TEST_PHOTO_URL}
         mock_serializer_class.return_value = mock_serializer
 
-        mock_user_model.objects.all.return_value.values_list.return_value = [1, 2]
-
         mock_request = MagicMock()
-        mock_request.data = MagicMock()
-        mock_request.data.copy.return_value = {"caption": "Test"}
+        mock_request.data = {"caption": "Test"}
         mock_request.FILES = {}
 
         PhotoService.save_photo(TEST_ALBUM_ID, mock_request)
 
-        # Should broadcast to all users
-        assert mock_ws_send.call_count == 2
+        # Should publish a single broadcast event
+        assert mock_ws_send.call_count == 1
+
+
+class TestPhotoServiceSavePhotos(TestCase):
+    """Tests for PhotoService.save_photos batch upload method."""
+
+    def setUp(self):
+        self.album = Album.objects.create(title="Trip")
+        self.repo_patcher = patch("core.services.photo_service.photo_repository")
+        self.mock_photo_repo = self.repo_patcher.start()
+        self.mock_photo_repo.save_within_folder.side_effect = (
+            lambda file, folder_album_id: f"https://bucket.s3.amazonaws.com/"
+            f"{folder_album_id}/{file.name}"
+        )
+        self.variants_patcher = patch("core.services.photo_service.variant_generator")
+        self.mock_variants = self.variants_patcher.start()
+        self.mock_variants.generate.side_effect = lambda file, folder_album_id: {
+            "thumbnail": f"https://bucket.s3.amazonaws.com/{folder_album_id}/"
+            f"thumb_{file.name}"
+        }
+        self.broadcast_patcher = patch("core.services.photo_service.send_ws_broadcast")
+        self.mock_broadcast = self.broadcast_patcher.start()
+
+    def tearDown(self):
+        self.repo_patcher.stop()
+        self.variants_patcher.stop()
+        self.broadcast_patcher.stop()
+
+    def _request(self, count, data=None):
+        request = MagicMock()
+        request.data = data or {}
+        request.FILES = MultiValueDict(
+            {
+                "images": [
+                    SimpleUploadedFile(f"photo_{i}.jpg", f"bytes {i}".encode())
+                    for i in range(count)
+                ]
+            }
+        )
+        return request
+
+    def test_save_photos_creates_one_row_per_file(self):
+        results = PhotoService.save_photos(
+            self.album.id, self._request(3, {"caption": "Beach"})
+        )
+
+        self.assertEqual(Photo.objects.filter(album=self.album).count(), 3)
+        self.assertEqual(
+            [result["file"] for result in results],
+            ["photo_0.jpg", "photo_1.jpg", "photo_2.jpg"],
+        )
+        for result in results:
+            self.assertEqual(result["photo"]["caption"], "Beach")
+            self.assertIsNotNone(result["photo"]["id"])
+
+    def test_save_photos_stores_variant_urls(self):
+        results = PhotoService.save_photos(self.album.id, self._request(2))
+
+        self.assertEqual(
+            results[1]["photo"]["variants"],
+            {
+                "thumbnail": f"https://bucket.s3.amazonaws.com/{self.album.id}/"
+                "thumb_photo_1.jpg"
+            },
+        )
+        self.assertEqual(self.mock_variants.generate.call_count, 2)
+
+    def test_save_photos_inserts_rows_with_single_bulk_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            PhotoService.save_photos(self.album.id, self._request(10))
+
+        photo_inserts = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith('INSERT INTO "core_photo"')
+        ]
+        self.assertEqual(len(photo_inserts), 1)
+
+    def test_save_photos_broadcasts_one_batch_event(self):
+        PhotoService.save_photos(self.album.id, self._request(4))
+
+        self.mock_broadcast.assert_called_once()
+        message_type, message_data = self.mock_broadcast.call_args[0]
+        self.assertEqual(message_type, WebSocketMessageType.PHOTO_BATCH_UPLOADED)
+        self.assertEqual(len(message_data["data"]), 4)
+        self.assertEqual(message_data["album_id"], self.album.id)
+
+    def test_save_photos_reports_partial_failures(self):
+        def flaky_upload(file, folder_album_id):
+            if file.name == "photo_1.jpg":
+                raise CloudUploadError("Échec de l'upload vers S3")
+            return f"https://bucket.s3.amazonaws.com/{folder_album_id}/{file.name}"
+
+        self.mock_photo_repo.save_within_folder.side_effect = flaky_upload
+
+        results = PhotoService.save_photos(self.album.id, self._request(3))
+
+        self.assertIn("photo", results[0])
+        self.assertIn("error", results[1])
+        self.assertNotIn("photo", results[1])
+        self.assertIn("photo", results[2])
+        self.assertEqual(Photo.objects.filter(album=self.album).count(), 2)
+
+    def test_save_photos_when_all_fail_does_not_broadcast(self):
+        self.mock_photo_repo.save_within_folder.side_effect = CloudUploadError("down")
+
+        results = PhotoService.save_photos(self.album.id, self._request(2))
+
+        self.assertTrue(all("error" in result for result in results))
+        self.mock_broadcast.assert_not_called()
+
+    @patch("core.services.photo_service.PHOTO_UPLOAD_WORKERS", 2)
+    def test_save_photos_bounds_concurrent_uploads(self):
+        lock = threading.Lock()
+        active = {"now": 0, "max": 0}
+
+        def slow_upload(file, folder_album_id):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.01)
+            with lock:
+                active["now"] -= 1
+            return f"https://bucket.s3.amazonaws.com/{folder_album_id}/{file.name}"
+
+        self.mock_photo_repo.save_within_folder.side_effect = slow_upload
+
+        PhotoService.save_photos(self.album.id, self._request(6))
+
+        self.assertEqual(active["max"], 2)
+
+    def test_save_photos_uploads_identical_content_once(self):
+        request = MagicMock()
+        request.data = {}
+        request.FILES = MultiValueDict(
+            {
+                "images": [
+                    SimpleUploadedFile("a.jpg", b"same bytes"),
+                    SimpleUploadedFile("b.jpg", b"same bytes"),
+                ]
+            }
+        )
+
+        results = PhotoService.save_photos(self.album.id, request)
+
+        self.mock_photo_repo.save_within_folder.assert_called_once()
+        self.assertEqual(
+            results[0]["photo"]["image_url"], results[1]["photo"]["image_url"]
+        )
+        self.assertEqual(StoredObject.objects.get().ref_count, 2)
+
+    def test_save_photos_reuses_object_uploaded_to_another_album(self):
+        PhotoService.save_photos(self.album.id, self._request(1))
+        other_album = Album.objects.create(title="Other trip")
+
+        results = PhotoService.save_photos(other_album.id, self._request(1))
+
+        self.assertEqual(self.mock_photo_repo.save_within_folder.call_count, 1)
+        self.assertEqual(
+            results[0]["photo"]["image_url"],
+            f"https://bucket.s3.amazonaws.com/{self.album.id}/photo_0.jpg",
+        )
+
+    def test_save_photos_keeps_streamed_objects(self):
+        files = self._request(2).FILES.getlist("images")
+        for i, file in enumerate(files):
+            file.stored_url = f"https://bucket.s3.amazonaws.com/streamed_{i}.jpg"
+        request = MagicMock()
+        request.data = {}
+        request.FILES = MultiValueDict({"images": files})
+
+        results = PhotoService.save_photos(self.album.id, request)
+
+        self.mock_photo_repo.save_within_folder.assert_not_called()
+        self.assertEqual(
+            results[1]["photo"]["image_url"],
+            "https://bucket.s3.amazonaws.com/streamed_1.jpg",
+        )
+
+    def test_save_photos_deletes_streamed_duplicate(self):
+        PhotoService.save_photos(self.album.id, self._request(1))
+        streamed = self._request(1).FILES.getlist("images")
+        streamed[0].stored_url = "https://bucket.s3.amazonaws.com/streamed.jpg"
+        request = MagicMock()
+        request.data = {}
+        request.FILES = MultiValueDict({"images": streamed})
+
+        PhotoService.save_photos(self.album.id, request)
+
+        self.mock_photo_repo.delete.assert_called_once_with(
+            "https://bucket.s3.amazonaws.com/streamed.jpg"
+        )
+
+    def test_save_photos_deletes_streamed_original_whose_variants_failed(self):
+        self.mock_variants.generate.side_effect = CloudUploadError("S3 down")
+        streamed = self._request(1).FILES.getlist("images")
+        streamed[0].stored_url = "https://bucket.s3.amazonaws.com/streamed.jpg"
+        request = MagicMock()
+        request.data = {}
+        request.FILES = MultiValueDict({"images": streamed})
+
+        results = PhotoService.save_photos(self.album.id, request)
+
+        self.assertIn("error", results[0])
+        self.mock_photo_repo.delete_many.assert_called_once_with(
+            ["https://bucket.s3.amazonaws.com/streamed.jpg"]
+        )
+        self.assertIsNone(streamed[0].stored_url)
+
+    @patch.object(type(connection.features), "can_return_rows_from_bulk_insert", False)
+    def test_save_photos_without_returned_keys_returns_the_saved_rows(self):
+        PhotoService.save_photos(self.album.id, self._request(1))
+        other_album = Album.objects.create(title="Other trip")
+        request = MagicMock()
+        request.data = {}
+        request.FILES = MultiValueDict(
+            {
+                "images": [
+                    SimpleUploadedFile("a.jpg", b"bytes 0"),
+                    SimpleUploadedFile("b.jpg", b"bytes 0"),
+                ]
+            }
+        )
+
+        results = PhotoService.save_photos(other_album.id, request)
+
+        ids = [result["photo"]["id"] for result in results]
+        self.assertEqual(len(set(ids)), 2)
+        self.assertEqual(
+            set(Photo.objects.filter(pk__in=ids).values_list("album_id", flat=True)),
+            {other_album.id},
+        )
+        message_data = self.mock_broadcast.call_args[0][1]
+        self.assertEqual([photo["id"] for photo in message_data["data"]], ids)
+
+    def test_save_photos_without_files_raises_validation_error(self):
+        with self.assertRaises(ValidationError):
+            PhotoService.save_photos(self.album.id, self._request(0))
+
+
+class TestPhotoServiceDirectUploads(TestCase):
+    """Tests for PhotoService.create_uploads and finalize_uploads."""
+
+    def setUp(self):
+        self.album = Album.objects.create(title="Trip")
+        self.repo_patcher = patch("core.services.photo_service.photo_repository")
+        self.mock_photo_repo = self.repo_patcher.start()
+        self.mock_photo_repo.create_upload.side_effect = lambda name, folder_album_id: {
+            "key": f"{folder_album_id}/{name}",
+            "method": "POST",
+            "url": "https://bucket.s3.amazonaws.com",
+            "fields": {},
+        }
+        self.mock_photo_repo.finalize_upload.side_effect = (
+            lambda key, folder_album_id: f"https://bucket.s3.amazonaws.com/{key}"
+        )
+        self.broadcast_patcher = patch("core.services.photo_service.send_ws_broadcast")
+        self.mock_broadcast = self.broadcast_patcher.start()
+
+    def tearDown(self):
+        self.repo_patcher.stop()
+        self.broadcast_patcher.stop()
+
+    def test_create_uploads_returns_one_target_per_file(self):
+        uploads = PhotoService.create_uploads(
+            self.album.id, [{"name": "a.jpg"}, {"name": "b.jpg"}]
+        )
+
+        self.assertEqual([upload["file"] for upload in uploads], ["a.jpg", "b.jpg"])
+        self.assertEqual(uploads[0]["key"], f"{self.album.id}/a.jpg")
+        self.assertEqual(Photo.objects.count(), 0)
+
+    def test_create_uploads_without_names_raises_validation_error(self):
+        with self.assertRaises(ValidationError):
+            PhotoService.create_uploads(self.album.id, [{"name": ""}])
+        with self.assertRaises(ValidationError):
+            PhotoService.create_uploads(self.album.id, [])
+
+    def test_finalize_uploads_creates_rows_and_broadcasts_once(self):
+        results = PhotoService.finalize_uploads(
+            self.album.id,
+            [
+                {"key": f"{self.album.id}/a.jpg", "caption": "Beach"},
+                {"key": f"{self.album.id}/b.jpg"},
+            ],
+        )
+
+        self.assertEqual(Photo.objects.filter(album=self.album).count(), 2)
+        self.assertEqual(results[0]["photo"]["caption"], "Beach")
+        self.mock_broadcast.assert_called_once()
+        message_type, message_data = self.mock_broadcast.call_args[0]
+        self.assertEqual(message_type, WebSocketMessageType.PHOTO_BATCH_UPLOADED)
+        self.assertEqual(len(message_data["data"]), 2)
+
+    def test_finalize_uploads_reports_missing_objects(self):
+        self.mock_photo_repo.finalize_upload.side_effect = None
+        self.mock_photo_repo.finalize_upload.return_value = None
+
+        results = PhotoService.finalize_uploads(
+            self.album.id, [{"key": f"{self.album.id}/a.jpg"}]
+        )
+
+        self.assertIn("error", results[0])
+        self.assertEqual(Photo.objects.count(), 0)
+        self.mock_broadcast.assert_not_called()
+
+    @patch("core.services.photo_service.deletion_queue")
+    def test_finalize_uploads_records_a_key_once_across_repeats_and_replays(
+        self, mock_deletion_queue
+    ):
+        key = f"{self.album.id}/a.jpg"
+        url = f"https://bucket.s3.amazonaws.com/{key}"
+
+        results = PhotoService.finalize_uploads(
+            self.album.id, [{"key": key}, {"key": key}]
+        )
+        replayed = PhotoService.finalize_uploads(self.album.id, [{"key": key}])
+
+        self.assertIn("photo", results[0])
+        self.assertIn("error", results[1])
+        self.assertIn("error", replayed[0])
+        self.assertEqual(Photo.objects.filter(image_url=url).count(), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PhotoService.delete_photo(results[0]["photo"]["id"], self.album.id)
+
+        mock_deletion_queue.enqueue.assert_called_once_with([url])
+        self.assertFalse(Photo.objects.filter(image_url=url).exists())
+
+
+@patch("core.services.photo_service.send_ws_broadcast")
+class TestPhotoServiceMovePhoto(TestCase):
+    """Tests for PhotoService.move_photo method."""
+
+    def setUp(self):
+        self.album = Album.objects.create(title="Trip")
+        self.other_album = Album.objects.create(title="Other")
+        self.photos = Photo.objects.bulk_create(
+            Photo(album=self.album, image_url=f"{TEST_PHOTO_URL}?{i}", rank=rank)
+            for i, rank in enumerate(["a", "b", "c"])
+        )
+        self.stranger = Photo.objects.create(
+            album=self.other_album, image_url=TEST_PHOTO_URL, rank="a"
+        )
+
+    def ordered_ids(self):
+        return list(
+            Photo.objects.filter(album=self.album)
+            .order_by("rank", "id")
+            .values_list("id", flat=True)
+        )
+
+    def test_move_photo_places_it_after_the_given_photo(self, mock_send_ws):
+        first, second, third = self.photos
+
+        result = PhotoService.move_photo(first.id, self.album.id, after=second.id)
+
+        self.assertEqual(self.ordered_ids(), [second.id, first.id, third.id])
+        self.assertEqual(
+            result,
+            {
+                "id": first.id,
+                "rank": Photo.objects.get(pk=first.id).rank,
+                "after": second.id,
+                "album_id": self.album.id,
+            },
+        )
+        mock_send_ws.assert_called_once_with(WebSocketMessageType.PHOTO_MOVED, result)
+
+    def test_move_photo_without_after_places_it_first(self, mock_send_ws):
+        first, second, third = self.photos
+
+        PhotoService.move_photo(third.id, self.album.id, after=None)
+
+        self.assertEqual(self.ordered_ids(), [third.id, first.id, second.id])
+
+    def test_move_photo_of_another_album_raises_not_found(self, mock_send_ws):
+        for photo_id, after in [
+            (self.stranger.id, None),
+            (self.photos[0].id, self.stranger.id),
+        ]:
+            with self.subTest(photo_id=photo_id, after=after):
+                with self.assertRaises(NotFound):
+                    PhotoService.move_photo(photo_id, self.album.id, after=after)
+
+        self.assertEqual(Photo.objects.get(pk=self.stranger.id).rank, "a")
+        mock_send_ws.assert_not_called()
+
+    def test_move_photo_rejects_invalid_after(self, mock_send_ws):
+        photo_id = self.photos[0].id
+        for after in [photo_id, "2", 1.5]:
+            with self.subTest(after=after), self.assertRaises(ValidationError):
+                PhotoService.move_photo(photo_id, self.album.id, after=after)
+
+        mock_send_ws.assert_not_called()
 
 
 if __name__ == "__main__":
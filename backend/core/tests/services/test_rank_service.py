@@ -0,0 +1,135 @@
+import random
+from unittest.mock import patch
+from django.test import SimpleTestCase, TestCase
+
+from core.models import BucketPoint
+from core.services.rank_service import RankService
+
+
+class TestRankServiceKeys(SimpleTestCase):
+    """Tests for the key arithmetic of RankService."""
+
+    def test_key_between_sorts_strictly_between_its_bounds(self):
+        for lower, upper in [
+            (None, None),
+            (None, "i"),
+            ("i", None),
+            ("a", "b"),
+            ("a", "a1"),
+            ("az", "b"),
+            ("01", "1"),
+            ("zz", None),
+            (None, "01"),
+        ]:
+            with self.subTest(lower=lower, upper=upper):
+                key = RankService.key_between(lower, upper)
+
+                self.assertGreater(key, lower or "")
+                if upper is not None:
+                    self.assertLess(key, upper)
+                self.assertFalse(key.endswith("0"))
+
+    def test_key_between_rejects_unordered_bounds(self):
+        with self.assertRaises(ValueError):
+            RankService.key_between("b", "a")
+        with self.assertRaises(ValueError):
+            RankService.key_between("a", "a")
+
+    def test_keys_stay_ordered_under_random_inserts(self):
+        generator = random.Random(0)
+        keys = []
+        for _ in range(500):
+            position = generator.randint(0, len(keys))
+            lower = keys[position - 1] if position else None
+            upper = keys[position] if position < len(keys) else None
+            keys.insert(position, RankService.key_between(lower, upper))
+
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(set(keys)), len(keys))
+
+    def test_prepending_grows_keys_slowly(self):
+        first = None
+        for _ in range(500):
+            first = RankService.key_between(None, first)
+
+        self.assertLessEqual(len(first), 16)
+
+    def test_keys_between_returns_count_ordered_keys(self):
+        keys = RankService.keys_between("a", "b", 10)
+
+        self.assertEqual(len(keys), 10)
+        self.assertEqual(keys, sorted(keys))
+        self.assertTrue(all("a" < key < "b" for key in keys))
+
+    def test_spread_returns_short_evenly_spaced_keys(self):
+        self.assertEqual(RankService.spread(0), [])
+        self.assertEqual(RankService.spread(1), ["i"])
+
+        keys = RankService.spread(1000)
+
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(set(keys)), 1000)
+        self.assertTrue(all(len(key) <= 2 for key in keys))
+
+
+class TestRankServiceMove(TestCase):
+    """Database-backed tests for moves and rebalancing."""
+
+    def setUp(self):
+        self.points = BucketPoint.objects.bulk_create(
+            BucketPoint(title=f"Point {i}", rank=rank)
+            for i, rank in enumerate(RankService.spread(4))
+        )
+
+    def titles(self):
+        return list(
+            BucketPoint.objects.order_by("rank", "id").values_list("title", flat=True)
+        )
+
+    def test_move_after_an_item_writes_the_moved_row_only(self):
+        # Anchor rank, next rank, UPDATE
+        with self.assertNumQueries(3):
+            key = RankService.move(
+                BucketPoint.objects.all(), self.points[0].id, self.points[2].id
+            )
+
+        self.assertEqual(self.titles(), ["Point 1", "Point 2", "Point 0", "Point 3"])
+        self.assertEqual(BucketPoint.objects.get(pk=self.points[0].id).rank, key)
+
+    def test_move_without_after_places_the_item_first(self):
+        RankService.move(BucketPoint.objects.all(), self.points[3].id, None)
+
+        self.assertEqual(self.titles(), ["Point 3", "Point 0", "Point 1", "Point 2"])
+
+    def test_move_returns_none_for_unknown_items(self):
+        queryset = BucketPoint.objects.all()
+
+        self.assertIsNone(RankService.move(queryset, 9999, None))
+        self.assertIsNone(RankService.move(queryset, self.points[0].id, 9999))
+
+    @patch("core.services.rank_service.RANK_REBALANCE_LENGTH", 0)
+    @patch.object(RankService, "rebalance_later")
+    def test_move_schedules_a_rebalance_once_keys_grow_long(self, mock_rebalance):
+        queryset = BucketPoint.objects.all()
+
+        RankService.move(queryset, self.points[0].id, self.points[2].id, ("c",))
+
+        mock_rebalance.assert_called_once_with(queryset, "c")
+
+    def test_rebalance_keeps_the_order_and_shortens_the_keys(self):
+        queryset = BucketPoint.objects.all()
+        for _ in range(40):
+            RankService.move(queryset, self.points[3].id, self.points[0].id)
+            RankService.move(queryset, self.points[0].id, self.points[3].id)
+        before = self.titles()
+
+        RankService.rebalance(queryset)
+
+        self.assertEqual(self.titles(), before)
+        self.assertTrue(all(len(p.rank) == 1 for p in BucketPoint.objects.all()))
+
+    def test_keys_before_first_sort_before_every_ranked_item(self):
+        keys = RankService.keys_before_first(BucketPoint.objects.all(), 3)
+
+        self.assertEqual(keys, sorted(keys))
+        self.assertLess(keys[-1], min(point.rank for point in self.points))
@@ -0,0 +1,75 @@
+from unittest.mock import MagicMock, patch
+from django.test import SimpleTestCase, override_settings
+from django.core.cache import cache
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from core.services.response_cache_service import ResponseCacheService
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class TestResponseCacheService(SimpleTestCase):
+    """Tests for the versioned response cache of the list endpoints."""
+
+    def setUp(self):
+        cache.clear()
+        self.build = MagicMock(return_value=[{"id": 1}])
+
+    def test_second_read_is_served_from_cache(self):
+        first = ResponseCacheService.get_or_build("albums", self.build)
+        second = ResponseCacheService.get_or_build("albums", self.build)
+
+        self.assertEqual(first, [{"id": 1}])
+        self.assertEqual(second, [{"id": 1}])
+        self.build.assert_called_once()
+
+    def test_invalidate_rebuilds_on_next_read(self):
+        ResponseCacheService.get_or_build("albums", self.build)
+        self.build.return_value = [{"id": 1}, {"id": 2}]
+
+        ResponseCacheService.invalidate("albums")
+        data = ResponseCacheService.get_or_build("albums", self.build)
+
+        self.assertEqual(data, [{"id": 1}, {"id": 2}])
+        self.assertEqual(self.build.call_count, 2)
+
+    def test_invalidate_only_affects_given_collections(self):
+        ResponseCacheService.get_or_build("albums", self.build)
+        ResponseCacheService.get_or_build(ResponseCacheService.photos(1), self.build)
+        ResponseCacheService.get_or_build(ResponseCacheService.photos(2), self.build)
+
+        ResponseCacheService.invalidate("albums", ResponseCacheService.photos(1))
+        ResponseCacheService.get_or_build("albums", self.build)
+        ResponseCacheService.get_or_build(ResponseCacheService.photos(1), self.build)
+        ResponseCacheService.get_or_build(ResponseCacheService.photos(2), self.build)
+
+        self.assertEqual(self.build.call_count, 5)
+
+    def test_list_built_before_a_write_is_not_served_after_it(self):
+        def build_racing_with_write():
+            # The write commits and bumps the version while the list is built
+            ResponseCacheService.invalidate("albums")
+            return ["stale"]
+
+        ResponseCacheService.get_or_build("albums", build_racing_with_write)
+        data = ResponseCacheService.get_or_build("albums", self.build)
+
+        self.assertEqual(data, [{"id": 1}])
+
+    @patch("core.services.response_cache_service.cache")
+    def test_unreachable_cache_falls_back_to_build(self, mock_cache):
+        mock_cache.get_many.side_effect = RedisConnectionError("down")
+
+        data = ResponseCacheService.get_or_build("albums", self.build)
+
+        self.assertEqual(data, [{"id": 1}])
+        mock_cache.set.assert_not_called()
+
+    @patch("core.services.response_cache_service.cache")
+    def test_invalidate_does_not_raise_when_cache_is_unreachable(self, mock_cache):
+        mock_cache.add.side_effect = RedisConnectionError("down")
+
+        ResponseCacheService.invalidate("albums", "messages")
+
+        self.assertEqual(mock_cache.add.call_count, 2)
@@ -0,0 +1,123 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import Album, Photo, StoredObject
+from core.services.storage_gc_service import StorageGcService
+
+BASE_URL = "https://bucket.s3.amazonaws.com"
+PHOTO_URL = f"{BASE_URL}/1/photo.jpg"
+PHOTO_THUMBNAIL_URL = f"{BASE_URL}/1/photo_thumbnail.webp"
+COVER_URL = f"{BASE_URL}/cover.jpg"
+STORED_URL = f"{BASE_URL}/1/stored.jpg"
+ORPHAN_URL = f"{BASE_URL}/1/orphan.jpg"
+OTHER_ORPHAN_URL = f"{BASE_URL}/2/orphan.jpg"
+RECENT_URL = f"{BASE_URL}/1/uploading.jpg"
+
+
+def _listed(url, age=timedelta(days=2), size=100):
+    return {"url": url, "size": size, "last_modified": timezone.now() - age}
+
+
+class TestStorageGcService(TestCase):
+    """Tests for the orphaned storage object collector."""
+
+    def setUp(self):
+        album = Album.objects.create(title="Album", cover_image=COVER_URL)
+        Photo.objects.create(
+            album=album,
+            image_url=PHOTO_URL,
+            variants={"thumbnail": PHOTO_THUMBNAIL_URL},
+        )
+        StoredObject.objects.create(content_hash="a" * 64, url=STORED_URL)
+
+        self.repo_patcher = patch("core.services.storage_gc_service.photo_repository")
+        self.mock_photo_repo = self.repo_patcher.start()
+        self.mock_photo_repo.list_objects.return_value = iter(
+            [
+                [_listed(PHOTO_URL), _listed(PHOTO_THUMBNAIL_URL), _listed(ORPHAN_URL)],
+                [
+                    _listed(COVER_URL),
+                    _listed(STORED_URL),
+                    _listed(RECENT_URL, age=timedelta(minutes=5)),
+                    _listed(OTHER_ORPHAN_URL, size=50),
+                ],
+            ]
+        )
+        self.mock_photo_repo.delete_unreferenced.return_value = []
+
+    def tearDown(self):
+        self.repo_patcher.stop()
+
+    def test_referenced_urls_include_photos_covers_variants_and_stored_objects(self):
+        self.assertEqual(
+            StorageGcService.referenced_urls(),
+            {PHOTO_URL, PHOTO_THUMBNAIL_URL, COVER_URL, STORED_URL},
+        )
+
+    def test_collect_deletes_old_orphans_page_by_page(self):
+        stats = StorageGcService.collect(page_size=3)
+
+        self.mock_photo_repo.list_objects.assert_called_once_with(3)
+        deleted = [
+            call[0][0]
+            for call in self.mock_photo_repo.delete_unreferenced.call_args_list
+        ]
+        self.assertEqual(deleted, [[ORPHAN_URL], [OTHER_ORPHAN_URL]])
+        self.assertEqual(stats["scanned"], 7)
+        self.assertEqual(stats["orphans"], 2)
+        self.assertEqual(stats["orphan_bytes"], 150)
+        self.assertEqual(stats["deleted"], 2)
+        self.assertEqual(stats["recent"], 1)
+
+    def test_collect_deletes_orphans_left_in_deleted_album_folders(self):
+        deleted_album = Album.objects.create(title="Deleted")
+        left_over_url = f"{BASE_URL}/{deleted_album.id}/left_over.jpg"
+        deleted_album.delete()
+        self.mock_photo_repo.list_objects.return_value = iter(
+            [[_listed(PHOTO_URL), _listed(left_over_url)]]
+        )
+
+        stats = StorageGcService.collect()
+
+        self.mock_photo_repo.delete_unreferenced.assert_called_once()
+        self.assertEqual(
+            self.mock_photo_repo.delete_unreferenced.call_args[0][0], [left_over_url]
+        )
+        self.assertEqual(stats["deleted"], 1)
+
+    def test_collect_counts_objects_storage_failed_to_delete(self):
+        self.mock_photo_repo.delete_unreferenced.side_effect = lambda urls, _: urls
+
+        stats = StorageGcService.collect()
+
+        self.assertEqual(stats["deleted"], 0)
+        self.assertEqual(stats["failed"], 2)
+
+    def test_collect_dry_run_deletes_nothing(self):
+        stats = StorageGcService.collect(dry_run=True)
+
+        self.mock_photo_repo.delete_unreferenced.assert_not_called()
+        self.assertEqual(stats["orphans"], 2)
+        self.assertEqual(stats["deleted"], 0)
+
+    def test_collect_reports_progress_after_each_page(self):
+        progress = []
+
+        StorageGcService.collect(
+            on_page=lambda stats: progress.append(stats["scanned"])
+        )
+
+        self.assertEqual(progress, [3, 7])
+
+    def test_collect_orphans_command_reports_summary(self):
+        out = StringIO()
+
+        call_command("collect_orphans", "--dry-run", stdout=out)
+
+        self.mock_photo_repo.delete_unreferenced.assert_not_called()
+        self.assertIn("would delete 2 orphans", out.getvalue())
+        self.assertIn("objects/s", out.getvalue())
@@ -0,0 +1,111 @@
+import hashlib
+import io
+import unittest
+from unittest.mock import patch
+from django.test import TestCase
+
+from core.models import StoredObject
+from core.services.stored_object_service import StoredObjectService
+
+TEST_HASH = "a" * 64
+TEST_URL = "https://bucket.s3.amazonaws.com/1/photo.jpg"
+TEST_OTHER_URL = "https://bucket.s3.amazonaws.com/2/photo.jpg"
+TEST_VARIANTS = {"thumbnail": "https://bucket.s3.amazonaws.com/1/thumb.webp"}
+
+
+class TestStoredObjectService(TestCase):
+    """Tests for the reference-counted content hash index."""
+
+    def setUp(self):
+        self.repo_patcher = patch(
+            "core.services.stored_object_service.photo_repository"
+        )
+        self.mock_photo_repo = self.repo_patcher.start()
+        self.variants_patcher = patch(
+            "core.services.stored_object_service.variant_generator"
+        )
+        self.mock_variants = self.variants_patcher.start()
+
+    def tearDown(self):
+        self.repo_patcher.stop()
+        self.variants_patcher.stop()
+
+    def test_content_hash_is_sha256_and_rewinds_file(self):
+        file = io.BytesIO(b"photo bytes")
+        file.read(3)
+
+        content_hash = StoredObjectService.content_hash(file)
+
+        self.assertEqual(content_hash, hashlib.sha256(b"photo bytes").hexdigest())
+        self.assertEqual(file.tell(), 0)
+
+    def test_acquire_adds_references_to_known_objects(self):
+        StoredObject.objects.create(content_hash=TEST_HASH, url=TEST_URL)
+
+        found = StoredObjectService.acquire({TEST_HASH: 2, "b" * 64: 1})
+
+        self.assertEqual(list(found), [TEST_HASH])
+        self.assertEqual(StoredObject.objects.get().ref_count, 3)
+
+    def test_register_with_concurrent_duplicate_keeps_first_object(self):
+        StoredObject.objects.create(content_hash=TEST_HASH, url=TEST_URL)
+
+        stored = StoredObjectService.register(TEST_HASH, TEST_OTHER_URL, {}, 1)
+
+        self.assertEqual(stored.url, TEST_URL)
+        self.assertEqual(StoredObject.objects.get().ref_count, 2)
+        self.mock_photo_repo.delete.assert_called_once_with(TEST_OTHER_URL)
+
+    def test_release_shared_object_keeps_it_in_storage(self):
+        StoredObject.objects.create(content_hash=TEST_HASH, url=TEST_URL, ref_count=2)
+
+        StoredObjectService.release(TEST_URL)
+
+        self.assertEqual(StoredObject.objects.get().ref_count, 1)
+        self.mock_photo_repo.delete.assert_not_called()
+
+    def test_release_last_reference_deletes_object_and_variants(self):
+        StoredObject.objects.create(
+            content_hash=TEST_HASH, url=TEST_URL, variants=TEST_VARIANTS
+        )
+
+        StoredObjectService.release(TEST_URL)
+
+        self.assertFalse(StoredObject.objects.exists())
+        self.mock_photo_repo.delete.assert_called_once_with(TEST_URL)
+        self.mock_variants.delete.assert_called_once_with(TEST_VARIANTS)
+
+    def test_release_untracked_url_deletes_it_directly(self):
+        StoredObjectService.release(TEST_URL)
+
+        self.mock_photo_repo.delete.assert_called_once_with(TEST_URL)
+
+    def test_release_many_mixes_shared_emptied_and_untracked_urls(self):
+        StoredObject.objects.create(content_hash=TEST_HASH, url=TEST_URL, ref_count=3)
+        StoredObject.objects.create(
+            content_hash="b" * 64, url=TEST_OTHER_URL, variants=TEST_VARIANTS
+        )
+        legacy_url = "https://bucket.s3.amazonaws.com/legacy.jpg"
+
+        to_delete = StoredObjectService.release_many(
+            [
+                (TEST_URL, {}),
+                (TEST_URL, {}),
+                (TEST_OTHER_URL, {}),
+                (legacy_url, {"thumbnail": "legacy_thumb"}),
+                (None, {}),
+            ]
+        )
+
+        self.assertEqual(
+            sorted(to_delete),
+            sorted(
+                [TEST_OTHER_URL, *TEST_VARIANTS.values(), legacy_url, "legacy_thumb"]
+            ),
+        )
+        self.assertEqual(StoredObject.objects.get(url=TEST_URL).ref_count, 1)
+        self.mock_photo_repo.delete.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -31,7 +31,7 @@ class TestUserServiceGetPresenceData(unittest.TestCase):
         mock_user_model.objects.exclude.return_value.first.return_value = (
             self.mock_other_user
         )
-        mock_redis.return_value.sismember.return_value = True
+        mock_redis.return_value.zcount.return_value = 2
 
         result = UserService.getPresenceData(TEST_USER_ID)
 
@@ -48,7 +48,7 @@ class TestUserServiceGetPresenceData(unittest.TestCase):
         mock_user_model.objects.exclude.return_value.first.return_value = (
             self.mock_other_user
         )
-        mock_redis.return_value.sismember.return_value = False
+        mock_redis.return_value.zcount.return_value = 0
 
         result = UserService.getPresenceData(TEST_USER_ID)
 
@@ -65,7 +65,7 @@ class TestUserServiceGetPresenceData(unittest.TestCase):
         mock_user_model.objects.exclude.return_value.first.return_value = (
             self.mock_other_user
         )
-        mock_redis.return_value.sismember.return_value = True
+        mock_redis.return_value.zcount.return_value = 2
 
         result = UserService.getPresenceData(TEST_USER_ID)
 
@@ -83,7 +83,7 @@ class TestUserServiceGetPresenceData(unittest.TestCase):
         mock_user_model.objects.exclude.return_value.first.return_value = (
             self.mock_other_user
         )
-        mock_redis.return_value.sismember.return_value = True
+        mock_redis.return_value.zcount.return_value = 2
 
         result = UserService.getPresenceData(TEST_USER_ID)
 
@@ -100,7 +100,7 @@ class TestUserServiceGetPresenceData(unittest.TestCase):
         mock_user_model.objects.exclude.return_value.first.return_value = (
             self.mock_other_user
         )
-        mock_redis.return_value.sismember.return_value = True
+        mock_redis.return_value.zcount.return_value = 2
 
         result = UserService.getPresenceData(TEST_USER_ID)
 
@@ -117,7 +117,7 @@ class TestUserServiceGetPresenceData(unittest.TestCase):
         mock_user_model.objects.exclude.return_value.first.return_value = (
             self.mock_other_user
         )
-        mock_redis.return_value.sismember.return_value = True
+        mock_redis.return_value.zcount.return_value = 2
 
         UserService.getPresenceData(TEST_USER_ID)
 
@@ -158,13 +158,13 @@ class TestUserServiceGetPresenceData(unittest.TestCase):
         mock_user_model.objects.exclude.return_value.first.return_value = (
             self.mock_other_user
         )
-        mock_redis.return_value.sismember.return_value = True
+        mock_redis.return_value.zcount.return_value = 2
 
         UserService.getPresenceData(TEST_USER_ID)
 
-        mock_redis.return_value.sismember.assert_called_once_with(
-            "online_users", str(TEST_OTHER_USER_ID)
-        )
+        key, minimum, maximum = mock_redis.return_value.zcount.call_args[0]
+        self.assertEqual(key, f"presence:{TEST_OTHER_USER_ID}")
+        self.assertEqual(maximum, "+inf")
 
     @patch("core.services.user_service.get_redis_client")
     @patch("core.services.user_service.User")
@@ -179,7 +179,7 @@ class TestUserServiceGetPresenceData(unittest.TestCase):
         mock_user_model.objects.exclude.return_value.first.return_value = (
             self.mock_other_user
         )
-        mock_redis.return_value.sismember.side_effect = RedisError("Connection refused")
+        mock_redis.return_value.zcount.side_effect = RedisError("Connection refused")
 
         result = UserService.getPresenceData(TEST_USER_ID)
 
@@ -198,7 +198,7 @@ class TestUserServiceGetPresenceData(unittest.TestCase):
         mock_user_model.objects.exclude.return_value.first.return_value = (
             self.mock_other_user
         )
-        mock_redis.return_value.sismember.side_effect = RedisError("Connection refused")
+        mock_redis.return_value.zcount.side_effect = RedisError("Connection refused")
 
         result = UserService.getPresenceData(TEST_USER_ID)
 
@@ -1,8 +1,14 @@
 import unittest
 from unittest.mock import MagicMock, patch
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
 from rest_framework import status
 from rest_framework.test import APIRequestFactory, force_authenticate
+from core.models import Album, Photo
 from core.views.albums import AlbumView
+from core.websocket.messages import WebSocketMessageType
 
 TEST_USER_ID = 1
 TEST_ALBUM_ID = 123
@@ -117,5 +123,128 @@ class TestAlbumView(unittest.TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
 
+class TestAlbumViewQueryCount(TestCase):
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username="testuser", password="password")
+        self.view = AlbumView.as_view()
+
+    def _create_albums(self, count, photos_per_album=3):
+        for i in range(count):
+            album = Album.objects.create(title=f"Album {i}")
+            Photo.objects.bulk_create(
+                Photo(album=album, image_url=f"https://example.com/{i}_{j}.jpg")
+                for j in range(photos_per_album)
+            )
+
+    def _list_albums(self):
+        request = self.factory.get("/albums/")
+        force_authenticate(request, user=self.user)
+        return self.view(request)
+
+    def test_givenManyAlbums_whenGet_thenShouldRunConstantNumberOfQueries(self):
+        self._create_albums(2)
+        with self.assertNumQueries(1):
+            self._list_albums()
+
+        self._create_albums(20)
+        with self.assertNumQueries(1):
+            response = self._list_albums()
+
+        self.assertEqual(len(response.data), 22)
+
+    def test_givenAlbumsWithPhotos_whenGet_thenShouldReturnPhotoCounts(self):
+        self._create_albums(2, photos_per_album=4)
+        Album.objects.create(title="Empty")
+
+        response = self._list_albums()
+
+        counts = {album["title"]: album["nb_photos"] for album in response.data}
+        self.assertEqual(counts, {"Album 0": 4, "Album 1": 4, "Empty": 0})
+
+
+class TestAlbumViewUpload(TestCase):
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username="testuser", password="password")
+        self.view = AlbumView.as_view()
+        repository_patcher = patch("core.services.album_service.photo_repository")
+        self.mock_repository = repository_patcher.start()
+        self.mock_repository.save.return_value = "https://bucket.s3.amazonaws.com/c.jpg"
+        self.addCleanup(repository_patcher.stop)
+        variants_patcher = patch("core.services.album_service.variant_generator")
+        variants_patcher.start().generate.return_value = {}
+        self.addCleanup(variants_patcher.stop)
+
+    def test_givenCoverLargerThanMemoryLimit_whenPost_thenShouldCreateAlbum(self):
+        # Spooled to a temporary file on disk rather than kept in memory
+        cover = SimpleUploadedFile(
+            "cover.jpg", b"\xff\xd8\xff" + b"0" * settings.FILE_UPLOAD_MAX_MEMORY_SIZE
+        )
+        request = self.factory.post(
+            "/albums/", {"title": TEST_ALBUM_NAME, "image": cover}, format="multipart"
+        )
+        force_authenticate(request, user=self.user)
+
+        response = self.view(request)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            Album.objects.get().cover_image, "https://bucket.s3.amazonaws.com/c.jpg"
+        )
+
+
+class TestAlbumViewDelete(TestCase):
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username="testuser", password="password")
+        self.view = AlbumView.as_view()
+        self.album = Album.objects.create(
+            title="Trip", cover_image="https://bucket.s3.amazonaws.com/cover.jpg"
+        )
+        Photo.objects.bulk_create(
+            Photo(album=self.album, image_url=f"https://bucket.s3.amazonaws.com/1/{i}")
+            for i in range(3)
+        )
+        queue_patcher = patch("core.services.album_service.deletion_queue")
+        self.mock_queue = queue_patcher.start()
+        self.addCleanup(queue_patcher.stop)
+        broadcast_patcher = patch("core.services.album_service.send_ws_broadcast")
+        self.mock_broadcast = broadcast_patcher.start()
+        self.addCleanup(broadcast_patcher.stop)
+
+    def _delete(self, album_id):
+        request = self.factory.delete(f"/albums/{album_id}/")
+        force_authenticate(request, user=self.user)
+        return self.view(request, album_id=album_id)
+
+    def test_givenAlbum_whenDelete_thenShouldRemoveRowsAndQueueObjects(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._delete(self.album.id)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Album.objects.exists())
+        self.assertFalse(Photo.objects.exists())
+        queued = self.mock_queue.enqueue.call_args[0][0]
+        self.assertEqual(len(queued), 4)
+        self.assertIn("https://bucket.s3.amazonaws.com/cover.jpg", queued)
+
+    def test_givenAlbum_whenDelete_thenShouldBroadcastOnce(self):
+        self._delete(self.album.id)
+
+        self.mock_broadcast.assert_called_once_with(
+            WebSocketMessageType.ALBUM_DELETED, {"id": self.album.id}
+        )
+
+    def test_givenUnknownAlbum_whenDelete_thenShouldReturnNotFound(self):
+        response = self._delete(self.album.id + 1)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.mock_broadcast.assert_not_called()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -2,7 +2,19 @@ import unittest
 from unittest.mock import MagicMock, patch
 from rest_framework import status
 from rest_framework.test import APIRequestFactory, force_authenticate
-from core.views.bucketpoints import BucketPointView
+from core.views.bucketpoints import (
+    BucketPointView,
+    BucketPointBulkView,
+    BucketPointMoveView,
+    BucketPointFeedView,
+    BucketPointSummaryView,
+)
+from core.models import BucketPoint
+from core.services.rank_service import RankService
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.exceptions import ValidationError, NotFound
 
 TEST_USER_ID = 1
@@ -212,5 +224,138 @@ class TestBucketPointView(unittest.TestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
 
+class TestBucketPointMoveView(unittest.TestCase):
+    @patch("core.views.bucketpoints.BucketPointService")
+    def test_givenAfter_whenPost_thenShouldMoveThePoint(self, mock_service):
+        result = {"id": TEST_BUCKETPOINT_ID, "rank": "i", "after": 3}
+        mock_service.move.return_value = result
+        request = APIRequestFactory().post(
+            f"/bucketpoints/{TEST_BUCKETPOINT_ID}/move/", {"after": 3}, format="json"
+        )
+        force_authenticate(request, user=MagicMock())
+
+        response = BucketPointMoveView.as_view()(request, pk=TEST_BUCKETPOINT_ID)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, result)
+        mock_service.move.assert_called_once_with(pk=TEST_BUCKETPOINT_ID, after=3)
+
+    @patch("core.views.bucketpoints.BucketPointService")
+    def test_givenNoAfter_whenPost_thenShouldMoveThePointFirst(self, mock_service):
+        mock_service.move.return_value = {}
+        request = APIRequestFactory().post(
+            f"/bucketpoints/{TEST_BUCKETPOINT_ID}/move/", {"after": None}, format="json"
+        )
+        force_authenticate(request, user=MagicMock())
+
+        BucketPointMoveView.as_view()(request, pk=TEST_BUCKETPOINT_ID)
+
+        mock_service.move.assert_called_once_with(pk=TEST_BUCKETPOINT_ID, after=None)
+
+
+class TestBucketPointBulkView(unittest.TestCase):
+    @patch("core.views.bucketpoints.BucketPointService")
+    def test_givenOperations_whenPost_thenShouldApplyThemInOneCall(self, mock_service):
+        operations = {"update": [{"id": 1, "completed": True}], "delete": [2]}
+        result = {"created": [], "updated": [TEST_RETURNED_DATA], "deleted": [2]}
+        mock_service.bulk.return_value = result
+        request = APIRequestFactory().post(
+            "/bucketpoints/bulk/", operations, format="json"
+        )
+        force_authenticate(request, user=MagicMock())
+
+        response = BucketPointBulkView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, result)
+        mock_service.bulk.assert_called_once()
+        self.assertEqual(mock_service.bulk.call_args.kwargs["data"], operations)
+
+
+class TestBucketPointFeedView(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.view = BucketPointFeedView.as_view()
+        self.user = User.objects.create_user(username="testuser", password="password")
+        BucketPoint.objects.bulk_create(
+            BucketPoint(title=f"Point {i}", completed=i % 2 == 0) for i in range(120)
+        )
+
+    def _get(self, url):
+        request = self.factory.get(url)
+        force_authenticate(request, user=self.user)
+        return self.view(request)
+
+    @staticmethod
+    def _ids(response):
+        return [point["id"] for point in response.data["results"]]
+
+    def test_givenCursor_whenWalkingFeed_thenShouldReturnEveryPointOnce(self):
+        seen = []
+        url = "/bucketpoints/feed/"
+        while url:
+            response = self._get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(point["id"] for point in response.data["results"])
+            url = response.data["next"]
+
+        expected = list(
+            BucketPoint.objects.order_by("rank", "id").values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_givenPointsMovedBetweenFetches_whenWalkingFeed_thenOthersComeOnce(self):
+        BucketPoint.objects.all().delete()
+        points = BucketPoint.objects.bulk_create(
+            BucketPoint(title=f"Point {i}", rank=rank)
+            for i, rank in enumerate(RankService.spread(6))
+        )
+        first_page = self._get("/bucketpoints/feed/?page_size=3")
+        queryset = BucketPoint.objects.all()
+        # Served point moved past the cursor, unserved one moved before it
+        RankService.move(queryset, points[0].id, points[5].id)
+        RankService.move(queryset, points[4].id, None)
+
+        second_page = self._get(first_page.data["next"])
+
+        self.assertEqual(self._ids(first_page), [p.id for p in points[:3]])
+        self.assertEqual(
+            self._ids(second_page), [points[3].id, points[5].id, points[0].id]
+        )
+
+    def test_givenFeedPage_whenGet_thenShouldRunSingleQueryWithoutCount(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self._get("/bucketpoints/feed/")
+
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("COUNT", queries[0]["sql"].upper())
+        self.assertEqual(len(response.data["results"]), 50)
+
+    def test_givenCompletedFilter_whenGet_thenShouldReturnOnlyMatchingPoints(self):
+        response = self._get("/bucketpoints/feed/?completed=false&page_size=100")
+
+        self.assertEqual(len(response.data["results"]), 60)
+        self.assertFalse(any(p["completed"] for p in response.data["results"]))
+
+    def test_givenInvalidCompletedFilter_whenGet_thenShouldReturn400(self):
+        response = self._get("/bucketpoints/feed/?completed=maybe")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestBucketPointSummaryView(unittest.TestCase):
+    @patch("core.views.bucketpoints.BucketPointService")
+    def test_givenAuthenticatedUser_whenGet_thenShouldReturnCounts(self, mock_service):
+        summary = {"total": 3, "completed": 1, "remaining": 2}
+        mock_service.get_summary.return_value = summary
+        request = APIRequestFactory().get("/bucketpoints/summary/")
+        force_authenticate(request, user=MagicMock())
+
+        response = BucketPointSummaryView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, summary)
+
+
 if __name__ == "__main__":
     unittest.main()
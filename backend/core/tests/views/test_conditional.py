@@ -0,0 +1,101 @@
+from unittest.mock import MagicMock, patch
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+from core.services import ResponseCacheService
+from core.views.bucketpoints import BucketPointView
+from core.views.photos import PhotoView
+
+TEST_ALBUM_ID = 3
+TEST_BUCKETPOINTS = [{"id": 1, "title": "Saut en parachute"}]
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class TestConditionalListResponse(SimpleTestCase):
+    """Tests for ETags and If-None-Match on the cached list endpoints."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.user = MagicMock()
+        patcher = patch("core.views.bucketpoints.BucketPointService")
+        self.mock_service = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_service.get_all.return_value = TEST_BUCKETPOINTS
+
+    def _get(self, view=None, path="/bucketpoints/", **headers):
+        request = self.factory.get(path, headers=headers)
+        force_authenticate(request, user=self.user)
+        return (view or BucketPointView.as_view())(request)
+
+    def test_response_carries_etag_and_revalidation_header(self):
+        response = self._get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, TEST_BUCKETPOINTS)
+        self.assertTrue(response["ETag"].startswith('"bucketpoints-'))
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+    def test_matching_etag_returns_304_without_building_the_list(self):
+        etag = self._get()["ETag"]
+        self.mock_service.get_all.reset_mock()
+        cache.delete("response:bucketpoints")
+
+        response = self._get(if_none_match=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.mock_service.get_all.assert_not_called()
+
+    def test_weak_etag_from_a_compressing_proxy_matches(self):
+        etag = self._get()["ETag"]
+
+        response = self._get(if_none_match=f"W/{etag}")
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_change_to_the_collection_returns_the_new_list(self):
+        etag = self._get()["ETag"]
+        self.mock_service.get_all.return_value = []
+
+        ResponseCacheService.invalidate(ResponseCacheService.BUCKETPOINTS)
+        response = self._get(if_none_match=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+        self.assertNotEqual(response["ETag"], etag)
+
+    @patch("core.views.photos.PhotoService")
+    def test_wrapped_body_keeps_its_shape(self, mock_photo_service):
+        mock_photo_service.get_photos_by_album_id.return_value = [{"id": 5}]
+        view = PhotoView.as_view()
+        path = f"/photos/{TEST_ALBUM_ID}/"
+
+        request = self.factory.get(path)
+        force_authenticate(request, user=self.user)
+        response = view(request, album_id=TEST_ALBUM_ID)
+        request = self.factory.get(path, headers={"If-None-Match": response["ETag"]})
+        force_authenticate(request, user=self.user)
+        revalidated = view(request, album_id=TEST_ALBUM_ID)
+
+        self.assertEqual(
+            response.data, {"photos": [{"id": 5}], "album_id": TEST_ALBUM_ID}
+        )
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class TestConditionalListResponseWithoutCache(SimpleTestCase):
+    def test_no_etag_when_versions_cannot_be_kept(self):
+        request = APIRequestFactory().get(
+            "/bucketpoints/", headers={"If-None-Match": "*"}
+        )
+        force_authenticate(request, user=MagicMock())
+
+        with patch("core.views.bucketpoints.BucketPointService") as mock_service:
+            mock_service.get_all.return_value = TEST_BUCKETPOINTS
+            response = BucketPointView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("ETag", response)
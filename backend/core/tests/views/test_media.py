@@ -0,0 +1,39 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework import status
+from core.views.media import MediaView
+
+TEST_BLOB_PATH = f"ab/{'ab' * 32}.jpg"
+
+
+class TestMediaView(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username="testuser", password="password")
+        self.view = MediaView.as_view()
+
+    def _get(self, path, user=None):
+        request = self.factory.get(f"/api/media/{path}")
+        if user:
+            force_authenticate(request, user=user)
+        return self.view(request, path=path)
+
+    def test_get_blob_delegates_to_nginx(self):
+        response = self._get(TEST_BLOB_PATH, user=self.user)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected-media/{TEST_BLOB_PATH}"
+        )
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+
+    def test_get_blob_requires_authentication(self):
+        response = self._get(TEST_BLOB_PATH)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_get_invalid_path_returns_not_found(self):
+        response = self._get("../settings.py", user=self.user)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
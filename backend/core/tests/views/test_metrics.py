@@ -0,0 +1,35 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework import status
+from unittest.mock import patch
+from core.views.metrics import RedisPoolMetricsView
+
+TEST_METRICS = {"sync": None, "async": []}
+
+
+class TestRedisPoolMetricsView(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.view = RedisPoolMetricsView.as_view()
+
+    def _get(self, user):
+        request = self.factory.get("/api/metrics/redis/")
+        force_authenticate(request, user=user)
+        return self.view(request)
+
+    @patch("core.views.metrics.pool_metrics", return_value=TEST_METRICS)
+    def test_get_returns_pool_metrics_to_admins(self, mock_pool_metrics):
+        admin = User.objects.create_user(username="admin", is_staff=True)
+
+        response = self._get(admin)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, TEST_METRICS)
+
+    def test_get_rejects_regular_users(self):
+        user = User.objects.create_user(username="testuser")
+
+        response = self._get(user)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
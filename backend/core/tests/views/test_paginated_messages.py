@@ -2,7 +2,12 @@ import unittest
 from unittest.mock import MagicMock, patch
 from rest_framework import status
 from rest_framework.test import APIRequestFactory, force_authenticate
-from core.views.messages import PaginatedMessageView
+from core.views.messages import PaginatedMessageView, MessageFeedView
+from core.models import Message
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 TEST_USER_ID = 1
 
@@ -47,3 +52,42 @@ class TestPaginatedMessageView(unittest.TestCase):
         self.assertIn("results", response.data)
         self.assertEqual(response.data["count"], 25)
         self.assertEqual(len(response.data["results"]), 20)
+
+
+class TestMessageFeedView(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.view = MessageFeedView.as_view()
+        self.user = User.objects.create_user(username="testuser", password="password")
+        Message.objects.bulk_create(
+            Message(user=self.user, message=f"Message {i}") for i in range(45)
+        )
+
+    def _get(self, url):
+        request = self.factory.get(url)
+        force_authenticate(request, user=self.user)
+        return self.view(request)
+
+    def test_givenCursor_whenWalkingFeed_thenShouldReturnEveryMessageOnce(self):
+        seen = []
+        url = "/messages/feed/"
+        while url:
+            response = self._get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            seen.extend(message["id"] for message in response.data["results"])
+            url = response.data["next"]
+
+        expected = list(
+            Message.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_givenFeedPage_whenGet_thenShouldRunSingleQueryWithoutCount(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self._get("/messages/feed/")
+
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("COUNT", queries[0]["sql"].upper())
+        self.assertEqual(len(response.data["results"]), 20)
+        self.assertEqual(response.data["results"][0]["user"]["id"], self.user.id)
@@ -1,11 +1,222 @@
+from django.conf import settings
 from django.test import TestCase
 from unittest.mock import patch
+from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework.test import APIRequestFactory, force_authenticate
 from rest_framework import status
-from core.views.photos import PhotoDetailView
+from rest_framework.exceptions import ValidationError
+from core.models import Album, Photo
+from core.views.photos import (
+    PhotoView,
+    PhotoDetailView,
+    PhotoMoveView,
+    PhotoUploadView,
+    PhotoUploadFinalizeView,
+)
 from django.contrib.auth.models import User
 
 
+class TestPhotoView(TestCase):
+    def setUp(self):
+        stream_patcher = patch("core.interface.upload_handler.photo_repository")
+        self.mock_stream_repo = stream_patcher.start()
+        self.mock_stream_repo.open_stream.return_value.complete.return_value = (
+            "https://bucket.s3.amazonaws.com/1/streamed.jpg"
+        )
+        self.addCleanup(stream_patcher.stop)
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username="testuser", password="password")
+        self.view = PhotoView.as_view()
+        self.album = Album.objects.create(title="Test Album")
+
+    def _add_photos(self, count):
+        Photo.objects.bulk_create(
+            Photo(album=self.album, image_url=f"https://example.com/{i}.jpg")
+            for i in range(count)
+        )
+
+    def _list_photos(self):
+        request = self.factory.get(f"/photos/{self.album.id}/")
+        force_authenticate(request, user=self.user)
+        return self.view(request, album_id=self.album.id)
+
+    def test_get_photos_returns_compact_representation(self):
+        self._add_photos(2)
+
+        response = self._list_photos()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["photos"]), 2)
+        for photo in response.data["photos"]:
+            self.assertEqual(photo["album_id"], self.album.id)
+            self.assertNotIn("album", photo)
+
+    @patch("core.services.photo_service.send_ws_broadcast")
+    @patch("core.services.photo_service.variant_generator")
+    def test_post_single_image_larger_than_memory_limit(self, mock_variants, _):
+        mock_variants.generate.return_value = {}
+        image = SimpleUploadedFile(
+            "big.jpg", b"\xff\xd8\xff" + b"0" * settings.FILE_UPLOAD_MAX_MEMORY_SIZE
+        )
+        request = self.factory.post(
+            f"/photos/{self.album.id}/",
+            {"image": image, "caption": "Big"},
+            format="multipart",
+        )
+        force_authenticate(request, user=self.user)
+
+        response = self.view(request, album_id=self.album.id)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        photo = Photo.objects.get()
+        self.assertEqual(photo.caption, "Big")
+        self.assertEqual(
+            photo.image_url, "https://bucket.s3.amazonaws.com/1/streamed.jpg"
+        )
+
+    def test_post_to_missing_album_streams_nothing(self):
+        request = self.factory.post(
+            "/photos/999/",
+            {"image": SimpleUploadedFile("a.jpg", b"\xff\xd8\xffa")},
+            format="multipart",
+        )
+        force_authenticate(request, user=self.user)
+
+        response = self.view(request, album_id=999)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.mock_stream_repo.open_stream.assert_not_called()
+
+    def test_post_without_authentication_streams_nothing(self):
+        request = self.factory.post(
+            f"/photos/{self.album.id}/",
+            {"image": SimpleUploadedFile("a.jpg", b"\xff\xd8\xffa")},
+            format="multipart",
+        )
+
+        response = self.view(request, album_id=self.album.id)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.mock_stream_repo.open_stream.assert_not_called()
+
+    @patch("core.services.stored_object_service.photo_repository")
+    @patch("core.services.PhotoService.save_photo")
+    def test_post_failing_after_parsing_deletes_streamed_objects(
+        self, mock_save_photo, mock_photo_repo
+    ):
+        mock_save_photo.side_effect = ValidationError({"caption": "invalid"})
+        mock_photo_repo.delete_many.return_value = []
+        request = self.factory.post(
+            f"/photos/{self.album.id}/",
+            {"image": SimpleUploadedFile("a.jpg", b"\xff\xd8\xffa")},
+            format="multipart",
+        )
+        force_authenticate(request, user=self.user)
+
+        response = self.view(request, album_id=self.album.id)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        mock_photo_repo.delete_many.assert_called_once_with(
+            ["https://bucket.s3.amazonaws.com/1/streamed.jpg"]
+        )
+
+    @patch("core.services.PhotoService.save_photos")
+    def test_post_multiple_images_uses_batch_upload(self, mock_save_photos):
+        mock_save_photos.return_value = [
+            {"file": "a.jpg", "photo": {"id": 1}},
+            {"file": "b.jpg", "photo": {"id": 2}},
+        ]
+        request = self.factory.post(
+            f"/photos/{self.album.id}/",
+            {
+                "images": [
+                    SimpleUploadedFile("a.jpg", b"a"),
+                    SimpleUploadedFile("b.jpg", b"b"),
+                ]
+            },
+            format="multipart",
+        )
+        force_authenticate(request, user=self.user)
+
+        response = self.view(request, album_id=self.album.id)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["results"]), 2)
+        mock_save_photos.assert_called_once()
+        files = mock_save_photos.call_args[0][1].FILES.getlist("images")
+        self.assertEqual(
+            [file.stored_url for file in files],
+            ["https://bucket.s3.amazonaws.com/1/streamed.jpg"] * 2,
+        )
+        self.assertEqual(self.mock_stream_repo.open_stream.call_count, 2)
+
+    @patch("core.services.PhotoService.save_photos")
+    def test_post_batch_with_failures_returns_multi_status(self, mock_save_photos):
+        mock_save_photos.return_value = [
+            {"file": "a.jpg", "photo": {"id": 1}},
+            {"file": "b.jpg", "error": "upload failed"},
+        ]
+        request = self.factory.post(
+            f"/photos/{self.album.id}/",
+            {"images": [SimpleUploadedFile("a.jpg", b"a")]},
+            format="multipart",
+        )
+        force_authenticate(request, user=self.user)
+
+        response = self.view(request, album_id=self.album.id)
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+
+    def test_get_photos_runs_constant_number_of_queries(self):
+        self._add_photos(2)
+        with self.assertNumQueries(1):
+            self._list_photos()
+
+        self._add_photos(50)
+        with self.assertNumQueries(1):
+            self._list_photos()
+
+
+class TestPhotoUploadViews(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username="testuser", password="password")
+        self.album = Album.objects.create(title="Test Album")
+
+    @patch("core.services.PhotoService.create_uploads")
+    def test_post_returns_upload_targets(self, mock_create_uploads):
+        mock_create_uploads.return_value = [{"file": "a.jpg", "key": "1/a.jpg"}]
+        request = self.factory.post(
+            f"/photos/{self.album.id}/uploads/",
+            {"files": [{"name": "a.jpg"}]},
+            format="json",
+        )
+        force_authenticate(request, user=self.user)
+
+        response = PhotoUploadView.as_view()(request, album_id=self.album.id)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["uploads"][0]["key"], "1/a.jpg")
+        mock_create_uploads.assert_called_once_with(self.album.id, [{"name": "a.jpg"}])
+
+    @patch("core.services.PhotoService.finalize_uploads")
+    def test_finalize_with_failures_returns_multi_status(self, mock_finalize):
+        mock_finalize.return_value = [
+            {"key": "1/a.jpg", "photo": {"id": 1}},
+            {"key": "1/b.jpg", "error": "missing"},
+        ]
+        request = self.factory.post(
+            f"/photos/{self.album.id}/uploads/finalize/",
+            {"uploads": [{"key": "1/a.jpg"}, {"key": "1/b.jpg"}]},
+            format="json",
+        )
+        force_authenticate(request, user=self.user)
+
+        response = PhotoUploadFinalizeView.as_view()(request, album_id=self.album.id)
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+
+
 class TestPhotoDetailView(TestCase):
     def setUp(self):
         self.factory = APIRequestFactory()
@@ -35,3 +246,30 @@ class TestPhotoDetailView(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["photo"]["caption"], "Updated Caption")
         mock_update.assert_called_once_with(photo_id=1, album_id=1, data=data)
+
+
+class TestPhotoMoveView(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username="testuser", password="password")
+        self.view = PhotoMoveView.as_view()
+
+    @patch("core.services.PhotoService.move_photo")
+    def test_move_photo(self, mock_move):
+        mock_move.return_value = {"id": 1, "rank": "i", "after": 2, "album_id": 1}
+
+        request = self.factory.post("/photos/1/1/move/", {"after": 2}, format="json")
+        force_authenticate(request, user=self.user)
+
+        response = self.view(request, album_id=1, photo_id=1)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["rank"], "i")
+        mock_move.assert_called_once_with(photo_id=1, album_id=1, after=2)
+
+    def test_move_photo_requires_authentication(self):
+        request = self.factory.post("/photos/1/1/move/", {"after": 2}, format="json")
+
+        response = self.view(request, album_id=1, photo_id=1)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
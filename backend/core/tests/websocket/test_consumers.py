@@ -1,4 +1,5 @@
 from django.test import TestCase, SimpleTestCase
+import asyncio
 import json
 from unittest.mock import patch, MagicMock, AsyncMock
 from asgiref.sync import async_to_sync
@@ -48,6 +49,71 @@ class TestWebSocketManagerAuthentication(TestCase):
 
         assert isinstance(result, AnonymousUser)
 
+    def test_get_user_resolves_valid_token_and_caches_it(self):
+        """Test that a valid token resolves its user and is cached."""
+        from django.contrib.auth.models import User
+        from rest_framework_simplejwt.tokens import AccessToken
+        from core.websocket.user_cache import user_cache
+
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+        user = User.objects.create_user(username="alice", password="pass")
+        token = str(AccessToken.for_user(user))
+        consumer = WebSocketManager()
+        consumer.scope = {"query_string": f"accessToken={token}".encode()}
+
+        result = async_to_sync(consumer.get_user)()
+
+        assert result.id == user.id
+        assert user_cache.get(token).id == user.id
+
+    def test_get_user_cache_hit_skips_database(self):
+        """Test that a cached token does not go through the database pool."""
+        from django.contrib.auth.models import User
+        from core.websocket.user_cache import user_cache
+
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+        user_cache.put("cached_token", User(id=7, username="bob"))
+        consumer = WebSocketManager()
+        consumer.scope = {"query_string": b"accessToken=cached_token"}
+
+        with patch.object(WebSocketManager, "load_user") as mock_load_user:
+            result = async_to_sync(consumer.get_user)()
+
+        mock_load_user.assert_not_called()
+        assert result.username == "bob"
+
+    def test_get_user_concurrent_misses_share_one_lookup(self):
+        """Test that sockets connecting with one token load the user once."""
+        import asyncio
+        from django.contrib.auth.models import User
+        from core.websocket.user_cache import user_cache
+
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+        user = User(id=7, username="bob")
+
+        async def slow_load(token):
+            await asyncio.sleep(0.01)
+            return user
+
+        async def storm():
+            consumers = []
+            for _ in range(5):
+                consumer = WebSocketManager()
+                consumer.scope = {"query_string": b"accessToken=shared_token"}
+                consumers.append(consumer)
+            return await asyncio.gather(*(c.get_user() for c in consumers))
+
+        with patch.object(
+            WebSocketManager, "load_user", side_effect=slow_load
+        ) as mock_load_user:
+            results = async_to_sync(storm)()
+
+        assert mock_load_user.call_count == 1
+        assert all(result is user for result in results)
+
 
 class TestWebSocketManagerMessageHandling(SimpleTestCase):
     """Tests for WebSocket message handling."""
@@ -66,45 +132,95 @@ class TestWebSocketManagerMessageHandling(SimpleTestCase):
 class TestWebSocketManagerPresence(SimpleTestCase):
     """Tests for user presence functionality."""
 
-    def test_mark_user_online_calls_redis(self):
-        """Test that marking user online adds them to Redis set."""
-        mock_redis = AsyncMock()
-        mock_redis.sadd = AsyncMock(return_value=1)
-        mock_redis.expire = AsyncMock(return_value=True)
+    def _redis_with_replies(self, *replies):
+        mock_redis = MagicMock()
+        mock_redis.pipeline.return_value.execute = AsyncMock(return_value=list(replies))
+        return mock_redis
+
+    def _consumer(self):
+        consumer = WebSocketManager()
+        consumer.channel_name = "channel_1"
+        return consumer
+
+    def test_mark_user_online_adds_connection_to_user_presence_set(self):
+        """Test that marking online adds this channel to the user's sorted set."""
+        mock_redis = self._redis_with_replies(1, 0, True, 1)
+
+        with patch(
+            "core.websocket.consumers.get_async_redis_client", return_value=mock_redis
+        ):
+            first = async_to_sync(self._consumer().mark_user_online)(42)
+
+        pipe = mock_redis.pipeline.return_value
+        key, members = pipe.zadd.call_args[0]
+        assert key == "presence:42"
+        assert list(members) == ["channel_1"]
+        pipe.zremrangebyscore.assert_called_once()
+        pipe.expire.assert_called_once_with("presence:42", 90)
+        pipe.execute.assert_awaited_once()
+        assert first is True
+
+    def test_mark_user_online_with_other_tab_open_is_not_first(self):
+        """Test that a second tab does not announce the user again."""
+        mock_redis = self._redis_with_replies(1, 0, True, 2)
 
         with patch(
             "core.websocket.consumers.get_async_redis_client", return_value=mock_redis
         ):
-            consumer = WebSocketManager()
-            async_to_sync(consumer.mark_user_online)(42)
+            first = async_to_sync(self._consumer().mark_user_online)(42)
 
-            mock_redis.sadd.assert_called_once_with("online_users", "42")
-            mock_redis.expire.assert_called_once()
+        assert first is False
 
-    def test_mark_user_offline_calls_redis(self):
-        """Test that marking user offline removes them from Redis set."""
-        mock_redis = AsyncMock()
-        mock_redis.srem = AsyncMock(return_value=1)
+    def test_mark_user_offline_removes_connection(self):
+        """Test that marking offline removes only this channel."""
+        mock_redis = self._redis_with_replies(1, 0, 1)
 
         with patch(
             "core.websocket.consumers.get_async_redis_client", return_value=mock_redis
         ):
-            consumer = WebSocketManager()
-            async_to_sync(consumer.mark_user_offline)(42)
+            last = async_to_sync(self._consumer().mark_user_offline)(42)
 
-            mock_redis.srem.assert_called_once_with("online_users", "42")
+        mock_redis.pipeline.return_value.zrem.assert_called_once_with(
+            "presence:42", "channel_1"
+        )
+        assert last is False
+
+    def test_mark_user_offline_last_connection_reports_offline(self):
+        """Test that closing the last tab takes the user offline."""
+        mock_redis = self._redis_with_replies(1, 0, 0)
+
+        with patch(
+            "core.websocket.consumers.get_async_redis_client", return_value=mock_redis
+        ):
+            last = async_to_sync(self._consumer().mark_user_offline)(42)
+
+        assert last is True
+
+    def test_refresh_user_presence_pushes_expiry_back(self):
+        """Test that heartbeats refresh the connection and the key TTL."""
+        mock_redis = self._redis_with_replies(0, True)
+
+        with patch(
+            "core.websocket.consumers.get_async_redis_client", return_value=mock_redis
+        ):
+            async_to_sync(self._consumer().refresh_user_presence)(42)
+
+        pipe = mock_redis.pipeline.return_value
+        pipe.zadd.assert_called_once()
+        pipe.expire.assert_called_once_with("presence:42", 90)
 
     def test_mark_user_online_handles_redis_error(self):
         """Test that Redis errors are handled gracefully."""
-        mock_redis = AsyncMock()
-        mock_redis.sadd = AsyncMock(side_effect=Exception("Redis connection failed"))
+        mock_redis = MagicMock()
+        mock_redis.pipeline.return_value.execute = AsyncMock(
+            side_effect=Exception("Redis connection failed")
+        )
 
         with patch(
             "core.websocket.consumers.get_async_redis_client", return_value=mock_redis
         ):
-            consumer = WebSocketManager()
-            # Should not raise exception
-            async_to_sync(consumer.mark_user_online)(42)
+            # Should not raise exception, and still announce the user
+            assert async_to_sync(self._consumer().mark_user_online)(42) is True
 
 
 class TestWebSocketManagerHeartbeat(SimpleTestCase):
@@ -142,7 +258,7 @@ class TestWebSocketManagerBroadcast(SimpleTestCase):
         consumer.channel_layer.group_send.assert_called_once()
         call_args = consumer.channel_layer.group_send.call_args
         assert call_args[0][0] == "broadcast"
-        payload = call_args[0][1]["payload"]
+        payload = json.loads(call_args[0][1]["frame"])
         assert payload["type"] == "USER_PRESENCE_CONNECTED"
         assert payload["data"]["user_id"] == mock_user.id
 
@@ -159,7 +275,7 @@ class TestWebSocketManagerBroadcast(SimpleTestCase):
 
         consumer.channel_layer.group_send.assert_called_once()
         call_args = consumer.channel_layer.group_send.call_args
-        payload = call_args[0][1]["payload"]
+        payload = json.loads(call_args[0][1]["frame"])
         assert payload["type"] == "USER_PRESENCE_DISCONNECTED"
 
     def test_send_message_handler(self):
@@ -172,7 +288,11 @@ class TestWebSocketManagerBroadcast(SimpleTestCase):
             "payload": {"type": "TEST_EVENT", "data": {"key": "value"}},
         }
 
-        async_to_sync(consumer.send_message)(event)
+        async def send_and_flush():
+            await consumer.send_message(event)
+            await consumer.flush_task
+
+        async_to_sync(send_and_flush)()
 
         consumer.send.assert_called_once()
         call_args = consumer.send.call_args
@@ -180,6 +300,110 @@ class TestWebSocketManagerBroadcast(SimpleTestCase):
         assert sent_data["type"] == "TEST_EVENT"
         assert sent_data["data"]["key"] == "value"
 
+    def test_send_message_forwards_pre_encoded_frame_verbatim(self):
+        """Test that a frame encoded by the publisher is not re-encoded."""
+        consumer = WebSocketManager()
+        consumer.send = AsyncMock()
+        frame = '{"type":"TEST_EVENT","data":{"key":"value"}}'
+
+        async def send_and_flush():
+            with patch("core.websocket.consumers.encode_json") as mock_encode:
+                await consumer.send_message({"type": "send.message", "frame": frame})
+                await consumer.flush_task
+            mock_encode.assert_not_called()
+
+        async_to_sync(send_and_flush)()
+
+        consumer.send.assert_called_once_with(text_data=frame)
+
+    def test_send_message_coalesces_burst_into_one_batch_frame(self):
+        """Test that events arriving together reach the client as one frame."""
+        consumer = WebSocketManager()
+        consumer.send = AsyncMock()
+
+        async def burst():
+            for i in range(3):
+                await consumer.send_message(
+                    {"payload": {"type": "PHOTO_DELETED", "data": {"id": i}}}
+                )
+            await consumer.flush_task
+
+        async_to_sync(burst)()
+
+        consumer.send.assert_called_once()
+        sent_data = json.loads(consumer.send.call_args[1]["text_data"])
+        assert sent_data["type"] == "BATCH"
+        assert [event["data"]["id"] for event in sent_data["data"]] == [0, 1, 2]
+
+    def test_send_message_closes_client_when_outbox_is_full(self):
+        """Test that a client that cannot keep up is disconnected."""
+        consumer = WebSocketManager()
+        consumer.send = AsyncMock()
+        consumer.close = AsyncMock()
+        consumer.scope = {"user": MagicMock(id=1)}
+        event = {"payload": {"type": "PHOTO_DELETED", "data": {"id": 1}}}
+
+        async def flood():
+            with patch("core.websocket.consumers.WS_OUTBOX_LIMIT", 2):
+                for _ in range(3):
+                    await consumer.send_message(event)
+            await consumer.flush_task
+
+        async_to_sync(flood)()
+
+        consumer.close.assert_awaited_once_with(code=4008)
+        consumer.send.assert_not_called()
+        assert consumer.outbox == []
+
+    def test_send_message_holds_events_while_client_is_not_reading(self):
+        """Test that events wait in the outbox while the socket buffer is full."""
+        consumer = WebSocketManager()
+        consumer.send = AsyncMock()
+        event = {"payload": {"type": "PHOTO_DELETED", "data": {"id": 1}}}
+        backlog = [10**9, 10**9, 0]
+
+        async def stalled_then_draining():
+            with (
+                patch.object(consumer, "send_backlog", side_effect=backlog),
+                patch("core.websocket.consumers.WS_BACKLOG_RETRY_INTERVAL", 0),
+            ):
+                await consumer.send_message(event)
+                await consumer.send_message(event)
+                await consumer.flush_task
+
+        async_to_sync(stalled_then_draining)()
+
+        consumer.send.assert_called_once()
+        sent_data = json.loads(consumer.send.call_args[1]["text_data"])
+        assert sent_data["type"] == "BATCH"
+
+    def test_send_message_closes_client_whose_socket_buffer_stays_full(self):
+        """Test that a client not reading is disconnected once the outbox fills."""
+        consumer = WebSocketManager()
+        consumer.send = AsyncMock()
+        consumer.close = AsyncMock()
+        consumer.scope = {"user": MagicMock(id=1)}
+        event = {"payload": {"type": "PHOTO_DELETED", "data": {"id": 1}}}
+
+        async def flood_while_stalled():
+            with (
+                patch.object(consumer, "send_backlog", return_value=10**9),
+                patch("core.websocket.consumers.WS_OUTBOX_LIMIT", 3),
+                patch("core.websocket.consumers.WS_COALESCE_WINDOW", 0),
+                patch("core.websocket.consumers.WS_BACKLOG_RETRY_INTERVAL", 0),
+            ):
+                for _ in range(4):
+                    await consumer.send_message(event)
+                    # Let the flush task look at the socket buffer
+                    await asyncio.sleep(0)
+                # The flush task stops once the connection is closing
+                await asyncio.sleep(0)
+
+        async_to_sync(flood_while_stalled)()
+
+        consumer.close.assert_awaited_once_with(code=4008)
+        consumer.send.assert_not_called()
+
     def test_broadcast_presence_handles_error(self):
         """Test that broadcast errors are handled gracefully."""
         mock_user = MagicMock()
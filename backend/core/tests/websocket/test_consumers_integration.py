@@ -1,11 +1,19 @@
 from django.test import TransactionTestCase, override_settings
+from channels.auth import AuthMiddlewareStack
+from channels.layers import get_channel_layer
 from channels.testing import WebsocketCommunicator
 from core.routing import websocket_urlpatterns
+from core.websocket.messages import WebSocketMessageType
+from core.websocket.middleware import SendBacklogMiddleware
+from core.websocket.utils import build_event
 from channels.routing import URLRouter
 from django.contrib.auth.models import User
 import jwt
 from django.conf import settings
-from unittest.mock import patch, AsyncMock
+from unittest.mock import patch, AsyncMock, MagicMock
+from functools import partial
+from types import SimpleNamespace
+import asyncio
 
 
 @override_settings(
@@ -26,9 +34,8 @@ class TestWebSocketIntegration(TransactionTestCase):
         token = jwt.encode(
             {"user_id": self.user.id}, settings.SECRET_KEY, algorithm="HS256"
         )
-        mock_redis = AsyncMock()
-        mock_redis.sadd.return_value = 1
-        mock_redis.expire.return_value = True
+        mock_redis = MagicMock()
+        mock_redis.pipeline.return_value.execute = AsyncMock(return_value=[1, 0, 1, 1])
 
         with patch(
             "core.websocket.consumers.get_async_redis_client", return_value=mock_redis
@@ -44,9 +51,8 @@ class TestWebSocketIntegration(TransactionTestCase):
         token = jwt.encode(
             {"user_id": self.user.id}, settings.SECRET_KEY, algorithm="HS256"
         )
-        mock_redis = AsyncMock()
-        mock_redis.sadd.return_value = 1
-        mock_redis.expire.return_value = True
+        mock_redis = MagicMock()
+        mock_redis.pipeline.return_value.execute = AsyncMock(return_value=[1, 0, 1, 1])
 
         # Patch MessageService to avoid full DB/WebSocket broadcast complexity during this specific test if needed,
         # but let's try to run it fully to cover more lines.
@@ -88,3 +94,100 @@ class TestWebSocketIntegration(TransactionTestCase):
         connected, _ = await communicator.connect()
         self.assertFalse(connected)
         await communicator.disconnect()
+
+
+class _DaphneServer:
+    """Stands for daphne.server.Server: replies go through handle_reply."""
+
+    def __init__(self):
+        self.connections = {}
+        self.reply = None
+
+    async def handle_reply(self, protocol, message):
+        await self.reply(message)
+
+
+class _DaphneProtocol:
+    def __init__(self):
+        self.transport = SimpleNamespace(dataBuffer=b"", offset=0, _tempDataLen=0)
+
+
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+)
+class TestWebSocketBackpressure(TransactionTestCase):
+    """Backpressure through the middleware stack of backend/asgi.py."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="password")
+        self.server = _DaphneServer()
+        self.protocol = _DaphneProtocol()
+        self.stack = SendBacklogMiddleware(
+            AuthMiddlewareStack(URLRouter(websocket_urlpatterns))
+        )
+        self.mock_redis = MagicMock()
+        self.mock_redis.pipeline.return_value.execute = AsyncMock(
+            return_value=[1, 0, 1, 1]
+        )
+
+    async def daphne(self, scope, receive, send):
+        # Daphne runs the application with a send bound to the protocol
+        self.server.reply = send
+        self.server.connections[self.protocol] = {
+            "application_instance": asyncio.current_task()
+        }
+        await self.stack(
+            scope, receive, partial(self.server.handle_reply, self.protocol)
+        )
+
+    async def connect(self):
+        token = jwt.encode(
+            {"user_id": self.user.id}, settings.SECRET_KEY, algorithm="HS256"
+        )
+        communicator = WebsocketCommunicator(self.daphne, f"/ws/?accessToken={token}")
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        # USER_PRESENCE_CONNECTED
+        await communicator.receive_json_from()
+        return communicator
+
+    async def publish(self, count):
+        for i in range(count):
+            await get_channel_layer().group_send(
+                f"user_{self.user.id}",
+                build_event(WebSocketMessageType.PHOTO_DELETED, {"id": i}),
+            )
+            # Past the coalescing window: every event gets its own flush
+            await asyncio.sleep(0.02)
+
+    async def test_client_reading_receives_events(self):
+        with patch(
+            "core.websocket.consumers.get_async_redis_client",
+            return_value=self.mock_redis,
+        ):
+            communicator = await self.connect()
+            await self.publish(1)
+
+            event = await communicator.receive_json_from()
+
+            self.assertEqual(event["type"], "PHOTO_DELETED")
+            await communicator.disconnect()
+
+    async def test_client_not_reading_is_closed_once_outbox_fills(self):
+        with (
+            patch(
+                "core.websocket.consumers.get_async_redis_client",
+                return_value=self.mock_redis,
+            ),
+            patch("core.websocket.consumers.WS_OUTBOX_LIMIT", 3),
+            patch("core.websocket.consumers.WS_SEND_BACKLOG_LIMIT", 10),
+        ):
+            communicator = await self.connect()
+            # The socket buffer holds bytes the client has not read
+            self.protocol.transport.dataBuffer = b"x" * 11
+            await self.publish(4)
+
+            closed = await communicator.receive_output()
+
+            self.assertEqual(closed, {"type": "websocket.close", "code": 4008})
+            await communicator.wait()
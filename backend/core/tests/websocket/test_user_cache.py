@@ -0,0 +1,89 @@
+import time
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+
+from core.websocket.user_cache import UserSnapshotCache, user_cache
+
+
+def _user(user_id=1, username="alice"):
+    return User(id=user_id, username=username, first_name="Alice")
+
+
+class TestUserSnapshotCache(SimpleTestCase):
+    """Tests for the token to user snapshot cache."""
+
+    def test_get_returns_copy_of_cached_user(self):
+        cache = UserSnapshotCache(ttl=60, max_size=10)
+        cache.put("token", _user())
+
+        user = cache.get("token")
+
+        self.assertEqual((user.id, user.username), (1, "alice"))
+        self.assertEqual(user.get_full_name(), "Alice")
+        self.assertIsNot(user, cache.get("token"))
+
+    def test_get_unknown_token_returns_none(self):
+        self.assertIsNone(UserSnapshotCache().get("token"))
+
+    def test_entries_expire_after_ttl(self):
+        cache = UserSnapshotCache(ttl=60, max_size=10)
+        cache.put("token", _user())
+
+        with patch("core.websocket.user_cache.time.monotonic", return_value=1e12):
+            self.assertIsNone(cache.get("token"))
+        self.assertEqual(len(cache), 0)
+
+    def test_entries_do_not_outlive_token(self):
+        cache = UserSnapshotCache(ttl=60, max_size=10)
+
+        cache.put("expired", _user(), token_expiry=time.time() - 1)
+
+        self.assertIsNone(cache.get("expired"))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = UserSnapshotCache(ttl=60, max_size=2)
+        cache.put("first", _user(1))
+        cache.put("second", _user(2))
+        cache.get("first")
+
+        cache.put("third", _user(3))
+
+        self.assertIsNone(cache.get("second"))
+        self.assertIsNotNone(cache.get("first"))
+        self.assertIsNotNone(cache.get("third"))
+
+    def test_invalidate_user_drops_all_its_tokens(self):
+        cache = UserSnapshotCache(ttl=60, max_size=10)
+        cache.put("tab_1", _user(1))
+        cache.put("tab_2", _user(1))
+        cache.put("other", _user(2))
+
+        cache.invalidate_user(1)
+
+        self.assertIsNone(cache.get("tab_1"))
+        self.assertIsNone(cache.get("tab_2"))
+        self.assertIsNotNone(cache.get("other"))
+
+
+class TestUserSnapshotCacheInvalidation(TestCase):
+    """Tests for the invalidation on user changes."""
+
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(username="alice", password="pass")
+        user_cache.put("token", self.user)
+
+    def tearDown(self):
+        user_cache.clear()
+
+    def test_saving_user_invalidates_snapshot(self):
+        self.user.first_name = "Alicia"
+        self.user.save()
+
+        self.assertIsNone(user_cache.get("token"))
+
+    def test_deleting_user_invalidates_snapshot(self):
+        self.user.delete()
+
+        self.assertIsNone(user_cache.get("token"))
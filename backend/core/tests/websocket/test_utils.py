@@ -2,8 +2,19 @@
 Tests for WebSocket utility functions.
 """
 
+import asyncio
+import json
+from functools import partial
+from types import MethodType, SimpleNamespace
 from unittest.mock import patch, MagicMock
-from core.websocket.utils import send_ws_message_to_user, broadcast_ws_message
+from core.websocket.utils import (
+    BROADCAST_GROUP,
+    send_ws_message_to_user,
+    send_ws_broadcast,
+    broadcast_ws_message,
+    server_transport,
+    transport_backlog,
+)
 from core.websocket.messages import WebSocketMessageType
 
 
@@ -53,9 +64,10 @@ class TestSendWsMessageToUser:
                 message = call_args[0][1]
 
                 assert message["type"] == "send.message"
-                assert "payload" in message
-                assert message["payload"]["type"] == "PHOTO_UPLOADED"
-                assert message["payload"]["data"] == data
+                assert "frame" in message
+                frame = json.loads(message["frame"])
+                assert frame["type"] == "PHOTO_UPLOADED"
+                assert frame["data"] == data
 
     def test_handles_enum_event_type(self):
         """Test that enum event types are properly converted."""
@@ -71,7 +83,7 @@ class TestSendWsMessageToUser:
                 send_ws_message_to_user(1, WebSocketMessageType.MESSAGE_CREATED, {})
 
                 call_args = mock_async_send.call_args
-                payload = call_args[0][1]["payload"]
+                payload = json.loads(call_args[0][1]["frame"])
                 assert payload["type"] == "MESSAGE_CREATED"
 
     def test_handles_string_event_type(self):
@@ -88,7 +100,7 @@ class TestSendWsMessageToUser:
                 send_ws_message_to_user(1, "CUSTOM_EVENT", {"key": "value"})
 
                 call_args = mock_async_send.call_args
-                payload = call_args[0][1]["payload"]
+                payload = json.loads(call_args[0][1]["frame"])
                 assert payload["type"] == "CUSTOM_EVENT"
 
     def test_no_error_when_channel_layer_is_none(self):
@@ -176,9 +188,128 @@ class TestBroadcastWsMessage:
                 )
 
                 calls = mock_async_send.call_args_list
-                payloads = [c[0][1]["payload"]["data"] for c in calls]
+                payloads = [json.loads(c[0][1]["frame"])["data"] for c in calls]
                 assert all(p == data for p in payloads)
 
+    def test_encodes_payload_once_for_all_users(self):
+        """Test that every recipient gets the same pre-encoded frame."""
+        mock_async_send = MagicMock()
+
+        with patch("core.websocket.utils.get_channel_layer", return_value=MagicMock()):
+            with patch(
+                "core.websocket.utils.async_to_sync", return_value=mock_async_send
+            ):
+                with patch(
+                    "core.websocket.utils.encode_json", return_value='{"type":"X"}'
+                ) as mock_encode:
+                    broadcast_ws_message(
+                        [1, 2, 3], WebSocketMessageType.MESSAGE_CREATED, {"id": 1}
+                    )
+
+                mock_encode.assert_called_once()
+                frames = {c[0][1]["frame"] for c in mock_async_send.call_args_list}
+                assert frames == {'{"type":"X"}'}
+
+
+class TestSendWsBroadcast:
+    """Tests for send_ws_broadcast function."""
+
+    def test_publishes_once_to_broadcast_group(self):
+        """Test that a single group_send targets the broadcast group."""
+        mock_channel_layer = MagicMock()
+        mock_async_send = MagicMock()
+
+        with patch(
+            "core.websocket.utils.get_channel_layer", return_value=mock_channel_layer
+        ):
+            with patch(
+                "core.websocket.utils.async_to_sync", return_value=mock_async_send
+            ):
+                data = {"id": 7}
+
+                send_ws_broadcast(WebSocketMessageType.PHOTO_DELETED, data)
+
+                mock_async_send.assert_called_once_with(
+                    BROADCAST_GROUP,
+                    {
+                        "type": "send.message",
+                        "frame": json.dumps(
+                            {"type": "PHOTO_DELETED", "data": data},
+                            separators=(",", ":"),
+                        ),
+                    },
+                )
+
+    def test_no_error_when_channel_layer_is_none(self):
+        """Test that function handles missing channel layer gracefully."""
+        with patch("core.websocket.utils.get_channel_layer", return_value=None):
+            send_ws_broadcast(WebSocketMessageType.MESSAGE_CREATED, {})
+
+
+class TestServerTransport:
+    """Tests for server_transport function."""
+
+    class _Protocol:
+        def __init__(self):
+            self.transport = object()
+
+    class _Server:
+        def __init__(self):
+            self.connections = {}
+
+        async def handle_reply(self, protocol, message):
+            pass
+
+    def test_finds_daphne_protocol_of_the_running_application(self):
+        server = self._Server()
+        protocol, other = self._Protocol(), self._Protocol()
+
+        async def application(send):
+            server.connections[other] = {"application_instance": object()}
+            server.connections[protocol] = {
+                "application_instance": asyncio.current_task()
+            }
+            return server_transport(send)
+
+        send = partial(server.handle_reply, protocol)
+        assert asyncio.run(application(send)) is protocol.transport
+
+    def test_reads_transport_of_asyncio_server_protocol(self):
+        protocol = self._Protocol()
+        protocol.send = MethodType(lambda self, message: None, protocol)
+
+        assert server_transport(protocol.send) is protocol.transport
+
+    def test_returns_none_for_unknown_servers(self):
+        async def send(message):
+            pass
+
+        assert server_transport(send) is None
+        assert asyncio.run(self._current_transport(self._Server())) is None
+
+    @staticmethod
+    async def _current_transport(server):
+        return server_transport(partial(server.handle_reply, None))
+
+
+class TestTransportBacklog:
+    """Tests for transport_backlog function."""
+
+    def test_reads_unsent_bytes_of_twisted_transport(self):
+        transport = SimpleNamespace(dataBuffer=b"x" * 100, offset=40, _tempDataLen=10)
+
+        assert transport_backlog(transport) == 70
+
+    def test_reads_write_buffer_of_asyncio_transport(self):
+        transport = MagicMock()
+        transport.get_write_buffer_size.return_value = 512
+
+        assert transport_backlog(transport) == 512
+
+    def test_returns_none_for_unknown_transport(self):
+        assert transport_backlog(None) is None
+        assert transport_backlog(object()) is None
+
 
 class TestWebSocketMessageType:
     """Tests for WebSocketMessageType enum."""
@@ -1,6 +1,14 @@
 from django.test import SimpleTestCase
-from unittest.mock import patch, MagicMock
-from core.websocket.utils import send_ws_message_to_user, broadcast_ws_message
+from unittest.mock import patch, AsyncMock, MagicMock
+from asgiref.sync import async_to_sync
+from channels.layers import InMemoryChannelLayer
+from channels_redis.core import RedisChannelLayer
+from core.websocket.utils import (
+    send_ws_message_to_user,
+    broadcast_ws_message,
+    group_add_many,
+    group_discard_many,
+)
 from core.websocket.messages import WebSocketMessageType
 
 
@@ -26,7 +34,7 @@ class TestWebSocketUtils(SimpleTestCase):
             "user_1",
             {
                 "type": "send.message",
-                "payload": {"type": "TEST_EVENT", "data": {"key": "value"}},
+                "frame": '{"type":"TEST_EVENT","data":{"key":"value"}}',
             },
         )
 
@@ -38,15 +46,62 @@ class TestWebSocketUtils(SimpleTestCase):
 
         self.assertIsNone(result)
 
-    @patch("core.websocket.utils.send_ws_message_to_user")
-    def test_broadcast_ws_message(self, mock_send_single):
+    @patch("core.websocket.utils.get_channel_layer")
+    @patch("core.websocket.utils.async_to_sync")
+    def test_broadcast_ws_message(self, mock_async_to_sync, mock_get_channel_layer):
+        mock_send = MagicMock()
+        mock_async_to_sync.return_value = mock_send
         user_ids = [1, 2, 3]
         event_type = WebSocketMessageType.MESSAGE_CREATED
         data = {"id": 1}
 
         broadcast_ws_message(user_ids, event_type, data)
 
-        self.assertEqual(mock_send_single.call_count, 3)
-        mock_send_single.assert_any_call(1, event_type, data)
-        mock_send_single.assert_any_call(2, event_type, data)
-        mock_send_single.assert_any_call(3, event_type, data)
+        self.assertEqual(mock_send.call_count, 3)
+        message = {
+            "type": "send.message",
+            "frame": '{"type":"MESSAGE_CREATED","data":{"id":1}}',
+        }
+        mock_send.assert_any_call("user_1", message)
+        mock_send.assert_any_call("user_2", message)
+        mock_send.assert_any_call("user_3", message)
+
+
+class TestGroupMembershipPipelines(SimpleTestCase):
+    def _redis_layer(self):
+        layer = RedisChannelLayer(hosts=[("localhost", 6379)])
+        connection = MagicMock()
+        connection.pipeline.return_value.execute = AsyncMock(return_value=[])
+        layer.connection = MagicMock(return_value=connection)
+        return layer, connection.pipeline.return_value
+
+    def test_group_add_many_pipelines_every_group_in_one_round_trip(self):
+        layer, pipe = self._redis_layer()
+
+        async_to_sync(group_add_many)(layer, ["user_1", "broadcast"], "channel.1")
+
+        pipe.execute.assert_awaited_once()
+        self.assertEqual(
+            [call[0][0] for call in pipe.zadd.call_args_list],
+            [layer._group_key("user_1"), layer._group_key("broadcast")],
+        )
+        pipe.expire.assert_any_call(layer._group_key("broadcast"), layer.group_expiry)
+
+    def test_group_discard_many_pipelines_every_group_in_one_round_trip(self):
+        layer, pipe = self._redis_layer()
+
+        async_to_sync(group_discard_many)(layer, ["user_1", "broadcast"], "channel.1")
+
+        pipe.execute.assert_awaited_once()
+        pipe.zrem.assert_any_call(layer._group_key("user_1"), "channel.1")
+        pipe.zrem.assert_any_call(layer._group_key("broadcast"), "channel.1")
+
+    def test_group_add_many_falls_back_to_group_add_for_other_layers(self):
+        layer = InMemoryChannelLayer()
+
+        async def join_and_receive():
+            await group_add_many(layer, ["user_1", "broadcast"], "channel.1")
+            await layer.group_send("broadcast", {"type": "ping"})
+            return await layer.receive("channel.1")
+
+        self.assertEqual(async_to_sync(join_and_receive)(), {"type": "ping"})
@@ -2,12 +2,22 @@ from django.urls import path
 from .views import (
     MessageView,
     PaginatedMessageView,
+    MessageFeedView,
     ProfileView,
     BucketPointView,
+    BucketPointBulkView,
+    BucketPointMoveView,
+    BucketPointFeedView,
+    BucketPointSummaryView,
     PresenceIndicatorView,
     AlbumView,
     PhotoView,
     PhotoDetailView,
+    PhotoMoveView,
+    PhotoUploadView,
+    PhotoUploadFinalizeView,
+    MediaView,
+    RedisPoolMetricsView,
 )
 
 urlpatterns = [
@@ -17,17 +27,55 @@ urlpatterns = [
         PaginatedMessageView.as_view(),
         name="user_messages_paginated",
     ),
+    path("messages/feed/", MessageFeedView.as_view(), name="user_messages_feed"),
     path("messages/<int:pk>/", MessageView.as_view(), name="user_messages"),
     path("profile/", ProfileView.as_view(), name="user_profile"),
     path("bucketpoints/", BucketPointView.as_view(), name="bucket_points"),
+    path(
+        "bucketpoints/bulk/",
+        BucketPointBulkView.as_view(),
+        name="bucket_points_bulk",
+    ),
+    path(
+        "bucketpoints/feed/",
+        BucketPointFeedView.as_view(),
+        name="bucket_points_feed",
+    ),
+    path(
+        "bucketpoints/summary/",
+        BucketPointSummaryView.as_view(),
+        name="bucket_points_summary",
+    ),
     path("bucketpoints/<int:pk>/", BucketPointView.as_view(), name="bucket_points"),
+    path(
+        "bucketpoints/<int:pk>/move/",
+        BucketPointMoveView.as_view(),
+        name="bucket_points_move",
+    ),
     path("presence/", PresenceIndicatorView.as_view(), name="presence_indicator"),
     path("albums/", AlbumView.as_view(), name="albums"),
     path("albums/<int:album_id>/", AlbumView.as_view(), name="album_edition"),
     path("photos/<int:album_id>/", PhotoView.as_view(), name="photo_view"),
+    path(
+        "photos/<int:album_id>/uploads/",
+        PhotoUploadView.as_view(),
+        name="photo_uploads",
+    ),
+    path(
+        "photos/<int:album_id>/uploads/finalize/",
+        PhotoUploadFinalizeView.as_view(),
+        name="photo_uploads_finalize",
+    ),
     path(
         "photos/<int:album_id>/<int:photo_id>/",
         PhotoDetailView.as_view(),
         name="photo_detail",
     ),
+    path(
+        "photos/<int:album_id>/<int:photo_id>/move/",
+        PhotoMoveView.as_view(),
+        name="photo_move",
+    ),
+    path("media/<path:path>", MediaView.as_view(), name="media"),
+    path("metrics/redis/", RedisPoolMetricsView.as_view(), name="redis_metrics"),
 ]
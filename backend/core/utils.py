@@ -1,11 +1,27 @@
 import smtplib
 from email.message import EmailMessage
+from django.core.files.uploadedfile import UploadedFile
 import os
 from dotenv import load_dotenv, find_dotenv
 
 load_dotenv(find_dotenv())
 
 
+NOTIFICATION_SUBJECT = "[Aurianne Léo] - Nouveau message reçu sur le site"
+
+
+def build_email_message(
+    subject: str, html_body: str, sender_email: str, recipient_email: str
+) -> EmailMessage:
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    msg["From"] = sender_email
+    msg["To"] = recipient_email
+    msg.set_content("Ce mail nécessite un affichage HTML.")
+    msg.add_alternative(html_body, subtype="html")
+    return msg
+
+
 def send_email(
     subject: str,
     html_body: str,
@@ -15,12 +31,7 @@ def send_email(
     smtp_server: str,
     smtp_port: int,
 ):
-    msg = EmailMessage()
-    msg["Subject"] = subject
-    msg["From"] = sender_email
-    msg["To"] = recipient_email
-    msg.set_content("Ce mail nécessite un affichage HTML.")
-    msg.add_alternative(html_body, subtype="html")
+    msg = build_email_message(subject, html_body, sender_email, recipient_email)
 
     try:
         with smtplib.SMTP(smtp_server, smtp_port) as server:
@@ -32,9 +43,13 @@ def send_email(
         print(f"Échec de l'envoi du mail : {e}")
 
 
-def send_formatted_mail(receiver: str, name: str):
-    subject = "[Aurianne Léo] - Nouveau message reçu sur le site"
-    html_body = f"""
+def build_notification_html(name: str, count: int = 1) -> str:
+    if count > 1:
+        text = f"Tu as reçu {count} nouveaux messages tout doux sur ton site !"
+    else:
+        text = "Tu as reçu un nouveau message tout doux sur ton site !"
+
+    return f"""
     <html>
     <head>
         <style>
@@ -95,7 +110,7 @@ def send_formatted_mail(receiver: str, name: str):
             <img src="https://i.imgur.com/wUG8pS5.mp4" class="logo" alt="Cute Logo">
             <div class="title">Bonjour {name} 🧸🐐</div>
             <div class="message">
-                Tu as reçu un nouveau message tout doux sur ton site !
+                {text}
             </div>
             <a class="button" href="https://al.lchappuis.fr">Voir le message</a>
             <div class="footer">
@@ -107,6 +122,11 @@ def send_formatted_mail(receiver: str, name: str):
     </html>    
     """
 
+
+def send_formatted_mail(receiver: str, name: str):
+    subject = NOTIFICATION_SUBJECT
+    html_body = build_notification_html(name)
+
     sender_email = os.getenv("MAIL_USERNAME")
     sender_password = os.getenv("MAIL_PASSWORD")
     smtp_server = os.getenv("MAIL_HOST")
@@ -121,3 +141,15 @@ def send_formatted_mail(receiver: str, name: str):
         smtp_server,
         smtp_port,
     )
+
+
+def form_fields(data) -> dict:
+    """
+    Mutable copy of request data without its uploaded files.
+
+    Multipart data holds the files too, and files spooled to disk cannot be
+    deep-copied by QueryDict.copy(); they are read from request.FILES.
+    """
+    return {
+        key: value for key, value in data.items() if not isinstance(value, UploadedFile)
+    }
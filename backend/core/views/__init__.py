@@ -1,5 +1,19 @@
 from .users import ProfileView, PresenceIndicatorView
-from .messages import MessageView, PaginatedMessageView
-from .bucketpoints import BucketPointView
+from .messages import MessageView, PaginatedMessageView, MessageFeedView
+from .bucketpoints import (
+    BucketPointView,
+    BucketPointBulkView,
+    BucketPointMoveView,
+    BucketPointFeedView,
+    BucketPointSummaryView,
+)
 from .albums import AlbumView
-from .photos import PhotoView, PhotoDetailView
+from .media import MediaView
+from .metrics import RedisPoolMetricsView
+from .photos import (
+    PhotoView,
+    PhotoDetailView,
+    PhotoMoveView,
+    PhotoUploadView,
+    PhotoUploadFinalizeView,
+)
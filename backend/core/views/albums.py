@@ -1,4 +1,5 @@
-from core.services import AlbumService
+from core.services import AlbumService, ResponseCacheService
+from core.views.conditional import cached_list_response
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
@@ -11,10 +12,12 @@ from ..serializers import (
 class AlbumView(APIView):
     permission_classes = [IsAuthenticated]
 
-    def get(self, _):
-        albums = AlbumService.getAll()
-        serializer = AlbumSerializer(albums, many=True)
-        return Response(serializer.data)
+    def get(self, request):
+        return cached_list_response(
+            request,
+            ResponseCacheService.ALBUMS,
+            lambda: AlbumSerializer(AlbumService.getAll(), many=True).data,
+        )
 
     def post(self, request):
         serialized_data = AlbumService.createAlbum(request.data, request.FILES)
@@ -26,7 +29,6 @@ class AlbumView(APIView):
         )
         return Response(serialized_data)
 
-    def delete(self, request):
-        # TODO: Implement delete album functionality
-        # maybe delete all photos in the album too ?
-        pass
+    def delete(self, request, album_id):
+        AlbumService.deleteAlbum(album_id)
+        return Response(status=status.HTTP_204_NO_CONTENT)
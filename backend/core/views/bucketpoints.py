@@ -2,16 +2,22 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+from typing import Optional
 
-from core.services import BucketPointService
+from core.services import BucketPointService, ResponseCacheService
+from core.serializers import BucketPointSerializer
+from core.views.conditional import cached_list_response
 
 
 class BucketPointView(APIView):
     permission_classes = [IsAuthenticated]
 
-    def get(self, _):
-        data = BucketPointService.get_all()
-        return Response(data)
+    def get(self, request):
+        return cached_list_response(
+            request, ResponseCacheService.BUCKETPOINTS, BucketPointService.get_all
+        )
 
     def post(self, request):
         data = BucketPointService.create(
@@ -26,3 +32,71 @@ class BucketPointView(APIView):
     def delete(self, _, pk):
         BucketPointService.delete(pk=pk)
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class BucketPointMoveView(APIView):
+    """Place a bucket point right after another one (`after`), or first (null)."""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, pk):
+        data = BucketPointService.move(pk=pk, after=request.data.get("after"))
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class BucketPointBulkView(APIView):
+    """Create, update and delete many bucket points in one request."""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        data = BucketPointService.bulk(data=request.data, context={"request": request})
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class BucketPointCursorPagination(CursorPagination):
+    """
+    Pages in list order, backed by the (rank, id) index.
+
+    The cursor holds the rank of the last point served, so moves between
+    two fetches never shift the other points: only the moved point itself
+    is served again, when moved past the cursor, or missed, when moved
+    before it. Clients apply BUCKETPOINT_MOVED to place it either way.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = ("rank", "id")
+
+
+class BucketPointFeedView(APIView):
+    """Keyset-paginated bucket list, optionally filtered with ?completed=."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        bucket_points = BucketPointService.get_queryset(
+            completed=_parse_completed(request.query_params.get("completed"))
+        )
+        paginator = BucketPointCursorPagination()
+        page = paginator.paginate_queryset(bucket_points, request)
+        serializer = BucketPointSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
+class BucketPointSummaryView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, _):
+        return Response(BucketPointService.get_summary())
+
+
+def _parse_completed(value: Optional[str]) -> Optional[bool]:
+    if value is None:
+        return None
+    if value.lower() in ("true", "1"):
+        return True
+    if value.lower() in ("false", "0"):
+        return False
+    raise ValidationError({"completed": "Valeur attendue : true ou false"})
@@ -0,0 +1,39 @@
+from core.services import ResponseCacheService
+from django.utils.http import parse_etags, quote_etag
+from rest_framework.response import Response
+from rest_framework import status
+from typing import Callable, Optional
+
+
+def cached_list_response(
+    request, collection: str, build: Callable, wrap: Optional[Callable] = None
+) -> Response:
+    """
+    List of `collection` with an ETag, or 304 when the client already has it.
+
+    The ETag is the collection version, so answering If-None-Match costs one
+    cache read and runs neither queries nor serializers. `wrap` shapes the
+    list into the response body.
+    """
+    version, data = ResponseCacheService.lookup(collection)
+    etag = None if version is None else quote_etag(f"{collection}-{version}")
+
+    if etag is not None and _matches(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        if data is None:
+            data = build()
+            ResponseCacheService.store(collection, version, data)
+        response = Response(wrap(data) if wrap else data)
+
+    if etag is not None:
+        response["ETag"] = etag
+        # Authenticated data: the browser keeps it but revalidates every time
+        response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _matches(request, etag: str) -> bool:
+    # Weak comparison, as proxies compressing the body weaken the ETag
+    candidates = parse_etags(request.headers.get("If-None-Match", ""))
+    return "*" in candidates or etag in (c.removeprefix("W/") for c in candidates)
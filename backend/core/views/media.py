@@ -0,0 +1,21 @@
+from core.interface.local import BLOB_PATH_PATTERN, LOCAL_MEDIA_ACCEL_PREFIX
+from django.http import HttpResponse
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import NotFound
+import mimetypes
+
+
+class MediaView(APIView):
+    """Authorise a local-storage blob and let nginx send it (X-Accel-Redirect)."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, path):
+        if not BLOB_PATH_PATTERN.match(path):
+            raise NotFound("Fichier introuvable")
+
+        content_type, _ = mimetypes.guess_type(path)
+        response = HttpResponse(content_type=content_type or "application/octet-stream")
+        response["X-Accel-Redirect"] = f"{LOCAL_MEDIA_ACCEL_PREFIX}{path}"
+        return response
@@ -5,7 +5,8 @@ from rest_framework import status
 from ..serializers import MessageSerializer
 import os
 from dotenv import load_dotenv, find_dotenv
-from core.services import MessageService
+from core.services import MessageService, ResponseCacheService
+from core.views.conditional import cached_list_response
 
 load_dotenv(find_dotenv())
 
@@ -15,10 +16,12 @@ DEBUG = os.getenv("DEBUG", "False").lower() in ("true", "1", "t")
 class MessageView(APIView):
     permission_classes = [IsAuthenticated]
 
-    def get(self, _):
-        messages = MessageService.getAll()
-        serializer = MessageSerializer(messages, many=True)
-        return Response(serializer.data)
+    def get(self, request):
+        return cached_list_response(
+            request,
+            ResponseCacheService.MESSAGES,
+            lambda: MessageSerializer(MessageService.getAll(), many=True).data,
+        )
 
     def post(self, request):
 
@@ -32,7 +35,7 @@ class MessageView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import PageNumberPagination, CursorPagination
 
 
 class MessagePagination(PageNumberPagination):
@@ -50,3 +53,21 @@ class PaginatedMessageView(APIView):
         paginated_messages = paginator.paginate_queryset(messages, request)
         serializer = MessageSerializer(paginated_messages, many=True)
         return paginator.get_paginated_response(serializer.data)
+
+
+class MessageCursorPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
+
+
+class MessageFeedView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        messages = MessageService.getAll()
+        paginator = MessageCursorPagination()
+        paginated_messages = paginator.paginate_queryset(messages, request)
+        serializer = MessageSerializer(paginated_messages, many=True)
+        return paginator.get_paginated_response(serializer.data)
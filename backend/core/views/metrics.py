@@ -0,0 +1,13 @@
+from core.interface.redis_pool import pool_metrics
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
+
+
+class RedisPoolMetricsView(APIView):
+    """Utilisation of this worker's Redis pools, to size REDIS_MAX_CONNECTIONS."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(pool_metrics())
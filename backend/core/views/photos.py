@@ -1,4 +1,6 @@
-from core.services import PhotoService
+from core.services import PhotoService, ResponseCacheService, StoredObjectService
+from core.views.conditional import cached_list_response
+from core.interface.upload_handler import StreamingPhotoUploadHandler
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
@@ -7,19 +9,77 @@ from rest_framework import status
 
 class PhotoView(APIView):
     permission_classes = [IsAuthenticated]
+    upload_handler = None
 
-    def get(self, _, album_id):
-        photos = PhotoService.get_photos_by_album_id(album_id)
-        return Response(
-            {"photos": photos, "album_id": album_id},
-            status=status.HTTP_200_OK,
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # Once the request is allowed and its album exists, and before the
+        # multipart body is parsed: nothing is streamed to storage otherwise
+        if request.method == "POST":
+            PhotoService.get_album(kwargs.get("album_id"))
+            self.upload_handler = StreamingPhotoUploadHandler(
+                request._request, kwargs.get("album_id")
+            )
+            request._request.upload_handlers = [self.upload_handler]
+
+    def get(self, request, album_id):
+        return cached_list_response(
+            request,
+            ResponseCacheService.photos(album_id),
+            lambda: PhotoService.get_photos_by_album_id(album_id),
+            wrap=lambda photos: {"photos": photos, "album_id": album_id},
         )
 
     def post(self, request, album_id):
+        try:
+            return self._save(request, album_id)
+        except Exception:
+            if self.upload_handler is not None:
+                StoredObjectService.discard_unregistered(
+                    self.upload_handler.stored_urls
+                )
+            raise
+
+    def _save(self, request, album_id):
+        if "images" in request.FILES:
+            results = PhotoService.save_photos(album_id, request)
+            failed = any("error" in result for result in results)
+            return Response(
+                {"results": results, "album_id": album_id},
+                status=(
+                    status.HTTP_207_MULTI_STATUS if failed else status.HTTP_201_CREATED
+                ),
+            )
+
         photo_data = PhotoService.save_photo(album_id, request)
         return Response({"photo": photo_data}, status=status.HTTP_201_CREATED)
 
 
+class PhotoUploadView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, album_id):
+        uploads = PhotoService.create_uploads(album_id, request.data.get("files"))
+        return Response(
+            {"uploads": uploads, "album_id": album_id},
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class PhotoUploadFinalizeView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, album_id):
+        results = PhotoService.finalize_uploads(album_id, request.data.get("uploads"))
+        failed = any("error" in result for result in results)
+        return Response(
+            {"results": results, "album_id": album_id},
+            status=(
+                status.HTTP_207_MULTI_STATUS if failed else status.HTTP_201_CREATED
+            ),
+        )
+
+
 class PhotoDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -32,3 +92,15 @@ class PhotoDetailView(APIView):
             photo_id=photo_id, album_id=album_id, data=request.data
         )
         return Response({"photo": photo_data}, status=status.HTTP_200_OK)
+
+
+class PhotoMoveView(APIView):
+    """Place a photo right after another one of its album (`after`), or first."""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, album_id, photo_id):
+        data = PhotoService.move_photo(
+            photo_id=photo_id, album_id=album_id, after=request.data.get("after")
+        )
+        return Response(data, status=status.HTTP_200_OK)
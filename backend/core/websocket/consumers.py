@@ -8,11 +8,25 @@ from django.contrib.auth.models import AnonymousUser, User
 from django.conf import settings
 from urllib.parse import parse_qs
 from core.websocket.messages import WebSocketMessageType
-import os
-from dotenv import load_dotenv, find_dotenv
-from redis.asyncio import Redis
+from core.websocket.utils import (
+    BROADCAST_GROUP,
+    batch_frame,
+    build_event,
+    encode_json,
+    group_add_many,
+    group_discard_many,
+)
+from core.websocket.user_cache import user_cache
+from core.websocket.presence import (
+    queue_connection_added,
+    queue_connection_refreshed,
+    queue_connection_removed,
+)
+from core.interface.redis_pool import get_async_redis_client
 from typing import Optional
 from datetime import datetime
+import os
+from dotenv import load_dotenv, find_dotenv
 
 load_dotenv(find_dotenv())
 
@@ -20,23 +34,24 @@ load_dotenv(find_dotenv())
 logger = logging.getLogger("websocket")
 logger.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
 
-REDIS_URL = "redis://" + os.getenv("REDIS_HOST", "localhost")
-
 # Configuration constants
 HEARTBEAT_INTERVAL = 30  # seconds
 HEARTBEAT_TIMEOUT = 10  # seconds to wait for pong response
 MAX_MESSAGE_SIZE = 65536  # 64KB max message size
 CONNECTION_TIMEOUT = 10  # seconds
+# Events arriving within this window are sent to the client as one frame
+WS_COALESCE_WINDOW = float(os.getenv("WS_COALESCE_WINDOW_MS", 5)) / 1000
+# Events buffered for a client that cannot keep up before it is disconnected
+WS_OUTBOX_LIMIT = int(os.getenv("WS_OUTBOX_LIMIT", 1000))
+# Unsent bytes in the server's socket buffer past which events are held back
+WS_SEND_BACKLOG_LIMIT = int(os.getenv("WS_SEND_BACKLOG_BYTES", 256 * 1024))
+# Seconds between checks of the socket buffer of a client not reading
+WS_BACKLOG_RETRY_INTERVAL = 0.05
+# Close code telling the client to reconnect and reload its state
+CLOSE_CODE_TOO_SLOW = 4008
 
-_async_redis_client: Optional[Redis] = None
-
-
-async def get_async_redis_client() -> Redis:
-    """Get async Redis client lazily to avoid connection issues during import."""
-    global _async_redis_client
-    if _async_redis_client is None:
-        _async_redis_client = Redis.from_url(REDIS_URL, decode_responses=True)
-    return _async_redis_client
+# In-flight token lookups, shared by the sockets reconnecting with one token
+_pending_user_loads: dict = {}
 
 
 class WebSocketManager(AsyncWebsocketConsumer):
@@ -57,6 +72,8 @@ class WebSocketManager(AsyncWebsocketConsumer):
         self.user_group_name: Optional[str] = None
         self.last_pong: Optional[datetime] = None
         self.is_closing = False
+        self.outbox: list = []
+        self.flush_task: Optional[asyncio.Task] = None
 
     async def connect(self):
         """Handle WebSocket connection with authentication."""
@@ -74,14 +91,16 @@ class WebSocketManager(AsyncWebsocketConsumer):
 
             self.user_group_name = f"user_{user.id}"
 
-            # Add to user's personal group
-            await self.channel_layer.group_add(self.user_group_name, self.channel_name)
-
-            # Add to broadcast group for global events
-            await self.channel_layer.group_add("broadcast", self.channel_name)
-
-            # Mark user online in Redis
-            await self.mark_user_online(user.id)
+            # Join the user's personal group and the broadcast group, and mark
+            # this connection online: both pipelines run concurrently
+            _, first_connection = await asyncio.gather(
+                group_add_many(
+                    self.channel_layer,
+                    [self.user_group_name, BROADCAST_GROUP],
+                    self.channel_name,
+                ),
+                self.mark_user_online(user.id),
+            )
 
             # Accept the connection
             await self.accept()
@@ -99,8 +118,9 @@ class WebSocketManager(AsyncWebsocketConsumer):
             # Start heartbeat task
             self.heartbeat_task = asyncio.create_task(self.heartbeat_loop())
 
-            # Broadcast presence to other users
-            await self.broadcast_presence(user, connected=True)
+            # Other tabs of the user already announced it
+            if first_connection:
+                await self.broadcast_presence(user, connected=True)
 
         except Exception as e:
             logger.error(f"Error during connection: {e}", exc_info=True)
@@ -111,6 +131,11 @@ class WebSocketManager(AsyncWebsocketConsumer):
         self.is_closing = True
         user = self.scope.get("user")
 
+        # Drop events the client will never receive
+        self.outbox.clear()
+        if self.flush_task and not self.flush_task.done():
+            self.flush_task.cancel()
+
         # Cancel heartbeat task
         if self.heartbeat_task and not self.heartbeat_task.done():
             self.heartbeat_task.cancel()
@@ -132,25 +157,24 @@ class WebSocketManager(AsyncWebsocketConsumer):
             },
         )
 
-        # Mark user offline
-        await self.mark_user_offline(user.id)
+        # Mark this connection offline while leaving the groups
+        last_connection, _ = await asyncio.gather(
+            self.mark_user_offline(user.id), self.leave_groups()
+        )
 
-        # Remove from groups
-        if self.user_group_name:
-            try:
-                await self.channel_layer.group_discard(
-                    self.user_group_name, self.channel_name
-                )
-            except Exception as e:
-                logger.error(f"Error removing from user group: {e}")
+        # Broadcast disconnect to other users once no tab is left
+        if last_connection:
+            await self.broadcast_presence(user, connected=False)
 
+    async def leave_groups(self):
+        """Remove this connection from the user group and the broadcast group."""
+        groups = [BROADCAST_GROUP]
+        if self.user_group_name:
+            groups.insert(0, self.user_group_name)
         try:
-            await self.channel_layer.group_discard("broadcast", self.channel_name)
+            await group_discard_many(self.channel_layer, groups, self.channel_name)
         except Exception as e:
-            logger.error(f"Error removing from broadcast group: {e}")
-
-        # Broadcast disconnect to other users
-        await self.broadcast_presence(user, connected=False)
+            logger.error(f"Error removing from groups: {e}")
 
     async def heartbeat_loop(self):
         """Send periodic pings to detect dead connections."""
@@ -181,28 +205,51 @@ class WebSocketManager(AsyncWebsocketConsumer):
                     logger.warning(f"Failed to send heartbeat ping: {e}")
                     break
 
+                await self.refresh_user_presence(self.scope["user"].id)
+
         except asyncio.CancelledError:
             logger.debug("Heartbeat loop cancelled")
         except Exception as e:
             logger.error(f"Heartbeat loop error: {e}", exc_info=True)
 
-    @database_sync_to_async
-    def get_user(self) -> User:
-        """Extract and validate JWT token from query string."""
-        try:
-            query_string = self.scope["query_string"].decode()
+    async def get_user(self) -> User:
+        """
+        Extract and validate JWT token from query string.
 
-            if "accessToken" not in query_string:
-                logger.debug("No access token in query string")
-                return AnonymousUser()
+        Tokens seen recently are resolved from the in-process cache without
+        leaving the event loop; only misses go through the database pool,
+        once per token however many sockets connect with it at the same time.
+        """
+        query_string = self.scope["query_string"].decode()
 
-            parsed = parse_qs(query_string)
-            token = parsed.get("accessToken", [None])[0]
+        if "accessToken" not in query_string:
+            logger.debug("No access token in query string")
+            return AnonymousUser()
 
-            if not token:
-                logger.debug("Empty access token")
-                return AnonymousUser()
+        parsed = parse_qs(query_string)
+        token = parsed.get("accessToken", [None])[0]
 
+        if not token:
+            logger.debug("Empty access token")
+            return AnonymousUser()
+
+        user = user_cache.get(token)
+        if user is not None:
+            return user
+
+        key = (asyncio.get_running_loop(), token)
+        load = _pending_user_loads.get(key)
+        if load is None:
+            load = asyncio.ensure_future(self.load_user(token))
+            _pending_user_loads[key] = load
+            load.add_done_callback(lambda _: _pending_user_loads.pop(key, None))
+        # A socket closing mid-connect must not cancel the lookup of the others
+        return await asyncio.shield(load)
+
+    @database_sync_to_async
+    def load_user(self, token: str) -> User:
+        """Decode `token`, read its user from the database and cache it."""
+        try:
             # Decode and validate JWT
             decoded_data = jwt_decode(token, settings.SECRET_KEY, algorithms=["HS256"])
 
@@ -212,6 +259,7 @@ class WebSocketManager(AsyncWebsocketConsumer):
                 return AnonymousUser()
 
             user = User.objects.get(id=user_id)
+            user_cache.put(token, user, decoded_data.get("exp"))
             return user
 
         except ExpiredSignatureError:
@@ -280,18 +328,89 @@ class WebSocketManager(AsyncWebsocketConsumer):
             )
 
     async def send_message(self, event):
-        """Handler for channel layer messages - sends to WebSocket client."""
+        """Handler for channel layer messages - queues the event for the client."""
+        frame = event.get("frame")
+        if frame is not None:
+            # Encoded once by the publisher: forwarded verbatim
+            await self.queue_frame(frame)
+            return
+
         try:
-            payload = event.get("payload", {})
-            await self.send(text_data=json.dumps(payload))
+            frame = encode_json(event.get("payload", {}))
         except Exception as e:
             logger.error(
-                f"Error sending message to client: {e}",
+                f"Error encoding message for client: {e}",
                 extra={
                     "user_id": getattr(self.scope.get("user"), "id", "unknown"),
                     "event_type": event.get("payload", {}).get("type"),
                 },
             )
+            return
+        await self.queue_frame(frame)
+
+    async def queue_frame(self, frame: str):
+        """
+        Buffer an encoded event and flush the buffer after the coalescing
+        window, so that bursts reach the client as a single frame.
+
+        Events stay in the buffer while the client has not read what was
+        already sent, so a client whose buffer reaches WS_OUTBOX_LIMIT is
+        too slow to keep up: it is disconnected with CLOSE_CODE_TOO_SLOW
+        rather than letting the buffer grow, and reloads its state when it
+        reconnects.
+        """
+        if self.is_closing:
+            return
+
+        if len(self.outbox) >= WS_OUTBOX_LIMIT:
+            logger.warning(
+                "Outbound buffer full, closing slow connection",
+                extra={
+                    "user_id": getattr(self.scope.get("user"), "id", "unknown"),
+                    "buffered": len(self.outbox),
+                },
+            )
+            self.is_closing = True
+            self.outbox.clear()
+            await self.close(code=CLOSE_CODE_TOO_SLOW)
+            return
+
+        self.outbox.append(frame)
+        if self.flush_task is None:
+            self.flush_task = asyncio.create_task(self.flush_outbox())
+
+    async def flush_outbox(self):
+        """
+        Send everything buffered once the coalescing window has passed and
+        the client has read the previous frames.
+
+        Servers that apply backpressure make send() wait; others, such as
+        Daphne, accept every frame at once, so the bytes the server still
+        holds for the socket are checked before each send.
+        """
+        try:
+            await asyncio.sleep(WS_COALESCE_WINDOW)
+            while self.outbox and not self.is_closing:
+                if (self.send_backlog() or 0) > WS_SEND_BACKLOG_LIMIT:
+                    await asyncio.sleep(WS_BACKLOG_RETRY_INTERVAL)
+                    continue
+                frames, self.outbox = self.outbox, []
+                await self.send(text_data=batch_frame(frames))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(
+                f"Error sending message to client: {e}",
+                extra={"user_id": getattr(self.scope.get("user"), "id", "unknown")},
+            )
+        finally:
+            self.flush_task = None
+
+    def send_backlog(self) -> Optional[int]:
+        """Bytes the server still holds for this socket, None when unknown."""
+        # Set by SendBacklogMiddleware, see backend/asgi.py
+        backlog = getattr(self, "scope", {}).get("send_backlog")
+        return backlog() if backlog is not None else None
 
     async def broadcast_presence(self, user: User, connected: bool):
         """Broadcast user presence status to all connected clients."""
@@ -303,37 +422,60 @@ class WebSocketManager(AsyncWebsocketConsumer):
             )
 
             await self.channel_layer.group_send(
-                "broadcast",
-                {
-                    "type": "send.message",
-                    "payload": {
-                        "type": message_type.value,
-                        "data": {
-                            "user_id": user.id,
-                            "name": user.get_full_name() or user.username,
-                        },
+                BROADCAST_GROUP,
+                build_event(
+                    message_type,
+                    {
+                        "user_id": user.id,
+                        "name": user.get_full_name() or user.username,
                     },
-                },
+                ),
             )
         except Exception as e:
             logger.error(f"Error broadcasting presence: {e}")
 
-    async def mark_user_online(self, user_id: int):
-        """Mark user as online in Redis."""
+    async def mark_user_online(self, user_id: int) -> bool:
+        """
+        Register this connection in the user's presence set.
+
+        Returns whether it is the user's only live connection, i.e. whether
+        the user just came online.
+        """
         try:
             redis_client = await get_async_redis_client()
-            await redis_client.sadd("online_users", str(user_id))
-            # Set expiry on the user's presence (auto-cleanup if server crashes)
-            await redis_client.expire("online_users", 3600)  # 1 hour TTL
+            pipe = redis_client.pipeline(transaction=True)
+            queue_connection_added(pipe, user_id, self.channel_name)
+            live_connections = (await pipe.execute())[-1]
             logger.debug(f"User {user_id} marked online")
+            return live_connections == 1
         except Exception as e:
             logger.error(f"Redis error (mark_user_online): {e}")
+            return True
+
+    async def refresh_user_presence(self, user_id: int):
+        """Keep this connection online for another presence TTL."""
+        try:
+            redis_client = await get_async_redis_client()
+            pipe = redis_client.pipeline(transaction=True)
+            queue_connection_refreshed(pipe, user_id, self.channel_name)
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Redis error (refresh_user_presence): {e}")
+
+    async def mark_user_offline(self, user_id: int) -> bool:
+        """
+        Remove this connection from the user's presence set.
 
-    async def mark_user_offline(self, user_id: int):
-        """Mark user as offline in Redis."""
+        Returns whether no live connection is left, i.e. whether the user
+        just went offline.
+        """
         try:
             redis_client = await get_async_redis_client()
-            await redis_client.srem("online_users", str(user_id))
+            pipe = redis_client.pipeline(transaction=True)
+            queue_connection_removed(pipe, user_id, self.channel_name)
+            live_connections = (await pipe.execute())[-1]
             logger.debug(f"User {user_id} marked offline")
+            return live_connections == 0
         except Exception as e:
             logger.error(f"Redis error (mark_user_offline): {e}")
+            return True
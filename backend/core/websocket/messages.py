@@ -21,11 +21,15 @@ class WebSocketMessageType(str, Enum):
     BUCKETPOINT_CREATED = "BUCKETPOINT_CREATED"
     BUCKETPOINT_DELETED = "BUCKETPOINT_DELETED"
     BUCKETPOINT_UPDATED = "BUCKETPOINT_UPDATED"
+    BUCKETPOINT_BATCH_CHANGED = "BUCKETPOINT_BATCH_CHANGED"
+    BUCKETPOINT_MOVED = "BUCKETPOINT_MOVED"
 
     # Photo events
     PHOTO_UPLOADED = "PHOTO_UPLOADED"
+    PHOTO_BATCH_UPLOADED = "PHOTO_BATCH_UPLOADED"
     PHOTO_DELETED = "PHOTO_DELETED"
     PHOTO_UPDATED = "PHOTO_UPDATED"
+    PHOTO_MOVED = "PHOTO_MOVED"
 
     # Album events
     ALBUM_CREATED = "ALBUM_CREATED"
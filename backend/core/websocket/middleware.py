@@ -0,0 +1,20 @@
+from channels.middleware import BaseMiddleware
+from core.websocket.utils import server_transport, transport_backlog
+from functools import partial
+
+
+class SendBacklogMiddleware(BaseMiddleware):
+    """
+    Let consumers read how far their client is behind.
+
+    Installed outside every channels middleware, while `send` is still the
+    server's own: `scope["send_backlog"]` is then a callable returning the
+    bytes the server holds for the socket, or None when it cannot tell.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "websocket":
+            scope = dict(
+                scope, send_backlog=partial(transport_backlog, server_transport(send))
+            )
+        return await self.inner(scope, receive, send)
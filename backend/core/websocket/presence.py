@@ -0,0 +1,55 @@
+"""
+User presence stored as one sorted set per user.
+
+Each open socket is a member of `presence:<user_id>` scored with the time
+its presence expires. Connects and heartbeats push that time forward, and
+members whose time has passed, left behind by a crashed worker, no longer
+count. A user is online while at least one member is live, so several
+tabs keep the user online until the last one closes.
+
+The queue_* helpers put every command of an update on one pipeline, sync
+or async, so that each update costs a single round trip.
+"""
+
+import os
+import time
+from dotenv import load_dotenv, find_dotenv
+
+load_dotenv(find_dotenv())
+
+# Seconds a connection stays online without a heartbeat
+PRESENCE_TTL = int(os.getenv("PRESENCE_TTL", 90))
+
+
+def presence_key(user_id) -> str:
+    return f"presence:{user_id}"
+
+
+def queue_connection_added(pipe, user_id, channel_name: str):
+    """Add a connection; the last reply is the number of live connections."""
+    now = time.time()
+    key = presence_key(user_id)
+    pipe.zadd(key, {channel_name: now + PRESENCE_TTL})
+    pipe.zremrangebyscore(key, "-inf", now)
+    pipe.expire(key, PRESENCE_TTL)
+    pipe.zcard(key)
+
+
+def queue_connection_refreshed(pipe, user_id, channel_name: str):
+    """Push back the expiry of an open connection."""
+    key = presence_key(user_id)
+    pipe.zadd(key, {channel_name: time.time() + PRESENCE_TTL})
+    pipe.expire(key, PRESENCE_TTL)
+
+
+def queue_connection_removed(pipe, user_id, channel_name: str):
+    """Remove a connection; the last reply is the number of live connections."""
+    key = presence_key(user_id)
+    pipe.zrem(key, channel_name)
+    pipe.zremrangebyscore(key, "-inf", time.time())
+    pipe.zcard(key)
+
+
+def count_live_connections(client, user_id):
+    """Number of live connections of a user, in one O(log n) command."""
+    return client.zcount(presence_key(user_id), time.time(), "+inf")
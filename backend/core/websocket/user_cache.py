@@ -0,0 +1,99 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from collections import OrderedDict
+from typing import Optional
+import os
+import threading
+import time
+from dotenv import load_dotenv, find_dotenv
+
+load_dotenv(find_dotenv())
+
+# Seconds a resolved token is trusted without reading the user again
+WS_USER_CACHE_TTL = float(os.getenv("WS_USER_CACHE_TTL", 60))
+WS_USER_CACHE_SIZE = int(os.getenv("WS_USER_CACHE_SIZE", 1024))
+
+SNAPSHOT_FIELDS = (
+    "id",
+    "username",
+    "first_name",
+    "last_name",
+    "email",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+)
+
+
+class UserSnapshotCache:
+    """
+    Bounded, short-lived map of validated access tokens to user snapshots.
+
+    Entries expire after `ttl` seconds or with the token, whichever comes
+    first, and the least recently used entry is evicted when full. Hits
+    return a fresh unsaved User built from the snapshot, so no database
+    access is needed. Saving or deleting a user drops its entries; other
+    processes see the change once their entries expire.
+    """
+
+    def __init__(
+        self, ttl: float = WS_USER_CACHE_TTL, max_size: int = WS_USER_CACHE_SIZE
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[User]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at <= time.monotonic():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+        return User(**snapshot)
+
+    def put(self, token: str, user: User, token_expiry: Optional[float] = None):
+        """Cache `user` for `token`; `token_expiry` is the JWT `exp` timestamp."""
+        lifetime = self.ttl
+        if token_expiry is not None:
+            lifetime = min(lifetime, token_expiry - time.time())
+        if lifetime <= 0 or self.max_size <= 0:
+            return
+
+        snapshot = {field: getattr(user, field) for field in SNAPSHOT_FIELDS}
+        with self._lock:
+            self._entries[token] = (time.monotonic() + lifetime, snapshot)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            stale = [
+                token
+                for token, (_, snapshot) in self._entries.items()
+                if snapshot["id"] == user_id
+            ]
+            for token in stale:
+                del self._entries[token]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+user_cache = UserSnapshotCache()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def _invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate_user(instance.pk)
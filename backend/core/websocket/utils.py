@@ -1,7 +1,93 @@
 from channels.layers import get_channel_layer
+from channels_redis.core import RedisChannelLayer
 from asgiref.sync import async_to_sync
-from typing import Union
+from collections import defaultdict
+from typing import Optional, Union
 from enum import Enum
+import asyncio
+import json
+import time
+
+BROADCAST_GROUP = "broadcast"
+# Frame type wrapping several events sent to a client at once
+BATCH_MESSAGE_TYPE = "BATCH"
+
+
+def encode_json(payload) -> str:
+    """Compact JSON text of `payload`."""
+    return json.dumps(payload, separators=(",", ":"), default=str)
+
+
+def server_transport(send):
+    """
+    Transport of the connection the ASGI server's `send` replies to.
+
+    Must be given the `send` the server itself passed to the application,
+    from the task running it: channels middleware wrap `send` and hide it.
+    Daphne binds `send` to its Server, whose connection table maps every
+    Twisted protocol to the task running its application; asyncio servers
+    such as uvicorn pass a method of the connection protocol. Returns None
+    for any other server.
+    """
+    owner = getattr(send, "__self__", None)
+    if hasattr(owner, "transport"):
+        return owner.transport
+
+    server = getattr(getattr(send, "func", None), "__self__", None)
+    connections = getattr(server, "connections", None)
+    if not connections:
+        return None
+    task = asyncio.current_task()
+    for protocol, details in connections.items():
+        if details.get("application_instance") is task:
+            return getattr(protocol, "transport", None)
+    return None
+
+
+def transport_backlog(transport) -> Optional[int]:
+    """
+    Bytes written to `transport` but not yet sent to the client.
+
+    Twisted transports, used by Daphne, buffer them in dataBuffer; asyncio
+    transports report them through get_write_buffer_size(). Returns None
+    for an unknown transport.
+    """
+    if hasattr(transport, "get_write_buffer_size"):
+        return transport.get_write_buffer_size()
+    if hasattr(transport, "dataBuffer"):
+        # twisted.internet.abstract.FileDescriptor
+        return (
+            len(transport.dataBuffer)
+            - transport.offset
+            + getattr(transport, "_tempDataLen", 0)
+        )
+    return None
+
+
+def batch_frame(frames: list) -> str:
+    """
+    Join already encoded events into one frame without decoding them.
+
+    A single event is sent as is; several become
+    `{"type": "BATCH", "data": [event, ...]}`.
+    """
+    if len(frames) == 1:
+        return frames[0]
+    return f'{{"type":"{BATCH_MESSAGE_TYPE}","data":[{",".join(frames)}]}}'
+
+
+def build_event(event_type: Union[str, Enum], data: dict) -> dict:
+    """
+    Channel layer message carrying the client frame already encoded.
+
+    The payload is serialised once here; the layer and every consumer then
+    pass the same text along, whatever the number of recipients.
+    """
+    event = event_type.name if isinstance(event_type, Enum) else str(event_type)
+    return {
+        "type": "send.message",
+        "frame": encode_json({"type": event, "data": data}),
+    }
 
 
 def send_ws_message_to_user(user_id: int, event_type: Union[str, Enum], data: dict):
@@ -10,20 +96,73 @@ def send_ws_message_to_user(user_id: int, event_type: Union[str, Enum], data: di
         return
 
     async_send = async_to_sync(channel_layer.group_send)
-    event = event_type.name if isinstance(event_type, Enum) else str(event_type)
+    async_send(f"user_{user_id}", build_event(event_type, data))
 
-    async_send(
-        f"user_{user_id}",
-        {
-            "type": "send.message",
-            "payload": {
-                "type": event,
-                "data": data,
-            },
-        },
-    )
+
+def send_ws_broadcast(event_type: Union[str, Enum], data: dict):
+    """Publish an event once to the group every connected socket joins."""
+    channel_layer = get_channel_layer()
+    if not channel_layer:
+        return
+
+    async_send = async_to_sync(channel_layer.group_send)
+    async_send(BROADCAST_GROUP, build_event(event_type, data))
 
 
 def broadcast_ws_message(user_ids: list[int], event_type: Union[str, Enum], data: dict):
+    channel_layer = get_channel_layer()
+    if not channel_layer:
+        return
+
+    message = build_event(event_type, data)
+    async_send = async_to_sync(channel_layer.group_send)
     for uid in user_ids:
-        send_ws_message_to_user(uid, event_type, data)
+        async_send(f"user_{uid}", message)
+
+
+async def group_add_many(channel_layer, groups: list, channel: str):
+    """
+    Add `channel` to every group in one round trip per Redis shard.
+
+    RedisChannelLayer.group_add costs two sequential round trips per group;
+    the same ZADD and EXPIRE are pipelined here. Other layers fall back to
+    concurrent group_add calls.
+    """
+    if not isinstance(channel_layer, RedisChannelLayer):
+        await asyncio.gather(*(channel_layer.group_add(g, channel) for g in groups))
+        return
+
+    now = time.time()
+
+    def queue(pipe, group_key):
+        pipe.zadd(group_key, {channel: now})
+        pipe.expire(group_key, channel_layer.group_expiry)
+
+    await _pipeline_by_shard(channel_layer, groups, channel, queue)
+
+
+async def group_discard_many(channel_layer, groups: list, channel: str):
+    """Remove `channel` from every group in one round trip per Redis shard."""
+    if not isinstance(channel_layer, RedisChannelLayer):
+        await asyncio.gather(*(channel_layer.group_discard(g, channel) for g in groups))
+        return
+
+    await _pipeline_by_shard(
+        channel_layer, groups, channel, lambda pipe, key: pipe.zrem(key, channel)
+    )
+
+
+async def _pipeline_by_shard(channel_layer, groups: list, channel: str, queue):
+    assert channel_layer.require_valid_channel_name(channel), "Channel name not valid"
+    shards = defaultdict(list)
+    for group in groups:
+        assert channel_layer.require_valid_group_name(group), "Group name not valid"
+        shards[channel_layer.consistent_hash(group)].append(group)
+
+    async def execute(index, shard_groups):
+        pipe = channel_layer.connection(index).pipeline(transaction=False)
+        for group in shard_groups:
+            queue(pipe, channel_layer._group_key(group))
+        await pipe.execute()
+
+    await asyncio.gather(*(execute(i, g) for i, g in shards.items()))
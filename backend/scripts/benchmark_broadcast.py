@@ -0,0 +1,99 @@
+"""
+Measure how the cost of a service broadcast grows with the number of users.
+
+Compares the former per-user fan-out (one DB query for every user id, then
+one group_send per user) with the single publish to the broadcast group.
+
+The in-memory channel layer has no network hop, so every publish can be
+charged an artificial round trip with --publish-latency-ms to model Redis.
+
+Usage (from the repository root):
+    PYTHONPATH=backend python backend/scripts/benchmark_broadcast.py
+    PYTHONPATH=backend python backend/scripts/benchmark_broadcast.py \
+        --users 1 10 100 1000 --publish-latency-ms 0.5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings_test")
+os.environ.setdefault("USE_LOCAL_DB", "True")
+
+import django
+
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from channels.layers import get_channel_layer
+
+from core.websocket.messages import WebSocketMessageType
+from core.websocket.utils import send_ws_broadcast, send_ws_message_to_user
+
+EVENT = WebSocketMessageType.BUCKETPOINT_UPDATED
+DATA = {"data": {"id": 1, "title": "Benchmark", "completed": True}}
+
+
+def legacy_fan_out():
+    for uid in User.objects.all().values_list("id", flat=True):
+        send_ws_message_to_user(uid, EVENT, DATA)
+
+
+def single_publish():
+    send_ws_broadcast(EVENT, DATA)
+
+
+def add_publish_latency(latency_ms: float):
+    if latency_ms <= 0:
+        return
+    channel_layer = get_channel_layer()
+    group_send = channel_layer.group_send
+
+    async def delayed_group_send(group, message):
+        await asyncio.sleep(latency_ms / 1000)
+        await group_send(group, message)
+
+    channel_layer.group_send = delayed_group_send
+
+
+def ensure_users(count: int):
+    existing = User.objects.count()
+    User.objects.bulk_create(
+        User(username=f"bench_user_{i}") for i in range(existing, count)
+    )
+
+
+def time_call(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--publish-latency-ms", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    call_command("migrate", verbosity=0)
+    add_publish_latency(args.publish_latency_ms)
+
+    print(f"{'users':>8} {'per-user (ms)':>15} {'broadcast (ms)':>15} {'ratio':>8}")
+    for count in sorted(args.users):
+        ensure_users(count)
+        legacy = time_call(legacy_fan_out, args.repeat)
+        single = time_call(single_publish, args.repeat)
+        ratio = legacy / single if single else float("inf")
+        print(f"{count:>8} {legacy:>15.2f} {single:>15.2f} {ratio:>7.1f}x")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Measure upload and delete latency of AwsPhotoSaver against a local S3 stub.
+
+Compares building a new boto3 client for every call (the former behaviour)
+with the shared client held by AwsPhotoSaver. The stub is an in-process
+HTTP server answering PutObject and DeleteObject, so the numbers isolate
+client-side overhead from network and storage time.
+
+Usage (from the repository root):
+    PYTHONPATH=backend python backend/scripts/benchmark_s3_client.py
+    PYTHONPATH=backend python backend/scripts/benchmark_s3_client.py \
+        --operations 200 --size-kb 256
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubS3Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _empty_reply(self, status):
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.send_header("ETag", '"stub"')
+        self.end_headers()
+
+    def do_PUT(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._empty_reply(200)
+
+    def do_DELETE(self):
+        self._empty_reply(204)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubS3Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def configure_environment(endpoint_url: str):
+    os.environ["AWS_ENDPOINT_URL"] = endpoint_url
+    os.environ["AWS_BUCKET_NAME"] = "benchmark"
+    os.environ.setdefault("AWS_ACCESS_KEY", "benchmark")
+    os.environ.setdefault("AWS_ACCESS_SECRET", "benchmark")
+    os.environ["DEBUG"] = "False"
+
+
+def run(saver, operations: int, payload: bytes) -> list:
+    samples = []
+    # AwsPhotoSaver.delete prints every URL; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(operations):
+            file = io.BytesIO(payload)
+            file.name = f"photo_{i}.jpg"
+            start = time.perf_counter()
+            url = saver.save(file)
+            saver.delete(url)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--operations", type=int, default=50)
+    parser.add_argument("--size-kb", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    server = start_stub_server()
+    host, port = server.server_address
+    configure_environment(f"http://{host}:{port}")
+
+    from core.interface.aws import AwsPhotoSaver
+
+    class PerCallClientSaver(AwsPhotoSaver):
+        def _get_s3_client(self):
+            self._s3_client = None
+            return super()._get_s3_client()
+
+    payload = os.urandom(args.size_kb * 1024)
+    results = {
+        "client per call": run(PerCallClientSaver(), args.operations, payload),
+        "shared client": run(AwsPhotoSaver(), args.operations, payload),
+    }
+    server.shutdown()
+
+    print(f"{'mode':>16} {'median (ms)':>12} {'p95 (ms)':>10} {'total (s)':>10}")
+    for mode, samples in results.items():
+        p95 = statistics.quantiles(samples, n=20)[-1]
+        total = sum(samples) / 1000
+        print(
+            f"{mode:>16} {statistics.median(samples):>12.2f} {p95:>10.2f} {total:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
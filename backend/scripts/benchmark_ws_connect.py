@@ -0,0 +1,113 @@
+"""
+Measure how many WebSocket connects per second the token resolution allows.
+
+Simulates a reconnect storm: every user opens --sockets-per-user sockets
+at once with the same access token, and the consumer resolves each one.
+Compares the former per-socket resolution (JWT decode and user query on
+the database thread pool for every socket) with the token to user cache,
+starting empty as after a deploy and already filled as after a network
+blip.
+
+Usage (from the repository root):
+    PYTHONPATH=backend python backend/scripts/benchmark_ws_connect.py
+    PYTHONPATH=backend python backend/scripts/benchmark_ws_connect.py \
+        --users 50 --sockets-per-user 20 --repeat 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings_test")
+os.environ.setdefault("USE_LOCAL_DB", "True")
+
+import django
+
+django.setup()
+
+from django.conf import settings
+
+# Database calls run on the sync_to_async thread: an in-memory SQLite
+# database would be empty there, so use a throwaway file instead
+settings.DATABASES["default"]["NAME"] = os.path.join(
+    tempfile.mkdtemp(), "benchmark.sqlite3"
+)
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.websocket import consumers
+
+
+def ensure_tokens(count: int) -> list:
+    existing = User.objects.count()
+    User.objects.bulk_create(
+        User(username=f"bench_user_{i}") for i in range(existing, count)
+    )
+    return [str(AccessToken.for_user(user)) for user in User.objects.all()[:count]]
+
+
+async def connect_storm(tokens: list, sockets_per_user: int, per_socket: bool) -> int:
+    async def connect(token):
+        consumer = consumers.WebSocketManager()
+        consumer.scope = {"query_string": f"accessToken={token}".encode()}
+        if per_socket:
+            # Former resolution: decode and query on the database pool every time
+            user = await consumer.load_user(token)
+        else:
+            user = await consumer.get_user()
+        assert user.is_authenticated
+
+    await asyncio.gather(
+        *(connect(token) for token in tokens for _ in range(sockets_per_user))
+    )
+    return len(tokens) * sockets_per_user
+
+
+def connects_per_second(tokens, sockets_per_user, repeat, per_socket, warm) -> float:
+    cache = consumers.user_cache
+    rates = []
+    for _ in range(repeat):
+        cache.clear()
+        if warm:
+            asyncio.run(connect_storm(tokens, 1, per_socket))
+        start = time.perf_counter()
+        connects = asyncio.run(connect_storm(tokens, sockets_per_user, per_socket))
+        rates.append(connects / (time.perf_counter() - start))
+    return statistics.median(rates)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--sockets-per-user", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    call_command("migrate", verbosity=0)
+    tokens = ensure_tokens(args.users)
+
+    runs = {
+        "per socket": (True, False),
+        "cold cache": (False, False),
+        "warm cache": (False, True),
+    }
+    sockets = len(tokens) * args.sockets_per_user
+    print(f"{sockets} sockets, {len(tokens)} users")
+    print(f"{'resolution':>12} {'conn/s':>10} {'speedup':>8}")
+    baseline = None
+    for name, (per_socket, warm) in runs.items():
+        rate = connects_per_second(
+            tokens, args.sockets_per_user, args.repeat, per_socket, warm
+        )
+        baseline = baseline or rate
+        print(f"{name:>12} {rate:>10.0f} {rate / baseline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
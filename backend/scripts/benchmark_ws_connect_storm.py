@@ -0,0 +1,128 @@
+"""
+Measure the Redis cost of WebSocket connects and disconnects in a storm.
+
+Runs the Redis part of --sockets concurrent connects followed by their
+disconnects against a real Redis, first with the former sequential calls
+(two group_add, SADD and EXPIRE, then SREM and two group_discard) and then
+with the pipelined membership and presence updates of the consumer.
+
+Requires a Redis server reachable at REDIS_HOST (default localhost:6379);
+the keys it writes are removed afterwards.
+
+Usage (from the repository root):
+    docker run -d -p 6379:6379 redis:7
+    PYTHONPATH=backend python backend/scripts/benchmark_ws_connect_storm.py
+    PYTHONPATH=backend python backend/scripts/benchmark_ws_connect_storm.py \
+        --sockets 100 1000 5000 --repeat 3
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings_test")
+os.environ.setdefault("USE_LOCAL_DB", "True")
+
+import django
+
+django.setup()
+
+from channels_redis.core import RedisChannelLayer
+from redis.asyncio import Redis
+
+from core.websocket.presence import (
+    presence_key,
+    queue_connection_added,
+    queue_connection_removed,
+)
+from core.websocket.utils import BROADCAST_GROUP, group_add_many, group_discard_many
+
+REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+
+
+async def legacy_connect(layer, redis, user_id, channel):
+    await layer.group_add(f"user_{user_id}", channel)
+    await layer.group_add(BROADCAST_GROUP, channel)
+    await redis.sadd("online_users", str(user_id))
+    await redis.expire("online_users", 3600)
+
+
+async def legacy_disconnect(layer, redis, user_id, channel):
+    await redis.srem("online_users", str(user_id))
+    await layer.group_discard(f"user_{user_id}", channel)
+    await layer.group_discard(BROADCAST_GROUP, channel)
+
+
+async def pipelined_connect(layer, redis, user_id, channel):
+    async def presence():
+        pipe = redis.pipeline(transaction=True)
+        queue_connection_added(pipe, user_id, channel)
+        await pipe.execute()
+
+    await asyncio.gather(
+        group_add_many(layer, [f"user_{user_id}", BROADCAST_GROUP], channel),
+        presence(),
+    )
+
+
+async def pipelined_disconnect(layer, redis, user_id, channel):
+    async def presence():
+        pipe = redis.pipeline(transaction=True)
+        queue_connection_removed(pipe, user_id, channel)
+        await pipe.execute()
+
+    await asyncio.gather(
+        presence(),
+        group_discard_many(layer, [f"user_{user_id}", BROADCAST_GROUP], channel),
+    )
+
+
+async def storm(connect, disconnect, sockets: int) -> tuple:
+    layer = RedisChannelLayer(hosts=[(REDIS_HOST, 6379)])
+    redis = Redis.from_url(f"redis://{REDIS_HOST}", max_connections=sockets)
+    clients = [(i % 50, f"specific.bench!{i}") for i in range(sockets)]
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(connect(layer, redis, u, c) for u, c in clients))
+        connected = time.perf_counter()
+        await asyncio.gather(*(disconnect(layer, redis, u, c) for u, c in clients))
+        disconnected = time.perf_counter()
+    finally:
+        await redis.delete("online_users", *{presence_key(u) for u, _ in clients})
+        await redis.aclose()
+        await layer.flush()
+    return sockets / (connected - start), sockets / (disconnected - connected)
+
+
+def measure(connect, disconnect, sockets: int, repeat: int) -> tuple:
+    runs = [asyncio.run(storm(connect, disconnect, sockets)) for _ in range(repeat)]
+    return (
+        statistics.median(run[0] for run in runs),
+        statistics.median(run[1] for run in runs),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sockets", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'sockets':>8} {'connect/s before':>17} {'after':>8} "
+        f"{'disconnect/s before':>20} {'after':>8}"
+    )
+    for sockets in args.sockets:
+        before = measure(legacy_connect, legacy_disconnect, sockets, args.repeat)
+        after = measure(pipelined_connect, pipelined_disconnect, sockets, args.repeat)
+        print(
+            f"{sockets:>8} {before[0]:>17.0f} {after[0]:>8.0f} "
+            f"{before[1]:>20.0f} {after[1]:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
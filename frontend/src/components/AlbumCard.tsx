@@ -37,7 +37,7 @@ function AlbumCard({ album }: { album: Album }) {
                         <CardMedia
                             component="img"
                             height="180"
-                            image={album.cover_image}
+                            image={album.cover_variants?.thumbnail ?? album.cover_image}
                             alt={`Couverture de l'album ${album.title}`}
                             sx={{ objectFit: "cover", height: "100%" }}
                         />
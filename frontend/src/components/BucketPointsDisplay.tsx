@@ -34,10 +34,13 @@ import BucketPointsInput from "./BucketPointsInput"
 import { useWebSocketContext } from "../contexts/WebSocketProvider"
 import { WebSocketMessageType } from "../types/websockets"
 import {
+    BucketPointBatchChanged,
     BucketPointCreated,
     BucketPointDeleted,
+    BucketPointMoved,
     BucketPointUpdated,
 } from "../types/websocket-interfaces"
+import { moveAfter } from "../utils/utils"
 
 export default function BucketPointsDisplay() {
     const { data: bucketPointsList, isLoading } = useBucketPointsQuery()
@@ -103,14 +106,35 @@ export default function BucketPointsDisplay() {
             )
         }
 
+        const handleBatchChange = (data: BucketPointBatchChanged) => {
+            console.debug("Bucket points changed:", data)
+            const deleted = new Set(data.deleted)
+            const updated = new Map(data.updated.map((bp) => [bp.id, bp]))
+            setBucketPoints((prev) => [
+                ...data.created,
+                ...prev
+                    .filter((bp) => !deleted.has(bp.id))
+                    .map((bp) => (updated.has(bp.id) ? { ...bp, ...updated.get(bp.id) } : bp)),
+            ])
+        }
+
+        const handleMoveBucketPoint = (data: BucketPointMoved) => {
+            console.debug("Bucket point moved:", data)
+            setBucketPoints((prev) => moveAfter(prev, data.id, data.after, data.rank))
+        }
+
         websocket.bind(WebSocketMessageType.BucketPointCreated, handleNewBucketPoint)
         websocket.bind(WebSocketMessageType.BucketPointDeleted, handleDeleteBucketPoint)
         websocket.bind(WebSocketMessageType.BucketPointUpdated, handleUpdateBucketPoint)
+        websocket.bind(WebSocketMessageType.BucketPointBatchChanged, handleBatchChange)
+        websocket.bind(WebSocketMessageType.BucketPointMoved, handleMoveBucketPoint)
 
         return () => {
             websocket.unbind(WebSocketMessageType.BucketPointCreated, handleNewBucketPoint)
             websocket.unbind(WebSocketMessageType.BucketPointDeleted, handleDeleteBucketPoint)
             websocket.unbind(WebSocketMessageType.BucketPointUpdated, handleUpdateBucketPoint)
+            websocket.unbind(WebSocketMessageType.BucketPointBatchChanged, handleBatchChange)
+            websocket.unbind(WebSocketMessageType.BucketPointMoved, handleMoveBucketPoint)
         }
     }, [websocket])
 
@@ -76,7 +76,7 @@ const PhotoCard = ({ photo, albumId }: PhotoCardProps) => {
                 {photo.image_url ? (
                     <CardMedia
                         component="img"
-                        image={photo.image_url}
+                        image={photo.variants?.thumbnail ?? photo.image_url}
                         alt={photo.caption || "Photo"}
                         sx={{
                             width: "100%",
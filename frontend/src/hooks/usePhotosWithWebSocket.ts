@@ -2,8 +2,15 @@ import { useEffect, useState, useCallback } from "react"
 import { useGetPhotos } from "../queries/photos"
 import { useWebSocketContext } from "../contexts/WebSocketProvider"
 import { WebSocketMessageType } from "../types/websockets"
-import { PhotoUploaded, PhotoDeleted, PhotoUpdated } from "../types/websocket-interfaces"
+import {
+    PhotoUploaded,
+    PhotoBatchUploaded,
+    PhotoDeleted,
+    PhotoUpdated,
+    PhotoMoved,
+} from "../types/websocket-interfaces"
 import { Photo } from "../types/photo"
+import { moveAfter } from "../utils/utils"
 
 interface UsePhotosWithWebSocketResult {
     photos: Photo[]
@@ -49,6 +56,24 @@ export function usePhotosWithWebSocket(albumId: string): UsePhotosWithWebSocketR
         [albumId]
     )
 
+    // Handle batch upload event
+    const handlePhotoBatchUploaded = useCallback(
+        (payload: PhotoBatchUploaded) => {
+            // Only update if the photos are for the current album
+            if (String(payload.album_id) !== String(albumId)) {
+                return
+            }
+
+            console.debug("Photo batch uploaded via WebSocket:", payload.data.length)
+            setPhotos((prev) => {
+                const known = new Set(prev.map((p) => p.id))
+                const added = payload.data.filter((photo) => !known.has(photo.id))
+                return [...added, ...prev]
+            })
+        },
+        [albumId]
+    )
+
     // Handle photo deleted event
     const handlePhotoDeleted = useCallback(
         (payload: PhotoDeleted) => {
@@ -81,18 +106,43 @@ export function usePhotosWithWebSocket(albumId: string): UsePhotosWithWebSocketR
         [albumId]
     )
 
+    // Handle photo moved event
+    const handlePhotoMoved = useCallback(
+        (payload: PhotoMoved) => {
+            // Only update if the photo is for the current album
+            if (String(payload.album_id) !== String(albumId)) {
+                return
+            }
+
+            console.debug("Photo moved via WebSocket:", payload.id)
+            setPhotos((prev) => moveAfter(prev, payload.id, payload.after, payload.rank))
+        },
+        [albumId]
+    )
+
     // Subscribe to WebSocket events
     useEffect(() => {
         websocket.bind(WebSocketMessageType.PhotoUploaded, handlePhotoUploaded)
+        websocket.bind(WebSocketMessageType.PhotoBatchUploaded, handlePhotoBatchUploaded)
         websocket.bind(WebSocketMessageType.PhotoDeleted, handlePhotoDeleted)
         websocket.bind(WebSocketMessageType.PhotoUpdated, handlePhotoUpdated)
+        websocket.bind(WebSocketMessageType.PhotoMoved, handlePhotoMoved)
 
         return () => {
             websocket.unbind(WebSocketMessageType.PhotoUploaded, handlePhotoUploaded)
+            websocket.unbind(WebSocketMessageType.PhotoBatchUploaded, handlePhotoBatchUploaded)
             websocket.unbind(WebSocketMessageType.PhotoDeleted, handlePhotoDeleted)
             websocket.unbind(WebSocketMessageType.PhotoUpdated, handlePhotoUpdated)
+            websocket.unbind(WebSocketMessageType.PhotoMoved, handlePhotoMoved)
         }
-    }, [websocket, handlePhotoUploaded, handlePhotoDeleted, handlePhotoUpdated])
+    }, [
+        websocket,
+        handlePhotoUploaded,
+        handlePhotoBatchUploaded,
+        handlePhotoDeleted,
+        handlePhotoUpdated,
+        handlePhotoMoved,
+    ])
 
     return {
         photos,
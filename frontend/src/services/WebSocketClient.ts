@@ -16,6 +16,7 @@ const RECONNECT_MULTIPLIER = 1.5
 const MAX_RECONNECT_ATTEMPTS = 20
 const MESSAGE_QUEUE_MAX_SIZE = 100
 const MESSAGE_QUEUE_MAX_AGE = 60000 // 1 minute
+const BATCH_MESSAGE_TYPE = "BATCH"
 
 interface QueuedMessage {
     type: WebSocketMessageType
@@ -147,40 +148,53 @@ export class WebSocketClient {
 
         try {
             const message: WebSocketMessage<T> = JSON.parse(messageString)
-            console.debug("WebSocket received message:", message.type)
 
-            // Handle server PING - respond with PONG
-            if (message.type === ("PING" as T)) {
-                this.sendRaw({ type: "PONG", data: { timestamp: new Date().toISOString() } })
+            // The server coalesces events sent close together into one BATCH frame
+            if (message.type === (BATCH_MESSAGE_TYPE as T) && Array.isArray(message.data)) {
+                for (const batchedMessage of message.data as WebSocketMessage<T>[]) {
+                    this.dispatchMessage(batchedMessage)
+                }
                 return
             }
 
-            // Handle ERROR messages
-            if (message.type === ("ERROR" as T)) {
-                console.warn("WebSocket error from server:", message.data)
-                return
-            }
+            this.dispatchMessage(message)
+        } catch (error) {
+            console.error("Failed to parse WebSocket message:", error)
+        }
+    }
 
-            if (!message.type || message.data === undefined) {
-                console.warn("WebSocket message is not valid (missing type or data fields)")
-                return
-            }
+    private dispatchMessage<T extends WebSocketMessageType>(message: WebSocketMessage<T>) {
+        console.debug("WebSocket received message:", message.type)
 
-            if (!Object.values(WebSocketMessageType).includes(message.type)) {
-                console.warn(`Unknown WebSocket message type: ${message.type}`)
-                return
-            }
+        // Handle server PING - respond with PONG
+        if (message.type === ("PING" as T)) {
+            this.sendRaw({ type: "PONG", data: { timestamp: new Date().toISOString() } })
+            return
+        }
 
-            const callbacksForType = this.callbacks[message.type]
-            for (const callback of callbacksForType) {
-                try {
-                    callback(message.data)
-                } catch (error) {
-                    console.error(`Error in WebSocket callback for ${message.type}:`, error)
-                }
+        // Handle ERROR messages
+        if (message.type === ("ERROR" as T)) {
+            console.warn("WebSocket error from server:", message.data)
+            return
+        }
+
+        if (!message.type || message.data === undefined) {
+            console.warn("WebSocket message is not valid (missing type or data fields)")
+            return
+        }
+
+        if (!Object.values(WebSocketMessageType).includes(message.type)) {
+            console.warn(`Unknown WebSocket message type: ${message.type}`)
+            return
+        }
+
+        const callbacksForType = this.callbacks[message.type]
+        for (const callback of callbacksForType) {
+            try {
+                callback(message.data)
+            } catch (error) {
+                console.error(`Error in WebSocket callback for ${message.type}:`, error)
             }
-        } catch (error) {
-            console.error("Failed to parse WebSocket message:", error)
         }
     }
 
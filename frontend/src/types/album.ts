@@ -3,6 +3,7 @@ export interface IAlbum {
     title: string
     description: string
     cover_image: string
+    cover_variants?: Record<string, string>
     created_at: string
     updated_at: string
     nb_photos: number
@@ -18,6 +19,7 @@ export interface Album {
     title: string
     description: string
     cover_image?: string
+    cover_variants?: Record<string, string>
     created_at: string
     updated_at: string
     nb_photos: number
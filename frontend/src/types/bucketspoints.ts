@@ -4,4 +4,5 @@ export default interface IBucketPoint {
     description: string
     completed: boolean
     created_at: string
+    rank?: string
 }
@@ -1,11 +1,13 @@
 export interface Photo {
     id: number
-    album: string
+    album_id?: number
     image_url: string
+    variants?: Record<string, string>
     caption: string
     created_at: string
     updated_at: string
     location: string
+    rank?: string
 }
 
 export interface AddPhotoInput {
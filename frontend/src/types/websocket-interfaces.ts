@@ -46,12 +46,29 @@ export interface BucketPointUpdated {
     data: IBucketPoint
 }
 
+export interface BucketPointBatchChanged {
+    created: IBucketPoint[]
+    updated: IBucketPoint[]
+    deleted: number[]
+}
+
+export interface BucketPointMoved {
+    id: number
+    rank: string
+    after: number | null
+}
+
 // Photo interfaces
 export interface PhotoUploaded {
     data: Photo
     album_id: number
 }
 
+export interface PhotoBatchUploaded {
+    data: Photo[]
+    album_id: number
+}
+
 export interface PhotoDeleted {
     id: number
     album_id: number
@@ -62,6 +79,13 @@ export interface PhotoUpdated {
     album_id: number
 }
 
+export interface PhotoMoved {
+    id: number
+    rank: string
+    after: number | null
+    album_id: number
+}
+
 // Album interfaces
 export interface Album {
     id: number
@@ -7,9 +7,13 @@ import {
     BucketPointDeleted,
     BucketPointCreated,
     BucketPointUpdated,
+    BucketPointBatchChanged,
+    BucketPointMoved,
     PhotoUploaded,
+    PhotoBatchUploaded,
     PhotoDeleted,
     PhotoUpdated,
+    PhotoMoved,
     AlbumCreated,
     AlbumDeleted,
     AlbumUpdated,
@@ -30,11 +34,15 @@ export interface WebSocketMessageTable {
     [WebSocketMessageType.BucketPointCreated]: BucketPointCreated
     [WebSocketMessageType.BucketPointDeleted]: BucketPointDeleted
     [WebSocketMessageType.BucketPointUpdated]: BucketPointUpdated
+    [WebSocketMessageType.BucketPointBatchChanged]: BucketPointBatchChanged
+    [WebSocketMessageType.BucketPointMoved]: BucketPointMoved
 
     // Photo types
     [WebSocketMessageType.PhotoUploaded]: PhotoUploaded
+    [WebSocketMessageType.PhotoBatchUploaded]: PhotoBatchUploaded
     [WebSocketMessageType.PhotoDeleted]: PhotoDeleted
     [WebSocketMessageType.PhotoUpdated]: PhotoUpdated
+    [WebSocketMessageType.PhotoMoved]: PhotoMoved
 
     // Album types
     [WebSocketMessageType.AlbumCreated]: AlbumCreated
@@ -12,11 +12,15 @@ export enum WebSocketMessageType {
     BucketPointCreated = "BUCKETPOINT_CREATED",
     BucketPointDeleted = "BUCKETPOINT_DELETED",
     BucketPointUpdated = "BUCKETPOINT_UPDATED",
+    BucketPointBatchChanged = "BUCKETPOINT_BATCH_CHANGED",
+    BucketPointMoved = "BUCKETPOINT_MOVED",
 
     // Photo events
     PhotoUploaded = "PHOTO_UPLOADED",
+    PhotoBatchUploaded = "PHOTO_BATCH_UPLOADED",
     PhotoDeleted = "PHOTO_DELETED",
     PhotoUpdated = "PHOTO_UPDATED",
+    PhotoMoved = "PHOTO_MOVED",
 
     // Album events
     AlbumCreated = "ALBUM_CREATED",
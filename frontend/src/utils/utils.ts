@@ -2,3 +2,25 @@ export default function getBaseURL() {
     const { protocol, hostname, port } = window.location
     return `${protocol}//${hostname}${port ? `:${port}` : ""}`
 }
+
+/**
+ * Moves item `id` right after item `after` (first when null), giving it `rank`.
+ * Returns the list unchanged when either item is not in it.
+ */
+export function moveAfter<T extends { id: number; rank?: string }>(
+    items: T[],
+    id: number,
+    after: number | null,
+    rank: string
+): T[] {
+    const moved = items.find((item) => item.id === id)
+    if (!moved) {
+        return items
+    }
+    const rest = items.filter((item) => item.id !== id)
+    const position = after === null ? 0 : rest.findIndex((item) => item.id === after) + 1
+    if (position === 0 && after !== null) {
+        return items
+    }
+    return [...rest.slice(0, position), { ...moved, rank }, ...rest.slice(position)]
+}